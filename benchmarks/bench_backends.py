@@ -0,0 +1,85 @@
+"""
+bench_backends.py - Latencia por backend de inferencia: Keras vs ONNX Runtime
+=============================================================================
+
+Mide p50/p99 de `predict_batch` para la entrada (batch, 15, 1662) con:
+
+- keras:  `InferenceModel` (tf.function con firma fija)
+- onnx:   `OnnxModel` (ONNX Runtime CPU, hilos según --intra-op/--inter-op)
+- tflite: `TFLiteModel` (opcional, batch 1 por invocación)
+
+Los modelos exportados se generan en un directorio temporal a partir del
+`.keras` (o de `model.get_model` con pesos aleatorios si no existe), de modo
+que todos los backends miden los mismos pesos.
+
+Uso:
+    python benchmarks/bench_backends.py [--backends keras onnx] [--batch 1 8 64] [--intra-op 2]
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_manager import config
+from inference_backend import BACKENDS
+from model_export import export_onnx, export_tflite
+
+from bench_inference import _latencies_ms, _load_keras_model
+
+
+def _load_backend(backend: str, keras_path: Path, workdir: Path, args):
+    if backend == 'keras':
+        from inference_model import InferenceModel
+        return InferenceModel(keras_path)
+    if backend == 'onnx':
+        from onnx_model import OnnxModel
+        path = export_onnx(keras_path, workdir / 'model.onnx')
+        return OnnxModel(path, intra_op_threads=args.intra_op, inter_op_threads=args.inter_op)
+    
+    from tflite_model import TFLiteModel
+    return TFLiteModel(export_tflite(keras_path, workdir / 'model.tflite'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', type=Path, default=config.get_model_path())
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=['keras', 'onnx'])
+    parser.add_argument('--calls', type=int, default=200, help='llamadas medidas por variante')
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--intra-op', type=int, default=0, help='hilos intra-op de ONNX Runtime (0 = default)')
+    parser.add_argument('--inter-op', type=int, default=0, help='hilos inter-op de ONNX Runtime (0 = default)')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        keras_model, source = _load_keras_model(args.model)
+        keras_path = args.model
+        if not keras_path.exists():
+            keras_path = workdir / 'model.keras'
+            keras_model.save(keras_path)
+        print(f"Modelo: {source}")
+        
+        models = {backend: _load_backend(backend, keras_path, workdir, args) for backend in args.backends}
+        input_shape = next(iter(models.values())).input_shape
+        
+        rng = np.random.default_rng(0)
+        print(f"{'Backend':<10}{'batch':>6}{'p50 (ms)':>10}{'p99 (ms)':>10}{'ms/secuencia':>14}{'vs keras':>10}")
+        for batch_size in args.batch:
+            x = rng.random((batch_size, *input_shape), dtype=np.float32)
+            baseline = None
+            for backend, model in models.items():
+                times = _latencies_ms(lambda: model.predict_batch(x), args.calls)
+                p50, p99 = np.percentile(times, [50, 99])
+                if backend == 'keras':
+                    baseline = p50
+                speedup = f"{baseline / p50:.1f}x" if baseline else '-'
+                print(f"{backend:<10}{batch_size:>6}{p50:>10.2f}{p99:>10.2f}{p50 / batch_size:>14.3f}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
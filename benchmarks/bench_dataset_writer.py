@@ -0,0 +1,83 @@
+"""
+bench_dataset_writer.py - Escalamiento de la construcción del dataset de keypoints
+==================================================================================
+
+Mide el tiempo de construir el dataset de una palabra con N muestras:
+
+- legacy: `pd.concat` de un DataFrame de una fila por cada frame + `to_hdf`
+  (implementación anterior de `insert_keypoints_sequence`, cuadrática)
+- writer: `KeypointsDatasetWriter` (bloques preasignados, un volcado por palabra)
+
+Uso:
+    python benchmarks/bench_dataset_writer.py [--samples 1000 10000] [--frames 15] [--legacy-max 1000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from keypoints_dataset import KeypointsDataset, KeypointsDatasetWriter
+from helpers import KEYPOINTS_LENGTH
+
+
+def legacy_insert_keypoints_sequence(df: pd.DataFrame, n_sample: int, kp_seq: np.ndarray) -> pd.DataFrame:
+    """Implementación previa (un concat por frame), conservada solo como referencia"""
+    for frame, keypoints in enumerate(kp_seq):
+        data = {'sample': n_sample, 'frame': frame + 1, 'keypoints': [keypoints]}
+        df_keypoints = pd.DataFrame(data)
+        df = pd.concat([df, df_keypoints], ignore_index=True)
+    return df
+
+
+def bench_legacy(kp_seq: np.ndarray, n_samples: int, out_dir: Path) -> float:
+    start = time.perf_counter()
+    data = pd.DataFrame([])
+    for n_sample in range(1, n_samples + 1):
+        data = legacy_insert_keypoints_sequence(data, n_sample, kp_seq)
+    data.to_hdf(out_dir / "legacy.h5", key="data", mode="w")
+    return time.perf_counter() - start
+
+
+def bench_writer(kp_seq: np.ndarray, n_samples: int, out_dir: Path) -> float:
+    start = time.perf_counter()
+    with KeypointsDatasetWriter(out_dir / "writer", "bench") as writer:
+        for n_sample in range(1, n_samples + 1):
+            writer.append(kp_seq, f"sample_{n_sample}")
+    elapsed = time.perf_counter() - start
+    assert len(KeypointsDataset(out_dir / "writer")) == n_samples
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--frames', type=int, default=15, help='frames por muestra')
+    parser.add_argument('--legacy-max', type=int, default=1000,
+                        help='no ejecuta la versión legacy por encima de este N (es cuadrática)')
+    args = parser.parse_args()
+
+    # PyTables advierte que pickea la columna object del formato legado
+    warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
+    kp_seq = np.random.default_rng(0).random((args.frames, KEYPOINTS_LENGTH), dtype=np.float32)
+
+    print(f"{'muestras':>10}{'legacy (s)':>14}{'writer (s)':>14}{'writer µs/muestra':>20}")
+    for n_samples in args.samples:
+        with tempfile.TemporaryDirectory() as tmp:
+            out_dir = Path(tmp)
+            legacy = bench_legacy(kp_seq, n_samples, out_dir) if n_samples <= args.legacy_max else None
+            writer = bench_writer(kp_seq, n_samples, out_dir)
+
+        legacy_str = f"{legacy:.2f}" if legacy is not None else "-"
+        print(f"{n_samples:>10}{legacy_str:>14}{writer:>14.3f}{writer / n_samples * 1e6:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
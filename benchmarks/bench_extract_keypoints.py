@@ -0,0 +1,103 @@
+"""
+bench_extract_keypoints.py - Micro-benchmark de extracción de keypoints
+=======================================================================
+
+Compara la implementación anterior de `extract_keypoints` (list-comprehensions
++ `np.concatenate`) con la escritura directa en buffer float32 de helpers.py.
+
+Uso:
+    python benchmarks/bench_extract_keypoints.py [--frames 5000]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers import extract_keypoints, extract_keypoints_batch, KEYPOINTS_LENGTH
+
+
+class _Landmark:
+    __slots__ = ('x', 'y', 'z', 'visibility')
+
+    def __init__(self, rng):
+        self.x, self.y, self.z, self.visibility = rng.random(4).tolist()
+
+
+class _LandmarkList:
+    def __init__(self, count, rng):
+        self.landmark = [_Landmark(rng) for _ in range(count)]
+
+
+class _Results:
+    def __init__(self, rng, hands=True):
+        self.pose_landmarks = _LandmarkList(33, rng)
+        self.face_landmarks = _LandmarkList(468, rng)
+        self.left_hand_landmarks = _LandmarkList(21, rng) if hands else None
+        self.right_hand_landmarks = _LandmarkList(21, rng) if hands else None
+
+
+def legacy_extract_keypoints(results) -> np.ndarray:
+    """Implementación previa, conservada solo como referencia del benchmark"""
+    pose = np.array([
+        [res.x, res.y, res.z, res.visibility]
+        for res in results.pose_landmarks.landmark
+    ]).flatten() if results.pose_landmarks else np.zeros(33 * 4)
+
+    face = np.array([
+        [res.x, res.y, res.z]
+        for res in results.face_landmarks.landmark
+    ]).flatten() if results.face_landmarks else np.zeros(468 * 3)
+
+    lh = np.array([
+        [res.x, res.y, res.z]
+        for res in results.left_hand_landmarks.landmark
+    ]).flatten() if results.left_hand_landmarks else np.zeros(21 * 3)
+
+    rh = np.array([
+        [res.x, res.y, res.z]
+        for res in results.right_hand_landmarks.landmark
+    ]).flatten() if results.right_hand_landmarks else np.zeros(21 * 3)
+
+    return np.concatenate([pose, face, lh, rh])
+
+
+def _per_frame_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=5000, help='frames por repetición')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    results = _Results(rng)
+    batch = [_Results(rng) for _ in range(64)]
+
+    assert np.allclose(legacy_extract_keypoints(results), extract_keypoints(results))
+
+    out = np.empty(KEYPOINTS_LENGTH, dtype=np.float32)
+    batch_out = np.empty((len(batch), KEYPOINTS_LENGTH), dtype=np.float32)
+
+    timings = {
+        'legacy (listas + concatenate)': _per_frame_us(lambda: legacy_extract_keypoints(results), args.frames),
+        'extract_keypoints (nuevo buffer)': _per_frame_us(lambda: extract_keypoints(results), args.frames),
+        'extract_keypoints (out reutilizado)': _per_frame_us(lambda: extract_keypoints(results, out), args.frames),
+        'extract_keypoints_batch (64, por frame)': _per_frame_us(
+            lambda: extract_keypoints_batch(batch, batch_out), max(1, args.frames // len(batch))
+        ) / len(batch),
+    }
+
+    baseline = timings['legacy (listas + concatenate)']
+    print(f"{'Variante':<42}{'µs/frame':>10}{'speedup':>10}")
+    for name, us in timings.items():
+        print(f"{name:<42}{us:>10.1f}{baseline / us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
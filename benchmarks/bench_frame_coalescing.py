@@ -0,0 +1,111 @@
+"""
+bench_frame_coalescing.py - Latencia bajo sobrecarga: FIFO vs último frame gana
+===============================================================================
+
+Simula `--sessions` clientes enviando frames a `--fps` contra una etapa de
+landmarks que tarda `--service-ms` por frame (un hilo), de modo que la
+demanda supera la capacidad. Mide la latencia recepción -> segmentación de
+los frames procesados:
+
+- fifo: cola sin descartes, se procesa cada frame en orden (comportamiento anterior)
+- latest: cola con política `latest`, un frame pendiente por sesión
+- latest+adaptive: además los clientes siguen el `fps` de FrameRateController
+
+Uso:
+    python benchmarks/bench_frame_coalescing.py [--sessions 4] [--fps 30] [--service-ms 20] [--seconds 6]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frame_pipeline import FramePipeline, PipelineStage
+from frame_rate_controller import FrameRateController
+
+
+def run(variant: str, sessions: int, fps: float, service_ms: float, seconds: float) -> dict:
+    rates = {sid: FrameRateController(interval_s=0.5, max_fps=fps) for sid in range(sessions)}
+    client_fps = {sid: fps for sid in range(sessions)}
+    latencies = []
+    lock = threading.Lock()
+    
+    def landmarks(sid, submitted_at):
+        time.sleep(service_ms / 1000)
+        return submitted_at
+    
+    def segmentation(sid, submitted_at):
+        now = time.perf_counter()
+        latency = (now - submitted_at) * 1000
+        with lock:
+            latencies.append((now, latency))
+        feedback = rates[sid].processed(latency)
+        if feedback is not None and variant == 'latest+adaptive':
+            client_fps[sid] = feedback['fps']
+    
+    policy, queue_size = ('block', 100000) if variant == 'fifo' else ('latest', 4)
+    pipeline = FramePipeline([
+        PipelineStage('landmarks', landmarks, queue_size=queue_size, policy=policy),
+        PipelineStage('segmentation', segmentation, queue_size=64),
+    ], on_drop=lambda stage, sid, item: rates[sid].dropped())
+    pipeline.start()
+    
+    start = time.perf_counter()
+    stop_at = start + seconds
+    sent = [0] * sessions
+    
+    def client(sid):
+        next_frame = time.perf_counter()
+        while next_frame < stop_at:
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+            rates[sid].received()
+            pipeline.submit(sid, time.perf_counter())
+            sent[sid] += 1
+            next_frame += 1 / client_fps[sid]
+    
+    threads = [threading.Thread(target=client, args=(sid,)) for sid in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pipeline.stop()
+    
+    values = np.array([latency for _, latency in latencies])
+    last_second = np.array([latency for at, latency in latencies if at >= stop_at - 1])
+    return {
+        'sent': sum(sent),
+        'processed': len(values),
+        'dropped': pipeline.metrics()['stages']['landmarks']['dropped'],
+        'p50': np.percentile(values, 50),
+        'p95': np.percentile(values, 95),
+        'last_second_p95': np.percentile(last_second, 95) if len(last_second) else float('nan'),
+        'client_fps': np.mean(list(client_fps.values())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--service-ms', type=float, default=20)
+    parser.add_argument('--seconds', type=float, default=6)
+    args = parser.parse_args()
+    
+    capacity = 1000 / args.service_ms
+    print(f"{args.sessions} sesiones x {args.fps:g} fps = {args.sessions * args.fps:g} fps de demanda, "
+          f"capacidad {capacity:g} fps, {args.seconds:g} s")
+    print(f"{'variante':<17}{'enviados':>9}{'procesados':>11}{'descartados':>12}"
+          f"{'p50 (ms)':>10}{'p95 (ms)':>10}{'p95 último s':>14}{'fps cliente':>13}")
+    for variant in ('fifo', 'latest', 'latest+adaptive'):
+        r = run(variant, args.sessions, args.fps, args.service_ms, args.seconds)
+        print(f"{variant:<17}{r['sent']:>9}{r['processed']:>11}{r['dropped']:>12}"
+              f"{r['p50']:>10.0f}{r['p95']:>10.0f}{r['last_second_p95']:>14.0f}{r['client_fps']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
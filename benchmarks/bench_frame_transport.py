@@ -0,0 +1,96 @@
+"""
+bench_frame_transport.py - Transporte de frames: base64 vs binario
+==================================================================
+
+Compara, por frame de cámara:
+
+- Bytes en el cable: paquete Socket.IO con data URL base64 (cliente anterior)
+  vs adjunto binario JPEG / WebP (demo.js actual)
+- CPU del servidor: `split + b64decode + frombuffer + imdecode` vs
+  `frombuffer + imdecode` (frame_codec.decode_frame)
+
+Usa una imagen de ejemplo (--image) o un frame sintético 640x480 con
+gradientes, formas y ruido de sensor.
+
+Uso:
+    python benchmarks/bench_frame_transport.py [--image foto.jpg] [--quality 80] [--calls 300]
+"""
+
+import argparse
+import base64
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from frame_codec import decode_frame
+
+
+def synthetic_frame(width: int = 640, height: int = 480) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    frame = np.stack([x * 255 / width, y * 255 / height, (x + y) * 127 / (width + height)], axis=-1)
+    cv2.circle(frame, (width // 2, height // 3), 80, (60, 120, 200), -1)
+    cv2.rectangle(frame, (100, 300), (260, 470), (200, 180, 160), -1)
+    frame += rng.normal(0, 6, frame.shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def socketio_packet_bytes(frame_payload) -> int:
+    """Bytes del evento process_frame codificado por Socket.IO (texto + adjuntos)"""
+    from socketio import packet
+    encoded = packet.Packet(packet.EVENT, data=['process_frame', {'frame': frame_payload}]).encode()
+    if isinstance(encoded, list):
+        return sum(len(part) for part in encoded)
+    return len(encoded)
+
+
+def median_ms(func, calls: int) -> float:
+    func()
+    times = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        func()
+        times[i] = (time.perf_counter() - start) * 1000
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--image', type=Path, default=None)
+    parser.add_argument('--quality', type=int, default=80)
+    parser.add_argument('--calls', type=int, default=300)
+    args = parser.parse_args()
+    
+    frame = cv2.imread(str(args.image)) if args.image else synthetic_frame()
+    print(f"Frame: {args.image or 'sintético'} {frame.shape[1]}x{frame.shape[0]}, calidad {args.quality}")
+    
+    jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, args.quality])[1].tobytes()
+    webp = cv2.imencode('.webp', frame, [cv2.IMWRITE_WEBP_QUALITY, args.quality])[1].tobytes()
+    data_url = 'data:image/jpeg;base64,' + base64.b64encode(jpeg).decode('ascii')
+    
+    variants = [
+        ('base64 JPEG (legado)', data_url),
+        ('binario JPEG', jpeg),
+        ('binario WebP', webp),
+    ]
+    rows = [(name, payload, socketio_packet_bytes(payload), median_ms(lambda: decode_frame(payload), args.calls))
+            for name, payload in variants]
+    _, _, baseline_bytes, baseline_ms = rows[0]
+    
+    print(f"{'Variante':<24}{'imagen (KB)':>12}{'paquete (KB)':>14}{'vs base64':>11}{'decode (ms)':>13}{'vs base64':>11}")
+    for name, payload, wire, decode_ms in rows:
+        print(f"{name:<24}{len(payload) / 1024:>12.1f}{wire / 1024:>14.1f}{wire / baseline_bytes:>10.0%}"
+              f"{decode_ms:>13.3f}{decode_ms / baseline_ms:>10.0%}")
+    
+    b64_ms = median_ms(lambda: base64.b64decode(data_url.split(',', 1)[1]), args.calls)
+    print(f"\nSolo b64decode del legado: {b64_ms:.3f} ms por frame "
+          f"({b64_ms * 30:.1f} ms de CPU por segundo a 30 FPS por sesión)")
+
+
+if __name__ == "__main__":
+    main()
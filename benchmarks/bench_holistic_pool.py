@@ -0,0 +1,107 @@
+"""
+bench_holistic_pool.py - Throughput del pool Holistic según su tamaño
+=====================================================================
+
+Simula `--sessions` sesiones concurrentes (un hilo por sesión, como los
+handlers de Socket.IO) que envían `--frames` frames cada una a `--fps`
+(0 = sin pausa) a través de HolisticPool, para cada tamaño de `--sizes`. Tamaño 1 equivale a la
+instancia única compartida anterior.
+
+Cargas (`--workload`):
+
+- mediapipe: Holistic real sobre un frame 640x480 (requiere mediapipe.solutions)
+- cv2: filtros OpenCV que liberan el GIL (~CPU de un frame), escala con núcleos
+- sleep: latencia fija sin CPU; aísla la concurrencia que habilita el pool
+
+Uso:
+    python benchmarks/bench_holistic_pool.py [--workload cv2] [--sizes 1 2 4] [--sessions 8] [--frames 30] [--fps 30]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers import mediapipe_detection
+from holistic_pool import HolisticPool, default_holistic_factory
+
+
+class Cv2Holistic:
+    """Sustituto de CPU: desenfoques y conversión de color sobre el frame"""
+    
+    def process(self, image):
+        blurred = cv2.GaussianBlur(image, (31, 31), 0)
+        return cv2.cvtColor(cv2.resize(blurred, None, fx=0.5, fy=0.5), cv2.COLOR_RGB2GRAY)
+
+
+class SleepHolistic:
+    """Sustituto de latencia: 20 ms sin ocupar CPU"""
+    
+    def process(self, image):
+        time.sleep(0.02)
+
+
+FACTORIES = {
+    'mediapipe': default_holistic_factory,
+    'cv2': Cv2Holistic,
+    'sleep': SleepHolistic,
+}
+
+
+def run(pool: HolisticPool, frame: np.ndarray, sessions: int, frames: int, fps: float) -> float:
+    """Procesa sessions x frames frames y retorna frames por segundo"""
+    barrier = threading.Barrier(sessions + 1)
+    
+    def session(sid):
+        barrier.wait()
+        start = time.perf_counter()
+        for i in range(frames):
+            if fps:
+                time.sleep(max(0.0, start + i / fps - time.perf_counter()))
+            with pool.checkout(sid) as holistic:
+                mediapipe_detection(frame, holistic)
+    
+    threads = [threading.Thread(target=session, args=(sid,)) for sid in range(sessions)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return sessions * frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workload', choices=list(FACTORIES), default='cv2')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--fps', type=float, default=30, help='frames por segundo de cada sesión (0 = sin pausa)')
+    args = parser.parse_args()
+    
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    print(f"Carga: {args.workload}, {args.sessions} sesiones x {args.frames} frames a {args.fps:g} fps, "
+          f"{os.cpu_count()} núcleos")
+    print(f"{'pool':>5}{'frames/s':>11}{'vs 1':>8}{'espera p50 (ms)':>17}{'p95 (ms)':>10}{'utilización':>13}")
+    
+    baseline = None
+    for size in args.sizes:
+        pool = HolisticPool(FACTORIES[args.workload], max_size=size, min_size=size, idle_timeout_s=3600)
+        throughput = run(pool, frame, args.sessions, args.frames, args.fps)
+        baseline = baseline or throughput
+        metrics = pool.metrics()
+        print(f"{size:>5}{throughput:>11.1f}{throughput / baseline:>7.2f}x"
+              f"{metrics['wait_ms']['p50']:>17.2f}{metrics['wait_ms']['p95']:>10.2f}{metrics['utilization']:>12.0%}")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
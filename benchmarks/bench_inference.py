@@ -0,0 +1,79 @@
+"""
+bench_inference.py - Latencia de inferencia: model.predict vs InferenceModel
+============================================================================
+
+Mide p50/p99 por llamada de:
+
+- keras `model.predict(x, verbose=0)` (implementación anterior en todos los sitios)
+- `InferenceModel.predict_one` / `predict_batch` (tf.function con firma fija)
+
+Usa el modelo entrenado si existe; si no, la arquitectura de `model.get_model`
+con pesos aleatorios (la latencia no depende de los pesos).
+
+Uso:
+    python benchmarks/bench_inference.py [--model models/actions_15.keras] [--calls 200] [--batch 1 8]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_manager import config
+from inference_model import InferenceModel
+
+
+def _latencies_ms(func, calls: int) -> np.ndarray:
+    func()  # warmup
+    times = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        func()
+        times[i] = (time.perf_counter() - start) * 1000
+    return times
+
+
+def _load_keras_model(path: Path):
+    import tensorflow as tf
+    if path.exists():
+        return tf.keras.models.load_model(path, compile=False), str(path)
+
+    from model import get_model
+    return get_model(config.model.frames, len(config.get_word_ids())), "get_model() (pesos aleatorios)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', type=Path, default=config.get_model_path())
+    parser.add_argument('--calls', type=int, default=200, help='llamadas medidas por variante')
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    keras_model, source = _load_keras_model(args.model)
+    model = InferenceModel(keras_model)
+    print(f"Modelo: {source}, input {model.input_shape}")
+
+    rng = np.random.default_rng(0)
+    print(f"{'Variante':<36}{'batch':>6}{'p50 (ms)':>10}{'p99 (ms)':>10}{'speedup p50':>13}")
+    for batch_size in args.batch:
+        x = rng.random((batch_size, *model.input_shape), dtype=np.float32)
+        baseline = _latencies_ms(lambda: keras_model.predict(x, verbose=0), args.calls)
+        if batch_size == 1:
+            compiled = _latencies_ms(lambda: model.predict_one(x[0]), args.calls)
+            name = 'InferenceModel.predict_one'
+        else:
+            compiled = _latencies_ms(lambda: model.predict_batch(x), args.calls)
+            name = 'InferenceModel.predict_batch'
+
+        for label, times in (('model.predict', baseline), (name, compiled)):
+            p50, p99 = np.percentile(times, [50, 99])
+            speedup = np.percentile(baseline, 50) / p50
+            print(f"{label:<36}{batch_size:>6}{p50:>10.2f}{p99:>10.2f}{speedup:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
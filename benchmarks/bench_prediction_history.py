@@ -0,0 +1,133 @@
+"""
+bench_prediction_history.py - Historial de predicciones: OFFSET vs keyset
+=========================================================================
+
+Llena una base SQLite temporal (modelos de web-app/backend) con `--rows`
+predicciones de un usuario (y `--rows` de otro) y mide, a distintas
+profundidades del historial, el tiempo de traer una página de `--limit`
+filas:
+
+- offset: ORDER BY timestamp DESC, id DESC LIMIT n OFFSET k
+- keyset: `query_user_predictions` desde el (timestamp, id) de la página
+  anterior
+
+sin filtros y con filtro por palabra y confianza mínima. Al final recorre
+todo el historial con `iter_user_predictions` (lo que hace la exportación
+NDJSON) y reporta el tiempo y el pico de memoria de Python.
+
+Uso:
+    python benchmarks/bench_prediction_history.py [--rows 500000] [--limit 50]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'web-app' / 'backend'))
+
+from flask import Flask
+
+from models import Prediction, User, create_tables, db, insert_predictions, iter_user_predictions, query_user_predictions
+
+WORDS = ['HOLA', 'ADIÓS', 'BIEN', 'GRACIAS', 'POR FAVOR', 'MAL', 'DISCULPA']
+
+USER, OTHER = 1, 2
+
+
+def fill(user_id: int, rows: int):
+    start = datetime(2024, 1, 1)
+    for offset in range(0, rows, 50000):
+        insert_predictions([{
+            'public_id': f'{user_id}-{i}',
+            'user_id': user_id,
+            'word': random.choice(WORDS),
+            'word_id': 'bench',
+            'confidence': random.uniform(0.5, 1.0),
+            'session_id': f'session-{i // 1000}',
+            # Varias filas por segundo: el desempate por id importa
+            'timestamp': start + timedelta(seconds=i // 4),
+        } for i in range(offset, min(offset + 50000, rows))])
+
+
+def offset_page(filters: dict, depth: int, limit: int):
+    return query_user_predictions(USER, **filters).offset(depth).limit(limit).all()
+
+
+def keyset_page(filters: dict, after, limit: int):
+    return query_user_predictions(USER, after=after, **filters).limit(limit).all()
+
+
+def measure(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        db.session.expire_all()
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db.init_app(app)
+        with app.app_context():
+            create_tables()
+            for user_id in (USER, OTHER):
+                user = User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@lsch.com')
+                user.set_password('bench')
+                db.session.add(user)
+            db.session.commit()
+            fill(USER, args.rows)
+            fill(OTHER, args.rows)
+            
+            variants = {'sin filtros': {}, 'BIEN, conf>=0.9': {'word': 'BIEN', 'min_confidence': 0.9}}
+            print(f"{args.rows} predicciones del usuario + {args.rows} de otro, páginas de {args.limit} "
+                  f"(mediana de {args.repeats}, ms)")
+            print(f"{'filtros':<18}{'profundidad':>12}{'offset':>10}{'keyset':>10}")
+            for label, filters in variants.items():
+                matching = query_user_predictions(USER, **filters).count()
+                for depth in sorted({0, matching // 100, matching // 10, matching // 2, max(matching - args.limit, 0)}):
+                    # La última fila antes de la página es el cursor que traería el cliente
+                    previous = offset_page(filters, depth - 1, 1) if depth else []
+                    after = (previous[0].timestamp, previous[0].id) if previous else None
+                    expected = [p.id for p in offset_page(filters, depth, args.limit)]
+                    assert [p.id for p in keyset_page(filters, after, args.limit)] == expected
+                    
+                    offset_ms = measure(lambda: offset_page(filters, depth, args.limit), args.repeats)
+                    keyset_ms = measure(lambda: keyset_page(filters, after, args.limit), args.repeats)
+                    print(f"{label:<18}{depth:>12}{offset_ms:>10.2f}{keyset_ms:>10.2f}")
+            
+            # Tiempo y memoria en pasadas separadas: tracemalloc ralentiza la pasada que mide
+            db.session.expire_all()
+            t = time.perf_counter()
+            exported = sum(1 for _ in iter_user_predictions(USER))
+            elapsed = time.perf_counter() - t
+            assert exported == Prediction.query.filter_by(user_id=USER).count()
+            db.session.expire_all()
+            tracemalloc.start()
+            for _ in iter_user_predictions(USER):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"exportación completa: {exported} filas en {elapsed:.2f} s, pico de memoria {peak / 2**20:.1f} MiB")
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
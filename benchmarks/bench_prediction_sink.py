@@ -0,0 +1,122 @@
+"""
+bench_prediction_sink.py - Guardado de predicciones: commit por fila vs escritura diferida
+========================================================================================
+
+Inserta `--rows` predicciones en una base SQLite temporal (modelos de
+web-app/backend) y mide cuánto espera quien guarda (el hilo del socket) y el
+tiempo total hasta que todas quedan escritas:
+
+- inline: `db.session.add` + `commit` por predicción (comportamiento anterior)
+- sink: `PredictionSink.submit`, insertadas por lotes con `insert_predictions`
+
+`--commit-ms` agrega una espera por commit para simular la ida y vuelta a un
+PostgreSQL remoto.
+
+Uso:
+    python benchmarks/bench_prediction_sink.py [--rows 5000] [--batch-size 100] [--commit-ms 2]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'web-app' / 'backend'))
+
+from flask import Flask
+from sqlalchemy import event
+
+from models import Prediction, User, db, insert_predictions
+from prediction_sink import PredictionSink
+
+
+def make_app(path: str, commit_ms: float) -> Flask:
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@lsch.com')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        if commit_ms:
+            event.listen(db.engine, 'commit', lambda conn: time.sleep(commit_ms / 1000))
+    return app
+
+
+def row(i: int) -> dict:
+    return {
+        'user_id': 1,
+        'word': 'HOLA',
+        'word_id': 'hola',
+        'confidence': 0.9,
+        'session_id': f'sid-{i % 8}',
+        'timestamp': datetime.utcnow(),
+    }
+
+
+def run(variant: str, rows: int, batch_size: int, commit_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(str(Path(tmp) / 'bench.db'), commit_ms)
+        waits = []
+        start = time.perf_counter()
+        
+        if variant == 'inline':
+            with app.app_context():
+                for i in range(rows):
+                    t = time.perf_counter()
+                    db.session.add(Prediction(**row(i)))
+                    db.session.commit()
+                    waits.append((time.perf_counter() - t) * 1000)
+        else:
+            def write(batch):
+                with app.app_context():
+                    insert_predictions(batch)
+            
+            sink = PredictionSink(write, batch_size=batch_size, flush_interval_ms=50,
+                                  max_pending=rows, max_retries=0, retry_backoff_ms=0)
+            sink.start()
+            for i in range(rows):
+                t = time.perf_counter()
+                sink.submit(row(i))
+                waits.append((time.perf_counter() - t) * 1000)
+            sink.close()
+        
+        total = time.perf_counter() - start
+        with app.app_context():
+            written = Prediction.query.count()
+            db.engine.dispose()
+    
+    waits = np.array(waits)
+    return {
+        'written': written,
+        'p50': np.percentile(waits, 50),
+        'p99': np.percentile(waits, 99),
+        'max': waits.max(),
+        'rows_per_s': rows / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--commit-ms', type=float, default=2)
+    args = parser.parse_args()
+    
+    print(f"{args.rows} predicciones, lotes de {args.batch_size}, +{args.commit_ms:g} ms por commit")
+    print(f"{'variante':<10}{'escritas':>10}{'espera p50 (ms)':>17}{'p99 (ms)':>10}{'max (ms)':>10}{'filas/s':>10}")
+    for variant in ('inline', 'sink'):
+        r = run(variant, args.rows, args.batch_size, args.commit_ms)
+        print(f"{variant:<10}{r['written']:>10}{r['p50']:>17.3f}{r['p99']:>10.3f}{r['max']:>10.3f}{r['rows_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
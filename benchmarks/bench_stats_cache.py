@@ -0,0 +1,108 @@
+"""
+bench_stats_cache.py - Dashboard con y sin caché de estadísticas
+================================================================
+
+Levanta web-app/backend/app_railway_postgres.py sobre una base SQLite
+temporal, carga `--rows` predicciones del usuario demo (y `--rows` de otros
+usuarios) y mide con el cliente de pruebas de Flask, por petición, el tiempo
+total y el tiempo en la base de datos (eventos de cursor de SQLAlchemy):
+
+- miss: el caché se invalida antes de cada petición (como tras una predicción)
+- hit: valores ya en caché
+
+para /dashboard, /api/user/stats y /api/system/stats.
+
+Uso:
+    python benchmarks/bench_stats_cache.py [--rows 100000] [--requests 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND = ROOT / 'web-app' / 'backend'
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(BACKEND))
+
+WORDS = ['Hola', 'Adios', 'Bien', 'Gracias', 'Por Favor', 'Mal', 'Disculpa']
+
+
+def fill(insert_predictions, user_id: int, rows: int):
+    start = datetime(2024, 1, 1)
+    for offset in range(0, rows, 50000):
+        insert_predictions([{
+            'public_id': f'{user_id}-{i}',
+            'user_id': user_id,
+            'word': random.choice(WORDS),
+            'word_id': 'bench',
+            'confidence': random.uniform(0.5, 1.0),
+            'timestamp': start + timedelta(seconds=i),
+        } for i in range(offset, min(offset + 50000, rows))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+    
+    tmp = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+    os.chdir(BACKEND)
+    import app_railway_postgres as web
+    from sqlalchemy import event
+    from models import User, db, insert_predictions
+    
+    with web.app.app_context():
+        demo_id = User.query.filter_by(username='demo').first().id
+        other = User(username='other', email='other@lsch.com')
+        other.set_password('other')
+        db.session.add(other)
+        db.session.commit()
+        fill(insert_predictions, demo_id, args.rows)
+        fill(insert_predictions, other.id, args.rows)
+        engine = db.engine
+    
+    db_time = []
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._bench_started = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after(conn, cursor, statement, parameters, context, executemany):
+        db_time.append(time.perf_counter() - context._bench_started)
+    
+    client = web.app.test_client()
+    client.post('/login', data={'username': 'demo', 'password': 'demo123'})
+    
+    print(f"{args.rows} predicciones del usuario demo + {args.rows} de otro usuario, "
+          f"mediana de {args.requests} peticiones (ms)")
+    print(f"{'ruta':<20}{'caché':>6}{'total':>9}{'BD':>8}{'consultas':>11}")
+    for path in ('/dashboard', '/api/user/stats', '/api/system/stats'):
+        for variant in ('miss', 'hit'):
+            totals, db_ms, queries = [], [], []
+            for _ in range(args.requests):
+                if variant == 'miss':
+                    web.stats_cache.invalidate([demo_id])
+                db_time.clear()
+                started = time.perf_counter()
+                response = client.get(path)
+                totals.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.status_code
+                db_ms.append(sum(db_time) * 1000)
+                queries.append(len(db_time))
+            print(f"{path:<20}{variant:>6}{np.median(totals):>9.2f}{np.median(db_ms):>8.3f}{np.median(queries):>11.0f}")
+    print(web.stats_cache.metrics())
+
+
+if __name__ == "__main__":
+    main()
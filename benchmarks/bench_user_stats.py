@@ -0,0 +1,166 @@
+"""
+bench_user_stats.py - Estadísticas del dashboard: Python vs SQL vs tablas de resumen
+====================================================================================
+
+Llena una base SQLite temporal (modelos de web-app/backend) hasta `--rows`
+predicciones y, en cada punto de control, mide las estadísticas del
+dashboard (total, confianza promedio, palabras más usadas y recientes):
+
+- python: carga todas las filas del usuario con `.all()` y cuenta en Python
+- sql: agregaciones sobre los índices compuestos de predictions
+- rollup: `get_user_stats`, desde user_word_stats
+
+para un usuario liviano (`--light-rows` predicciones fijas) y uno pesado
+(`--heavy-share` del total), y las estadísticas del sistema
+(`get_system_stats`) agregando predictions completa vs daily_word_stats.
+
+Uso:
+    python benchmarks/bench_user_stats.py [--rows 1000000] [--repeats 5]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'web-app' / 'backend'))
+
+from flask import Flask
+
+from models import Prediction, User, create_tables, db, get_system_stats, get_user_stats, insert_predictions
+
+WORDS = ['HOLA', 'ADIÓS', 'BIEN', 'GRACIAS', 'POR FAVOR', 'MAL', 'DISCULPA', 'ME AYUDAS',
+         'BUENOS DÍAS', 'BUENAS TARDES', 'BUENAS NOCHES', 'CÓMO ESTÁS', 'MÁS O MENOS']
+
+LIGHT, HEAVY, OTHERS = 1, 2, 3
+
+
+def legacy_stats(user_id: int) -> dict:
+    """Cálculo anterior: todas las filas del usuario a memoria"""
+    total_predictions = Prediction.query.filter_by(user_id=user_id).count()
+    recent_predictions = Prediction.query.filter_by(user_id=user_id)\
+        .order_by(Prediction.timestamp.desc()).limit(10).all()
+    all_predictions = Prediction.query.filter_by(user_id=user_id).all()
+    avg_confidence = sum(p.confidence for p in all_predictions) / len(all_predictions) if all_predictions else 0
+    word_counts = {}
+    for pred in all_predictions:
+        word_counts[pred.word] = word_counts.get(pred.word, 0) + 1
+    top_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    return {'total_predictions': total_predictions, 'avg_confidence': avg_confidence,
+            'top_words': top_words, 'recent_predictions': recent_predictions}
+
+
+def aggregate_stats(user_id: int) -> dict:
+    """Agregación sobre predictions con los índices (user_id, word, confidence) y (user_id, timestamp)"""
+    total_predictions, avg_confidence = db.session.query(
+        db.func.count(), db.func.avg(Prediction.confidence)
+    ).filter(Prediction.user_id == user_id).one()
+    word_count = db.func.count()
+    top_words = db.session.query(Prediction.word, word_count).filter(Prediction.user_id == user_id)\
+        .group_by(Prediction.word).order_by(word_count.desc()).limit(5).all()
+    recent_predictions = Prediction.query.filter_by(user_id=user_id)\
+        .order_by(Prediction.timestamp.desc()).limit(10).all()
+    return {'total_predictions': total_predictions, 'avg_confidence': avg_confidence,
+            'top_words': top_words, 'recent_predictions': recent_predictions}
+
+
+def raw_system_stats() -> dict:
+    """Cálculo anterior de get_system_stats sobre la tabla completa"""
+    word_count = db.func.count(Prediction.word)
+    return {
+        'total_users': User.query.count(),
+        'total_predictions': Prediction.query.count(),
+        'avg_confidence': db.session.query(db.func.avg(Prediction.confidence)).scalar() or 0.0,
+        'top_word': db.session.query(Prediction.word, word_count).group_by(Prediction.word)
+                    .order_by(word_count.desc()).first(),
+    }
+
+
+def fill(rows: int, user_id: int, start: datetime):
+    batch = []
+    for i in range(rows):
+        batch.append({
+            'public_id': f'{user_id}-{start.timestamp()}-{i}',
+            'user_id': user_id,
+            'word': random.choice(WORDS),
+            'word_id': 'bench',
+            'confidence': random.uniform(0.5, 1.0),
+            'timestamp': start + timedelta(seconds=i),
+        })
+        if len(batch) == 50000:
+            insert_predictions(batch)
+            batch = []
+    if batch:
+        insert_predictions(batch)
+
+
+def measure(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        db.session.expire_all()
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--light-rows', type=int, default=200)
+    parser.add_argument('--heavy-share', type=float, default=0.05)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    checkpoints = sorted({args.rows // 100, args.rows // 10, args.rows})
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        db.init_app(app)
+        with app.app_context():
+            create_tables()
+            for user_id in (LIGHT, HEAVY, OTHERS):
+                user = User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@lsch.com')
+                user.set_password('bench')
+                db.session.add(user)
+            db.session.commit()
+            fill(args.light_rows, LIGHT, datetime(2024, 1, 1))
+            
+            print(f"usuario liviano: {args.light_rows} predicciones, pesado: {args.heavy_share:.0%} del total "
+                  f"(mediana de {args.repeats}, ms)")
+            columns = ['liviano py', 'liviano sql', 'liviano rollup', 'pesado py', 'pesado sql', 'pesado rollup',
+                       'sistema sql', 'sistema rollup']
+            print(f"{'filas':>9}{'pesado':>8}" + ''.join(f"{column:>{len(column) + 2}}" for column in columns))
+            total, heavy = args.light_rows, 0
+            for checkpoint in checkpoints:
+                new_heavy = int(checkpoint * args.heavy_share) - heavy
+                new_others = checkpoint - total - new_heavy
+                fill(new_heavy, HEAVY, datetime(2024, 1, 1) + timedelta(seconds=heavy))
+                fill(new_others, OTHERS, datetime(2024, 1, 1) + timedelta(seconds=total))
+                heavy += new_heavy
+                total += new_heavy + new_others
+                
+                rollup, legacy = get_user_stats(HEAVY, top_words=5), legacy_stats(HEAVY)
+                assert rollup['total_predictions'] == legacy['total_predictions']
+                assert abs(rollup['avg_confidence'] - legacy['avg_confidence']) < 1e-9
+                assert [count for _, count in rollup['top_words']] == [count for _, count in legacy['top_words']]
+                assert get_system_stats()['total_predictions'] == raw_system_stats()['total_predictions']
+                
+                row = []
+                for user_id in (LIGHT, HEAVY):
+                    row += [measure(lambda: legacy_stats(user_id), args.repeats),
+                            measure(lambda: aggregate_stats(user_id), args.repeats),
+                            measure(lambda: get_user_stats(user_id, top_words=5), args.repeats)]
+                row += [measure(raw_system_stats, args.repeats), measure(get_system_stats, args.repeats)]
+                print(f"{total:>9}{heavy:>8}" + ''.join(f"{value:>{len(column) + 2}.2f}" for value, column in zip(row, columns)))
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
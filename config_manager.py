@@ -98,6 +98,7 @@ class ConfigManager:
         self.DATA_PATH = self.root_path / self.paths.data
         self.MODEL_FOLDER_PATH = self.root_path / self.paths.models
         self.KEYPOINTS_PATH = self.root_path / self.paths.keypoints
+        self.DATASET_PATH = self.root_path / self.paths.get('dataset', 'data/dataset')
         
         # Archivos específicos
         self.DATA_JSON_PATH = self.root_path / self.paths.data_json
@@ -110,6 +111,18 @@ class ConfigManager:
         """Retorna la ruta absoluta del modelo entrenado"""
         return self.MODEL_PATH
     
+    def get_inference_model_path(self, backend: str = None) -> Path:
+        """
+        Retorna la ruta del modelo que carga el backend de inferencia
+        
+        Args:
+            backend: keras, tflite u onnx (default: inference.backend)
+        """
+        backend = backend or self.inference.backend
+        if backend == 'keras':
+            return self.MODEL_PATH
+        return self.MODEL_FOLDER_PATH / self.inference[f'{backend}_filename']
+    
     def get_keypoints_path(self, word_id: str = None) -> Path:
         """
         Retorna la ruta a la carpeta de keypoints o a un archivo específico
@@ -121,6 +134,18 @@ class ConfigManager:
             return self.KEYPOINTS_PATH / f"{word_id}.h5"
         return self.KEYPOINTS_PATH
     
+    def get_dataset_path(self, word_id: str = None) -> Path:
+        """
+        Retorna la ruta al dataset columnar de keypoints o a la carpeta de una palabra
+        
+        Args:
+            word_id: Si se especifica, retorna la carpeta (frames.npy, offsets.npy,
+                lengths.npy, manifest.json) de esa palabra
+        """
+        if word_id:
+            return self.DATASET_PATH / word_id
+        return self.DATASET_PATH
+    
     def get_frame_actions_path(self, word_id: str = None) -> Path:
         """
         Retorna la ruta a la carpeta frame_actions o a una palabra específica
@@ -144,7 +169,7 @@ class ConfigManager:
         
         Args:
             word_id: ID de la palabra (ej: "buenos_dias")
-            
+        
         Returns:
             Texto formateado (ej: "BUENOS DÍAS")
         """
@@ -162,6 +187,7 @@ class ConfigManager:
             'frames': self.model.frames,
             'keypoints_length': self.model.keypoints_length,
             'min_length_frames': self.model.min_length_frames,
+            'max_length_frames': self.model.max_length_frames,
         }
     
     def get_network_config(self) -> Dict[str, Any]:
@@ -181,6 +207,7 @@ class ConfigManager:
             self.DATA_PATH,
             self.MODEL_FOLDER_PATH,
             self.KEYPOINTS_PATH,
+            self.DATASET_PATH,
         ]
         
         for directory in directories:
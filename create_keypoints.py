@@ -1,64 +1,303 @@
 import os
-import pandas as pd
+import time
+import hashlib
+import argparse
+import multiprocessing
+from typing import NamedTuple, Optional
 from mediapipe.python.solutions.holistic import Holistic
 from helpers import *
 from constants import *
+from config_manager import config
+from keypoints_dataset import KeypointsDataset, KeypointsDatasetWriter, dataset_exists
 from logger_config import get_logger
 
 # Configurar logger
 logger = get_logger(__name__)
 
-def create_keypoints(word_id, words_path, hdf_path):
+FRAME_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+# ==================== REGENERACIÓN INCREMENTAL ====================
+# Cada muestra del dataset guarda una huella de su carpeta de frames:
+#   signature: hash de (nombre, tamaño, mtime) de los frames - barato, sin leer archivos
+#   sha1: hash del contenido de los frames - solo se calcula si cambió la firma
+
+def _frame_files(sample_path):
+    return sorted(name for name in os.listdir(sample_path) if name.lower().endswith(FRAME_EXTENSIONS))
+
+
+def sample_signature(sample_path):
+    digest = hashlib.sha1()
+    for name in _frame_files(sample_path):
+        stat = os.stat(os.path.join(sample_path, name))
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def sample_content_hash(sample_path):
+    digest = hashlib.sha1()
+    for name in _frame_files(sample_path):
+        digest.update(name.encode('utf-8') + b'\0')
+        with open(os.path.join(sample_path, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SamplePlan(NamedTuple):
+    name: str
+    path: str
+    fingerprint: dict
+    reuse_index: Optional[int]  # índice en el dataset anterior; None = extraer con MediaPipe
+
+
+class WordPlan(NamedTuple):
+    samples: list
+    previous: Optional[KeypointsDataset]
+    removed: int
+    changed: bool
+    
+    @property
+    def n_extract(self):
+        return sum(sample.reuse_index is None for sample in self.samples)
+
+
+def plan_word(word_id, words_path, dataset_path, full=False):
     '''
-    ### CREAR KEYPOINTS PARA UNA PALABRA
-    Recorre la carpeta de frames de la palabra y guarda sus keypoints en `hdf_path`
+    ### PLANIFICAR LA REGENERACIÓN DE UNA PALABRA
+    Compara las carpetas de `frame_actions/<word_id>` con las huellas guardadas en
+    el dataset anterior: las muestras sin cambios se reutilizan, las nuevas o
+    modificadas se extraen y las que ya no existen se descartan.
     '''
-    logger.info(f"Procesando palabra: {word_id}")
-    data = pd.DataFrame([])
     frames_path = os.path.join(words_path, word_id)
+    sample_list = sorted(os.listdir(frames_path))
+    
+    previous = None
+    if not full and dataset_exists(dataset_path):
+        try:
+            previous = KeypointsDataset(dataset_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"  Dataset anterior ilegible, se regenera completo: {e}")
     
-    with Holistic() as holistic:
-        sample_list = os.listdir(frames_path)
-        sample_count = len(sample_list)
-        logger.info(f"  Encontradas {sample_count} muestras")
+    previous_index = {name: i for i, name in enumerate(previous.sample_names)} if previous else {}
+    previous_fingerprints = previous.sample_fingerprints if previous else {}
+    
+    samples, changed = [], previous is None
+    for sample_name in sample_list:
+        sample_path = os.path.join(frames_path, sample_name)
+        signature = sample_signature(sample_path)
+        old = previous_fingerprints.get(sample_name)
+        
+        if old and old.get('signature') == signature and sample_name in previous_index:
+            samples.append(SamplePlan(sample_name, sample_path, old, previous_index[sample_name]))
+            continue
         
-        for n_sample, sample_name in enumerate(sample_list, start=1):
-            sample_path = os.path.join(frames_path, sample_name)
-            keypoints_sequence = get_keypoints(holistic, sample_path)
-            data = insert_keypoints_sequence(data, n_sample, keypoints_sequence)
+        fingerprint = {'signature': signature, 'sha1': sample_content_hash(sample_path)}
+        same_content = old and old.get('sha1') == fingerprint['sha1']
+        reuse_index = previous_index.get(sample_name) if same_content else None
+        samples.append(SamplePlan(sample_name, sample_path, fingerprint, reuse_index))
+        changed = True
+    
+    removed = len(set(previous_index) - set(sample_list))
+    changed = changed or removed > 0
+    return WordPlan(samples, previous, removed, changed)
+
+
+def _log_plan(plan):
+    n_reused = len(plan.samples) - plan.n_extract
+    logger.info(
+        f"  {len(plan.samples)} muestras: {plan.n_extract} a extraer, "
+        f"{n_reused} reutilizadas, {plan.removed} eliminadas"
+    )
+
+
+def create_keypoints(word_id, words_path, dataset_path, full=False):
+    '''
+    ### CREAR KEYPOINTS PARA UNA PALABRA
+    Recorre la carpeta de frames de la palabra y guarda sus keypoints en el
+    dataset columnar `dataset_path` (ver `keypoints_dataset.py`).
+    Solo extrae las muestras nuevas o modificadas salvo que `full` sea True.
+    '''
+    logger.info(f"Procesando palabra: {word_id}")
+    plan = plan_word(word_id, words_path, dataset_path, full)
+    
+    if not plan.changed:
+        logger.info(f"  ✓ Sin cambios ({len(plan.samples)} muestras)")
+        return
+    _log_plan(plan)
+    
+    holistic = Holistic() if plan.n_extract else None
+    try:
+        with KeypointsDatasetWriter(dataset_path, word_id) as writer:
+            n_extracted = 0
+            for sample in plan.samples:
+                if sample.reuse_index is not None:
+                    writer.append(plan.previous[sample.reuse_index], sample.name, sample.fingerprint)
+                    continue
+                
+                writer.append(get_keypoints(holistic, sample.path), sample.name, sample.fingerprint)
+                n_extracted += 1
+                if n_extracted % 10 == 0 or n_extracted == plan.n_extract:
+                    logger.debug(f"  Progreso: {n_extracted}/{plan.n_extract}")
             
-            if n_sample % 10 == 0 or n_sample == sample_count:
-                logger.debug(f"  Progreso: {n_sample}/{sample_count}")
+            if plan.previous is not None:
+                plan.previous.release()
+    finally:
+        if holistic is not None:
+            holistic.close()
+    
+    logger.info(f"  ✓ Keypoints guardados: {dataset_path} ({len(plan.samples)} muestras)")
+
+
+# ==================== MODO PARALELO ====================
+# Cada proceso del pool mantiene su propia instancia de Holistic
+
+_holistic = None
+
+
+def _init_worker():
+    global _holistic
+    _holistic = Holistic()
+
+
+def _extract_sample(task):
+    """Extrae los keypoints de una muestra en un proceso del pool"""
+    sample_name, sample_path = task
+    start = time.perf_counter()
+    try:
+        kp_seq, error = get_keypoints(_holistic, sample_path), None
+    except Exception as e:
+        kp_seq, error = None, f"{sample_name}: {e}"
+    return sample_name, kp_seq, error, os.getpid(), time.perf_counter() - start
+
+
+def _log_worker_stats(worker_stats, elapsed):
+    total_frames = sum(stats['frames'] for stats in worker_stats.values())
+    logger.info(f"Throughput total: {total_frames / elapsed:.1f} frames/s en {elapsed:.1f}s")
+    for n_worker, (pid, stats) in enumerate(sorted(worker_stats.items()), 1):
+        fps = stats['frames'] / stats['busy'] if stats['busy'] else 0.0
+        logger.info(
+            f"  Worker {n_worker} (pid {pid}): {stats['samples']} muestras, "
+            f"{stats['frames']} frames, {fps:.1f} frames/s"
+        )
+
 
-    data.to_hdf(hdf_path, key="data", mode="w")
-    logger.info(f"  ✓ Keypoints guardados: {hdf_path} ({sample_count} muestras)")
+def create_keypoints_parallel(word_ids, words_path, workers, full=False):
+    '''
+    ### CREAR KEYPOINTS EN PARALELO
+    Reparte las muestras a extraer de todas las palabras entre `workers` procesos
+    (cada uno con su propio Holistic). Los resultados vuelven en el orden original
+    de las muestras y un único escritor los guarda por palabra, igual que
+    `create_keypoints`.
+    '''
+    plans = {}
+    for word_id in word_ids:
+        try:
+            plan = plan_word(word_id, words_path, config.get_dataset_path(word_id), full)
+        except OSError as e:
+            logger.error(f"  ❌ Error procesando '{word_id}': {e}")
+            continue
+        
+        if plan.changed:
+            plans[word_id] = plan
+        else:
+            logger.info(f"  ✓ {word_id}: sin cambios ({len(plan.samples)} muestras)")
+    
+    tasks = [
+        (sample.name, sample.path)
+        for plan in plans.values() for sample in plan.samples
+        if sample.reuse_index is None
+    ]
+    logger.info(f"Procesando {len(tasks)} muestras con {workers} workers")
+    worker_stats = {}
+    start = time.perf_counter()
+    
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        results = pool.imap(_extract_sample, tasks)
+        
+        for idx, (word_id, plan) in enumerate(plans.items(), 1):
+            logger.info(f"[{idx}/{len(plans)}] {word_id}")
+            _log_plan(plan)
+            dataset_path = config.get_dataset_path(word_id)
+            writer = KeypointsDatasetWriter(dataset_path, word_id)
+            word_error = None
+            n_extracted = 0
+            
+            for sample in plan.samples:
+                if sample.reuse_index is not None:
+                    if word_error is None:
+                        writer.append(plan.previous[sample.reuse_index], sample.name, sample.fingerprint)
+                    continue
+                
+                sample_name, kp_seq, error, pid, busy = next(results)
+                n_extracted += 1
+                
+                stats = worker_stats.setdefault(pid, {'samples': 0, 'frames': 0, 'busy': 0.0})
+                stats['samples'] += 1
+                stats['busy'] += busy
+                
+                if error:
+                    word_error = word_error or error
+                elif word_error is None:
+                    stats['frames'] += len(kp_seq)
+                    writer.append(kp_seq, sample_name, sample.fingerprint)
+                
+                if n_extracted % 10 == 0 or n_extracted == plan.n_extract:
+                    frames_done = sum(stats['frames'] for stats in worker_stats.values())
+                    logger.debug(
+                        f"  Progreso: {n_extracted}/{plan.n_extract} "
+                        f"({frames_done / (time.perf_counter() - start):.1f} frames/s)"
+                    )
+            
+            if plan.previous is not None:
+                plan.previous.release()
+            
+            if word_error:
+                logger.error(f"  ❌ Error procesando '{word_id}': {word_error}")
+            else:
+                writer.close()
+                logger.info(f"  ✓ Keypoints guardados: {dataset_path} ({len(plan.samples)} muestras)")
+    
+    _log_worker_stats(worker_stats, time.perf_counter() - start)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el dataset de keypoints desde frame_actions/")
+    parser.add_argument('words', nargs='*', help='palabras a procesar (default: todas)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='procesos de extracción en paralelo (0 = todos los núcleos)')
+    parser.add_argument('--full', action='store_true',
+                        help='re-extrae todas las muestras aunque no hayan cambiado')
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count()
+    
     logger.info("=" * 70)
     logger.info("INICIANDO CREACIÓN DE KEYPOINTS")
     logger.info("=" * 70)
-    # Crea la carpeta `keypoints` en caso no exista
-    create_folder(KEYPOINTS_PATH)
-    logger.info(f"Directorio de keypoints: {KEYPOINTS_PATH}")
+    # Crea la carpeta del dataset en caso no exista
+    create_folder(config.get_dataset_path())
+    logger.info(f"Directorio del dataset: {config.get_dataset_path()}")
     
     # GENERAR TODAS LAS PALABRAS
     word_ids = [word for word in os.listdir(os.path.join(ROOT_PATH, FRAME_ACTIONS_PATH))]
     
     # GENERAR PARA UNA PALABRA O CONJUNTO
-    # word_ids = ["bien"]
-    # word_ids = ["buenos_dias", "como_estas", "disculpa", "gracias", "hola-der", "hola-izq", "mal", "mas_o_menos", "me_ayudas", "por_favor"]
+    # python create_keypoints.py bien buenos_dias --workers 4
+    if args.words:
+        word_ids = args.words
     
     logger.info(f"Procesando {len(word_ids)} palabras")
     
-    for idx, word_id in enumerate(word_ids, 1):
-        hdf_path = os.path.join(KEYPOINTS_PATH, f"{word_id}.h5")
-        logger.info(f"[{idx}/{len(word_ids)}] {word_id}")
-        try:
-            create_keypoints(word_id, FRAME_ACTIONS_PATH, hdf_path)
-        except Exception as e:
-            logger.error(f"  ❌ Error procesando '{word_id}': {e}", exc_info=True)
+    if workers > 1:
+        create_keypoints_parallel(word_ids, FRAME_ACTIONS_PATH, workers, args.full)
+    else:
+        for idx, word_id in enumerate(word_ids, 1):
+            dataset_path = config.get_dataset_path(word_id)
+            logger.info(f"[{idx}/{len(word_ids)}] {word_id}")
+            try:
+                create_keypoints(word_id, FRAME_ACTIONS_PATH, dataset_path, args.full)
+            except Exception as e:
+                logger.error(f"  ❌ Error procesando '{word_id}': {e}", exc_info=True)
     
     logger.info("=" * 70)
     logger.info("✓ CREACIÓN DE KEYPOINTS COMPLETADA")
-    logger.info("=" * 70)
\ No newline at end of file
+    logger.info("=" * 70)
@@ -2,49 +2,30 @@ import os
 import cv2
 import numpy as np
 from mediapipe.python.solutions.holistic import Holistic
-from keras.models import load_model
+from config_manager import config
+from inference_model import InferenceModel
+from sign_segmenter import SignSegmenter
+from sign_spotting import SignSpotter
 from helpers import *
 from constants import *
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 from text_to_speech import text_to_speech
 
-def interpolate_keypoints(keypoints, target_length=15):
-    current_length = len(keypoints)
-    if current_length == target_length:
-        return keypoints
-    
-    indices = np.linspace(0, current_length - 1, target_length)
-    interpolated_keypoints = []
-    for i in indices:
-        lower_idx = int(np.floor(i))
-        upper_idx = int(np.ceil(i))
-        weight = i - lower_idx
-        if lower_idx == upper_idx:
-            interpolated_keypoints.append(keypoints[lower_idx])
-        else:
-            interpolated_point = (1 - weight) * np.array(keypoints[lower_idx]) + weight * np.array(keypoints[upper_idx])
-            interpolated_keypoints.append(interpolated_point.tolist())
-    
-    return interpolated_keypoints
+def add_word(sentence, word_id):
+    sent = words_text.get(word_id.split('-')[0])
+    sentence.insert(0, sent)
+    text_to_speech(sent) # ONLY LOCAL (NO SERVER)
 
-def normalize_keypoints(keypoints, target_length=15):
-    current_length = len(keypoints)
-    if current_length < target_length:
-        return interpolate_keypoints(keypoints, target_length)
-    elif current_length > target_length:
-        step = current_length / target_length
-        indices = np.arange(0, current_length, step).astype(int)[:target_length]
-        return [keypoints[i] for i in indices]
-    else:
-        return keypoints
-    
-def evaluate_model(src=None, threshold=0.8, margin_frame=1, delay_frames=3):
-    kp_seq, sentence = [], []
+
+def evaluate_model(src=None, threshold=0.8, margin_frame=1, delay_frames=3, continuous=None):
+    sentence = []
     word_ids = get_word_ids(WORDS_JSON_PATH)
-    model = load_model(MODEL_PATH)
-    count_frame = 0
-    fix_frames = 0
-    recording = False
+    model = InferenceModel(MODEL_PATH)
+    # continuous: ventana deslizante (sign_spotting) en vez de segmentar por ausencia de manos
+    if continuous is None:
+        continuous = config.spotting.enabled
+    spotter = SignSpotter(model.predict_batch, threshold=threshold) if continuous else None
+    segmenter = SignSegmenter(margin_frame, delay_frames)
     
     with Holistic() as holistic_model:
         video = cv2.VideoCapture(src or 0)
@@ -55,37 +36,20 @@ def evaluate_model(src=None, threshold=0.8, margin_frame=1, delay_frames=3):
 
             results = mediapipe_detection(frame, holistic_model)
             
-            # TODO: colocar un máximo de frames para cada seña,
-            # es decir, que traduzca incluso cuando hay mano si se llega a ese máximo.
-            if there_hand(results) or recording:
-                recording = False
-                count_frame += 1
-                if count_frame > margin_frame:
-                    kp_frame = extract_keypoints(results)
-                    kp_seq.append(kp_frame)
+            if spotter is not None:
+                for sign in spotter.push(extract_keypoints(results)):
+                    add_word(sentence, word_ids[sign.word_index])
             
             else:
-                if count_frame >= MIN_LENGTH_FRAMES + margin_frame:
-                    fix_frames += 1
-                    if fix_frames < delay_frames:
-                        recording = True
-                        continue
-                    kp_seq = kp_seq[: - (margin_frame + delay_frames)]
+                # La seña se cierra al bajar las manos o al llegar a model.max_length_frames
+                kp_seq = segmenter.push(results)
+                if kp_seq is not None:
                     kp_normalized = normalize_keypoints(kp_seq, int(MODEL_FRAMES))
-                    res = model.predict(np.expand_dims(kp_normalized, axis=0))[0]
+                    res = model.predict_one(kp_normalized)
                     
                     print(np.argmax(res), f"({res[np.argmax(res)] * 100:.2f}%)")
                     if res[np.argmax(res)] > threshold:
-                        word_id = word_ids[np.argmax(res)].split('-')[0]
-                        
-                        sent = words_text.get(word_id)
-                        sentence.insert(0, sent)
-                        text_to_speech(sent) # ONLY LOCAL (NO SERVER)
-                
-                recording = False
-                fix_frames = 0
-                count_frame = 0
-                kp_seq = []
+                        add_word(sentence, word_ids[np.argmax(res)])
             
             if not src:
                 cv2.rectangle(frame, (0, 0), (640, 35), (245, 117, 16), -1)
@@ -96,6 +60,10 @@ def evaluate_model(src=None, threshold=0.8, margin_frame=1, delay_frames=3):
                 if cv2.waitKey(10) & 0xFF == ord('q'):
                     break
                     
+        if spotter is not None:
+            for sign in spotter.flush():
+                add_word(sentence, word_ids[sign.word_index])
+        
         video.release()
         cv2.destroyAllWindows()
         return sentence
@@ -0,0 +1,71 @@
+"""
+frame_codec.py - Decodificación de frames recibidos por el backend web
+======================================================================
+
+Los clientes envían cada frame de cámara como imagen comprimida (JPEG/WebP):
+
+- binario (recomendado): bytes crudos como adjunto binario de Socket.IO o
+  cuerpo `image/*` / `application/octet-stream` del endpoint REST
+- base64 (legado): data URL `data:image/jpeg;base64,...` o base64 plano
+
+El camino binario evita el ~33% extra del base64 y su decodificación: los
+bytes recibidos van directo a `cv2.imdecode` sin copias.
+
+Uso:
+    from frame_codec import decode_frame
+    
+    frame = decode_frame(data['frame'])   # bytes o data URL -> BGR uint8
+"""
+
+import base64
+import binascii
+from typing import Union
+
+import cv2
+import numpy as np
+
+FramePayload = Union[bytes, bytearray, memoryview, str]
+
+
+def decode_image_bytes(data) -> np.ndarray:
+    """
+    Decodifica una imagen comprimida (JPEG, WebP, PNG) desde bytes
+    
+    Returns:
+        np.ndarray: Imagen BGR uint8 (alto, ancho, 3)
+    
+    Raises:
+        ValueError: Si los bytes están vacíos o no son una imagen
+    """
+    # cv2.imdecode lanza cv2.error (no retorna None) con un buffer vacío
+    if not len(data):
+        raise ValueError("Frame vacío")
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("No se pudo decodificar la imagen recibida")
+    return frame
+
+
+def decode_base64_image(data_url: str) -> np.ndarray:
+    """Decodifica una data URL (`data:image/...;base64,`) o base64 plano"""
+    try:
+        return decode_image_bytes(base64.b64decode(data_url.split(',', 1)[-1]))
+    except binascii.Error as e:
+        raise ValueError(f"Frame base64 inválido: {e}") from e
+
+
+def decode_frame(payload: FramePayload) -> np.ndarray:
+    """
+    Decodifica un frame en cualquiera de los formatos aceptados
+    
+    Args:
+        payload: bytes (binario) o str (data URL / base64 legado)
+    
+    Returns:
+        np.ndarray: Imagen BGR uint8
+    """
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return decode_image_bytes(payload)
+    if isinstance(payload, str):
+        return decode_base64_image(payload)
+    raise ValueError(f"Formato de frame no soportado: {type(payload).__name__}")
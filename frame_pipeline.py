@@ -0,0 +1,302 @@
+"""
+frame_pipeline.py - Pipeline por etapas con colas acotadas
+==========================================================
+
+Saca el procesamiento de frames del handler de Socket.IO: el handler solo
+encola y cada etapa corre en sus propios hilos de trabajo.
+
+    submit(clave, item) -> [etapa 1] -> [etapa 2] -> ... -> [etapa n]
+
+- Cada etapa tiene `workers` hilos, cada uno con su cola acotada
+  (`queue_size`). Los items se reparten por clave (`hash(clave) % workers`),
+  así los frames de una sesión se procesan en orden y su estado (segmentador,
+  tracking) solo lo toca un hilo por etapa.
+- La función de la etapa recibe (clave, item) y retorna el item de la etapa
+  siguiente, o None para terminar ahí.
+- Cuando una cola está llena se aplica la política de la etapa:
+  `block` (contrapresión: espera hasta `put_timeout` y luego descarta el
+  nuevo), `drop_oldest` (descarta el más antiguo de la cola) o `drop_newest`
+  (descarta el nuevo).
+- `latest` (el último frame gana): cada clave tiene a lo sumo un item en
+  espera en la cola; uno nuevo reemplaza al pendiente de la misma clave en
+  su lugar de la fila, sin esperar a que la cola se llene. Con la cola llena
+  de otras claves se descarta el más antiguo.
+- Métricas por etapa: profundidad de cola, procesados, descartados, errores,
+  espera en cola y tiempo de servicio (p50/p95/p99/max), más la latencia
+  total desde `submit` hasta el fin del pipeline.
+
+Los hilos bastan: MediaPipe, OpenCV y TensorFlow liberan el GIL en su parte
+pesada, y el estado de las sesiones vive en el proceso.
+
+Uso:
+    from frame_pipeline import FramePipeline, PipelineStage
+    
+    pipeline = FramePipeline([
+        PipelineStage('decode', decode, workers=2, policy='drop_oldest'),
+        PipelineStage('infer', infer),
+    ])
+    pipeline.start()
+    pipeline.submit(session_id, payload)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional
+
+from latency_metrics import percentiles
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('block', 'drop_oldest', 'drop_newest', 'latest')
+
+_STOP = object()
+
+
+class PipelineStage:
+    """
+    Definición de una etapa del pipeline
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Hashable, Any], Optional[Any]],
+        workers: int = 1,
+        queue_size: int = 8,
+        policy: str = 'block',
+        put_timeout: float = None,
+    ):
+        """
+        Args:
+            name: Nombre usado en métricas y logs
+            fn: (clave, item) -> item siguiente o None
+            workers: Hilos de la etapa
+            queue_size: Capacidad de la cola de cada hilo
+            policy: 'block', 'drop_oldest' o 'drop_newest' con la cola llena, o 'latest'
+                    (un item pendiente por clave)
+            put_timeout: Espera máxima de 'block' en segundos (None = sin límite)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Política desconocida: {policy} (opciones: {', '.join(POLICIES)})")
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers y queue_size deben ser >= 1")
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue_size = queue_size
+        self.policy = policy
+        self.put_timeout = put_timeout
+
+
+class _Task(NamedTuple):
+    key: Hashable
+    item: Any
+    submitted_at: float
+    enqueued_at: float
+
+
+class _BoundedQueue:
+    """Cola FIFO acotada con descarte del más antiguo, del nuevo o del pendiente de la misma clave"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def put(self, task, policy: str, timeout: float = None):
+        """
+        Encola según la política
+        
+        Returns:
+            La tarea descartada (la más antigua o la nueva) o None
+        """
+        with self._cond:
+            if policy == 'latest' and task is not _STOP:
+                for i, queued in enumerate(self._items):
+                    if queued is not _STOP and queued.key == task.key:
+                        self._items[i] = task
+                        return queued
+            if task is not _STOP and len(self._items) >= self.maxsize:
+                if policy == 'drop_newest':
+                    return task
+                if policy in ('drop_oldest', 'latest'):
+                    dropped = self._items.popleft()
+                    self._items.append(task)
+                    return dropped
+                if not self._cond.wait_for(lambda: len(self._items) < self.maxsize, timeout):
+                    return task
+            self._items.append(task)
+            self._cond.notify_all()
+            return None
+    
+    def get(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._items)
+            task = self._items.popleft()
+            self._cond.notify_all()
+            return task
+
+
+class _StageStats:
+    def __init__(self, window: int):
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.queue_wait = deque(maxlen=window)
+        self.service = deque(maxlen=window)
+
+
+class FramePipeline:
+    """
+    Pipeline de etapas conectadas por colas acotadas y particionadas por clave
+    """
+    
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        on_error: Callable[[str, Hashable, Exception], None] = None,
+        on_drop: Callable[[str, Hashable, Any], None] = None,
+        latency_window: int = 1000,
+    ):
+        """
+        Args:
+            stages: Etapas en orden
+            on_error: Llamado con (etapa, clave, excepción) si la función de una etapa falla
+            on_drop: Llamado con (etapa, clave, item) por cada item descartado
+            latency_window: Items recientes usados para las latencias
+        """
+        if not stages:
+            raise ValueError("El pipeline necesita al menos una etapa")
+        self.stages = stages
+        self.on_error = on_error
+        self.on_drop = on_drop
+        
+        self._queues = [[_BoundedQueue(stage.queue_size) for _ in range(stage.workers)] for stage in stages]
+        self._lock = threading.Lock()
+        self._stats = [_StageStats(latency_window) for _ in stages]
+        self._end_to_end = deque(maxlen=latency_window)
+        self._threads = []
+    
+    # ==================== CICLO DE VIDA ====================
+    
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+    
+    def start(self):
+        """Inicia los hilos de todas las etapas"""
+        if self.running:
+            return
+        self._threads = [
+            threading.Thread(target=self._work, args=(index, queue), name=f'pipeline-{stage.name}-{worker}', daemon=True)
+            for index, stage in enumerate(self.stages)
+            for worker, queue in enumerate(self._queues[index])
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Pipeline iniciado: " + " -> ".join(f"{stage.name}(x{stage.workers})" for stage in self.stages))
+    
+    def stop(self, timeout: float = None):
+        """Detiene las etapas en orden tras procesar lo ya encolado"""
+        if not self.running:
+            return
+        threads = iter(self._threads)
+        for queues in self._queues:
+            for queue in queues:
+                queue.put(_STOP, 'block')
+            for _ in queues:
+                next(threads).join(timeout)
+        self._threads = []
+    
+    # ==================== ENTRADA ====================
+    
+    def submit(self, key: Hashable, item) -> bool:
+        """
+        Encola un item en la primera etapa
+        
+        Returns:
+            bool: False si el item fue descartado por la política de la etapa
+        """
+        if not self.running:
+            raise RuntimeError("El pipeline no está iniciado")
+        now = time.perf_counter()
+        task = _Task(key, item, now, now)
+        return self._put(0, task) is not task
+    
+    def _put(self, index: int, task: _Task):
+        stage = self.stages[index]
+        queue = self._queues[index][hash(task.key) % stage.workers]
+        dropped = queue.put(task, stage.policy, stage.put_timeout)
+        if dropped is not None:
+            with self._lock:
+                self._stats[index].dropped += 1
+            if self.on_drop is not None:
+                self.on_drop(stage.name, dropped.key, dropped.item)
+        return dropped
+    
+    # ==================== HILOS DE TRABAJO ====================
+    
+    def _work(self, index: int, queue: _BoundedQueue):
+        stage = self.stages[index]
+        stats = self._stats[index]
+        last = index == len(self.stages) - 1
+        while True:
+            task = queue.get()
+            if task is _STOP:
+                return
+            
+            started = time.perf_counter()
+            try:
+                result = stage.fn(task.key, task.item)
+            except Exception as e:
+                logger.error(f"Error en etapa {stage.name} ({task.key}): {e}", exc_info=True)
+                with self._lock:
+                    stats.errors += 1
+                if self.on_error is not None:
+                    self.on_error(stage.name, task.key, e)
+                continue
+            finished = time.perf_counter()
+            
+            with self._lock:
+                stats.processed += 1
+                stats.queue_wait.append((started - task.enqueued_at) * 1000)
+                stats.service.append((finished - started) * 1000)
+                if result is None or last:
+                    self._end_to_end.append((finished - task.submitted_at) * 1000)
+            
+            if result is not None and not last:
+                self._put(index + 1, task._replace(item=result, enqueued_at=finished))
+    
+    # ==================== MÉTRICAS ====================
+    
+    def metrics(self) -> dict:
+        """
+        Métricas del pipeline
+        
+        Returns:
+            dict: stages {nombre: queue_depth, processed, dropped, errors,
+                  queue_wait_ms, service_ms} y end_to_end_ms
+        """
+        with self._lock:
+            stages = {}
+            for stage, stats, queues in zip(self.stages, self._stats, self._queues):
+                stages[stage.name] = {
+                    'workers': stage.workers,
+                    'policy': stage.policy,
+                    'queue_depth': sum(len(queue) for queue in queues),
+                    'processed': stats.processed,
+                    'dropped': stats.dropped,
+                    'errors': stats.errors,
+                    'queue_wait_ms': percentiles(list(stats.queue_wait)),
+                    'service_ms': percentiles(list(stats.service)),
+                }
+            return {
+                'running': self.running,
+                'stages': stages,
+                'end_to_end_ms': percentiles(list(self._end_to_end)),
+            }
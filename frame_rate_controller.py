@@ -0,0 +1,131 @@
+"""
+frame_rate_controller.py - Tasa de envío adaptativa por sesión
+==============================================================
+
+El cliente envía frames con un temporizador sin importar la velocidad del
+servidor. El pipeline descarta los frames viejos (el último frame gana), y
+este controlador le indica al cliente cuántos frames por segundo y qué
+calidad JPEG puede sostener, para que deje de enviar frames que se
+descartarían.
+
+Cada `interval_s` compara lo recibido con lo procesado y la latencia de
+los frames procesados (recepción -> segmentación):
+
+- Sobrecarga (descartes > `max_drop_ratio` o latencia p90 > `target_latency_ms`):
+  fps = 90% de la tasa procesada y calidad - 0.1 (disminución multiplicativa)
+- Holgura: fps + `fps_step` y calidad + 0.05 (aumento aditivo)
+
+siempre dentro de [min_fps, max_fps] y [min_quality, max_quality].
+
+Uso:
+    from frame_rate_controller import FrameRateController
+    
+    rate = FrameRateController()
+    rate.received()                         # al llegar un frame
+    rate.dropped()                          # si el pipeline lo descarta
+    feedback = rate.processed(latency_ms)   # dict cada interval_s, si no None
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from config_manager import config
+
+
+class FrameRateController:
+    """
+    Recomendación AIMD de fps y calidad JPEG para una sesión
+    """
+    
+    def __init__(
+        self,
+        target_latency_ms: float = None,
+        min_fps: float = None,
+        max_fps: float = None,
+        min_quality: float = None,
+        max_quality: float = None,
+        interval_s: float = None,
+        max_drop_ratio: float = 0.05,
+        fps_step: float = 2.0,
+        clock=time.perf_counter,
+    ):
+        """
+        Args:
+            target_latency_ms: Latencia p90 aceptable (default: config.adaptive_rate.target_latency_ms)
+            min_fps, max_fps: Rango de fps recomendados
+            min_quality, max_quality: Rango de calidad JPEG (0-1, como canvas.toBlob)
+            interval_s: Segundos entre recomendaciones
+            max_drop_ratio: Fracción de frames descartados tolerada
+            fps_step: Aumento de fps por intervalo sin sobrecarga
+            clock: Reloj en segundos (inyectable en tests)
+        """
+        settings = config.adaptive_rate
+        self.target_latency_ms = target_latency_ms or settings.target_latency_ms
+        self.min_fps = min_fps or settings.min_fps
+        self.max_fps = max_fps or settings.max_fps
+        self.min_quality = min_quality or settings.min_quality
+        self.max_quality = max_quality or settings.max_quality
+        self.interval_s = interval_s or settings.feedback_interval_s
+        self.max_drop_ratio = max_drop_ratio
+        self.fps_step = fps_step
+        self.clock = clock
+        
+        self.fps = self.max_fps
+        self.quality = self.max_quality
+        self._lock = threading.Lock()
+        self._start_interval(self.clock())
+    
+    def _start_interval(self, now: float):
+        self._interval_start = now
+        self._received = 0
+        self._dropped = 0
+        self._latencies = []
+    
+    def received(self):
+        """Un frame llegó desde el cliente"""
+        with self._lock:
+            self._received += 1
+    
+    def dropped(self):
+        """El pipeline descartó un frame de la sesión"""
+        with self._lock:
+            self._dropped += 1
+    
+    def processed(self, latency_ms: float) -> dict:
+        """
+        Un frame terminó la segmentación
+        
+        Returns:
+            dict: fps, jpeg_quality, processed_fps, drop_ratio y latency_ms
+                  (p90) al cerrar un intervalo, si no None
+        """
+        with self._lock:
+            self._latencies.append(latency_ms)
+            now = self.clock()
+            elapsed = now - self._interval_start
+            if elapsed < self.interval_s:
+                return None
+            
+            processed_fps = len(self._latencies) / elapsed
+            drop_ratio = self._dropped / max(self._received, 1)
+            latency = float(np.percentile(self._latencies, 90))
+            
+            if drop_ratio > self.max_drop_ratio or latency > self.target_latency_ms:
+                self.fps = 0.9 * processed_fps
+                self.quality -= 0.1
+            else:
+                self.fps += self.fps_step
+                self.quality += 0.05
+            self.fps = min(max(self.fps, self.min_fps), self.max_fps)
+            self.quality = min(max(self.quality, self.min_quality), self.max_quality)
+            self._start_interval(now)
+            
+            return {
+                'fps': round(self.fps, 1),
+                'jpeg_quality': round(self.quality, 2),
+                'processed_fps': round(processed_fps, 1),
+                'drop_ratio': round(drop_ratio, 3),
+                'latency_ms': round(latency, 1),
+            }
@@ -17,6 +17,7 @@ from typing import NamedTuple, List, Tuple
 from pathlib import Path
 
 from config_manager import config
+from keypoints_dataset import KeypointsDataset, dataset_exists
 
 logger = logging.getLogger(__name__)
 
@@ -93,42 +94,246 @@ def save_frames(frames: List[np.ndarray], output_folder: str):
         )
 
 
-def extract_keypoints(results) -> np.ndarray:
-    pose = np.array([
-        [res.x, res.y, res.z, res.visibility]
-        for res in results.pose_landmarks.landmark
-    ]).flatten() if results.pose_landmarks else np.zeros(33 * 4)
+# Layout del vector de keypoints: pose (x, y, z, visibility) + face/manos (x, y, z)
+POSE_LANDMARKS = 33
+FACE_LANDMARKS = 468
+HAND_LANDMARKS = 21
+
+POSE_SLICE = slice(0, POSE_LANDMARKS * 4)
+FACE_SLICE = slice(POSE_SLICE.stop, POSE_SLICE.stop + FACE_LANDMARKS * 3)
+LEFT_HAND_SLICE = slice(FACE_SLICE.stop, FACE_SLICE.stop + HAND_LANDMARKS * 3)
+RIGHT_HAND_SLICE = slice(LEFT_HAND_SLICE.stop, LEFT_HAND_SLICE.stop + HAND_LANDMARKS * 3)
+KEYPOINTS_LENGTH = RIGHT_HAND_SLICE.stop
+
+assert KEYPOINTS_LENGTH == config.model.keypoints_length, \
+    f"model.keypoints_length ({config.model.keypoints_length}) no coincide con el layout ({KEYPOINTS_LENGTH})"
+
+_ZEROS = memoryview(np.zeros(KEYPOINTS_LENGTH, dtype=np.float32))
+
+
+def _write_landmarks(buffer: memoryview, start: int, stop: int, landmark_list, with_visibility: bool):
+    """
+    Escribe un grupo de landmarks en `buffer[start:stop]` (ceros si no fue detectado)
+    
+    Raises:
+        ValueError: Si la cantidad de landmarks no llena exactamente el tramo
+                    (p. ej. la cara refinada de 478 puntos)
+    """
+    if not landmark_list:
+        buffer[start:stop] = _ZEROS[:stop - start]
+        return
+    
+    values = 4 if with_visibility else 3
+    if len(landmark_list.landmark) * values != stop - start:
+        raise ValueError(
+            f"Cantidad de landmarks inválida: {len(landmark_list.landmark)} "
+            f"(se esperaban {(stop - start) // values})"
+        )
     
-    face = np.array([
-        [res.x, res.y, res.z]
-        for res in results.face_landmarks.landmark
-    ]).flatten() if results.face_landmarks else np.zeros(468 * 3)
+    i = start
+    if with_visibility:
+        for lm in landmark_list.landmark:
+            buffer[i] = lm.x
+            buffer[i + 1] = lm.y
+            buffer[i + 2] = lm.z
+            buffer[i + 3] = lm.visibility
+            i += 4
+    else:
+        for lm in landmark_list.landmark:
+            buffer[i] = lm.x
+            buffer[i + 1] = lm.y
+            buffer[i + 2] = lm.z
+            i += 3
+
+
+def has_hands(keypoints: np.ndarray) -> np.ndarray:
+    """
+    Equivalente de `there_hand` sobre keypoints ya extraídos
     
-    lh = np.array([
-        [res.x, res.y, res.z]
-        for res in results.left_hand_landmarks.landmark
-    ]).flatten() if results.left_hand_landmarks else np.zeros(21 * 3)
+    Returns:
+        np.ndarray: True por frame si hay alguna mano (keypoints de mano no nulos)
+    """
+    keypoints = np.asarray(keypoints)
+    return (keypoints[..., LEFT_HAND_SLICE].any(axis=-1)
+            | keypoints[..., RIGHT_HAND_SLICE].any(axis=-1))
+
+
+def extract_keypoints(results, out: np.ndarray = None) -> np.ndarray:
+    """
+    Extrae los keypoints de un resultado de MediaPipe Holistic
+    
+    Escribe pose, cara y manos directamente en un buffer float32 en una sola
+    pasada, sin listas intermedias ni `np.concatenate`.
     
-    rh = np.array([
-        [res.x, res.y, res.z]
-        for res in results.right_hand_landmarks.landmark
-    ]).flatten() if results.right_hand_landmarks else np.zeros(21 * 3)
+    Args:
+        results: Resultado de `Holistic.process()`
+        out: Buffer opcional float32 contiguo de shape (1662,) a reutilizar
     
-    keypoints = np.concatenate([pose, face, lh, rh])
+    Returns:
+        np.ndarray: Vector (1662,) float32 (el mismo `out` si se entregó)
+    """
+    if out is None:
+        out = np.empty(KEYPOINTS_LENGTH, dtype=np.float32)
+    elif out.shape != (KEYPOINTS_LENGTH,) or out.dtype != np.float32 or not out.flags.c_contiguous:
+        raise ValueError(f"Buffer de keypoints inválido: shape={out.shape}, dtype={out.dtype}")
     
-    assert keypoints.shape == (config.model.keypoints_length,), f"Keypoints shape incorrecto: {keypoints.shape}"
+    buffer = memoryview(out)
+    _write_landmarks(buffer, POSE_SLICE.start, POSE_SLICE.stop, results.pose_landmarks, True)
+    _write_landmarks(buffer, FACE_SLICE.start, FACE_SLICE.stop, results.face_landmarks, False)
+    _write_landmarks(buffer, LEFT_HAND_SLICE.start, LEFT_HAND_SLICE.stop, results.left_hand_landmarks, False)
+    _write_landmarks(buffer, RIGHT_HAND_SLICE.start, RIGHT_HAND_SLICE.stop, results.right_hand_landmarks, False)
     
+    return out
+
+
+def extract_keypoints_batch(results_list, out: np.ndarray = None) -> np.ndarray:
+    """
+    Extrae los keypoints de varios resultados de MediaPipe a una matriz (N, 1662)
+    
+    Args:
+        results_list: Secuencia de resultados de `Holistic.process()`
+        out: Buffer opcional float32 contiguo de shape (N, 1662) a reutilizar
+    
+    Returns:
+        np.ndarray: Matriz (N, 1662) float32
+    """
+    n_results = len(results_list)
+    if out is None:
+        out = np.empty((n_results, KEYPOINTS_LENGTH), dtype=np.float32)
+    elif out.shape != (n_results, KEYPOINTS_LENGTH) or out.dtype != np.float32 or not out.flags.c_contiguous:
+        raise ValueError(f"Buffer de keypoints inválido: shape={out.shape}, dtype={out.dtype}")
+    
+    for row, results in enumerate(results_list):
+        extract_keypoints(results, out[row])
+    
+    return out
+
+
+# ==================== NORMALIZACIÓN DE LONGITUD ====================
+# Remuestreo (n, D) -> (T, D) con un único gather + interpolación lineal.
+# Semántica (la de `evaluate_model` original):
+#   n < T: interpolación en np.linspace(0, n - 1, T)
+#   n > T: submuestreo en np.arange(0, n, n / T).astype(int)[:T]
+#   n == T: sin cambios
+
+def _linspace_plan(current_length: int, target_length: int):
+    positions = np.linspace(0, current_length - 1, target_length)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    return lower, upper, positions - lower
+
+
+def resample_plan(current_length: int, target_length: int):
+    """
+    Plan de remuestreo de `current_length` a `target_length` frames
+    
+    Se calcula una vez por longitud y se aplica con `gather_lerp` a cualquier
+    matriz de n filas (keypoints o proyecciones ya calculadas).
+    
+    Returns:
+        tuple: (lower, upper, weight) con el índice inferior/superior y el
+               peso de interpolación de cada frame de salida
+    """
+    if current_length < target_length:
+        return _linspace_plan(current_length, target_length)
+    step = current_length / target_length
+    indices = np.arange(0, current_length, step).astype(np.intp)[:target_length]
+    return indices, indices, np.zeros(target_length)
+
+
+def gather_lerp(keypoints: np.ndarray, lower: np.ndarray, upper: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    Aplica un plan de `resample_plan`: out[i] = (1 - w) * kp[lower] + w * kp[upper], en float32
+    
+    Los pesos se redondean a float32 antes de multiplicar, igual que el cálculo
+    original con NumPy 1.x; las filas con peso 0 se copian sin operar.
+    
+    Args:
+        keypoints: Matriz (n, D) float32
+        lower, upper, weight: Plan de `resample_plan(n, T)`
+    
+    Returns:
+        np.ndarray: Matriz (T, D) float32 nueva (no comparte memoria con `keypoints`)
+    """
+    out = keypoints[lower]
+    blend = weight != 0
+    if blend.any():
+        w = weight[blend][:, None]
+        out[blend] = (1 - w).astype(np.float32) * out[blend] + w.astype(np.float32) * keypoints[upper[blend]]
+    return out
+
+
+def _as_keypoints_array(keypoints) -> np.ndarray:
+    keypoints = np.asarray(keypoints, dtype=np.float32)
+    if keypoints.ndim != 2 or len(keypoints) == 0:
+        raise ValueError(f"Se esperaba una secuencia (n, D) no vacía, recibido shape={keypoints.shape}")
     return keypoints
 
 
+def interpolate_keypoints(keypoints, target_length: int = 15) -> np.ndarray:
+    """
+    Interpola linealmente una secuencia (n, D) a (target_length, D)
+    
+    Returns:
+        np.ndarray: Matriz (target_length, D) float32 contigua
+    """
+    keypoints = _as_keypoints_array(keypoints)
+    return gather_lerp(keypoints, *_linspace_plan(len(keypoints), target_length))
+
+
+def normalize_keypoints(keypoints, target_length: int = 15) -> np.ndarray:
+    """
+    Lleva una secuencia (n, D) a (target_length, D) frames
+    
+    Interpola si es más corta y submuestrea si es más larga.
+    
+    Args:
+        keypoints: Secuencia (n, D): array o lista de frames
+        target_length: Frames de salida (normalmente config.model.frames)
+    
+    Returns:
+        np.ndarray: Matriz (target_length, D) float32 contigua, lista para el modelo
+    """
+    keypoints = _as_keypoints_array(keypoints)
+    return gather_lerp(keypoints, *resample_plan(len(keypoints), target_length))
+
+
+def normalize_keypoints_batch(sequences, target_length: int = 15) -> np.ndarray:
+    """
+    Versión por lotes de `normalize_keypoints` para secuencias de distinta longitud
+    
+    Concatena las B secuencias y resuelve todas con un solo gather + interpolación.
+    
+    Args:
+        sequences: B secuencias (n_i, D)
+        target_length: Frames de salida por secuencia
+    
+    Returns:
+        np.ndarray: Tensor (B, target_length, D) float32 contiguo
+    """
+    sequences = [_as_keypoints_array(seq) for seq in sequences]
+    if not sequences:
+        return np.empty((0, target_length, KEYPOINTS_LENGTH), dtype=np.float32)
+    
+    plans = [resample_plan(len(seq), target_length) for seq in sequences]
+    offsets = np.cumsum([0] + [len(seq) for seq in sequences[:-1]])
+    lower = np.concatenate([plan[0] + offset for plan, offset in zip(plans, offsets)])
+    upper = np.concatenate([plan[1] + offset for plan, offset in zip(plans, offsets)])
+    weight = np.concatenate([plan[2] for plan in plans])
+    
+    out = gather_lerp(np.concatenate(sequences), lower, upper, weight)
+    return out.reshape(len(sequences), target_length, -1)
+
+
 def get_keypoints(model, sample_path: str) -> np.ndarray:
-    kp_seq = []
-    frame_files = sorted(os.listdir(sample_path))
+    frame_files = [
+        img_name for img_name in sorted(os.listdir(sample_path))
+        if img_name.lower().endswith(('.jpg', '.jpeg', '.png'))
+    ]
+    kp_seq = np.empty((len(frame_files), KEYPOINTS_LENGTH), dtype=np.float32)
+    n_frames = 0
     
     for img_name in frame_files:
-        if not img_name.lower().endswith(('.jpg', '.jpeg', '.png')):
-            continue
-        
         img_path = os.path.join(sample_path, img_name)
         frame = cv2.imread(img_path)
         
@@ -137,25 +342,45 @@ def get_keypoints(model, sample_path: str) -> np.ndarray:
             continue
         
         results = mediapipe_detection(frame, model)
-        kp_frame = extract_keypoints(results)
-        kp_seq.append(kp_frame)
+        extract_keypoints(results, out=kp_seq[n_frames])
+        n_frames += 1
     
-    return np.array(kp_seq)
+    return kp_seq[:n_frames]
 
 
 def insert_keypoints_sequence(df: pd.DataFrame, n_sample: int, kp_seq: np.ndarray) -> pd.DataFrame:
-    for frame, keypoints in enumerate(kp_seq):
-        data = {'sample': n_sample, 'frame': frame + 1, 'keypoints': [keypoints]}
-        df_keypoints = pd.DataFrame(data)
-        df = pd.concat([df, df_keypoints], ignore_index=True)
+    """
+    Agrega una muestra al DataFrame del formato `.h5` legado
     
-    return df
+    Construye un único DataFrame por secuencia (un `pd.concat` por muestra, no
+    por frame). Para generar datasets nuevos use `KeypointsDatasetWriter`.
+    """
+    df_keypoints = pd.DataFrame({
+        'sample': n_sample,
+        'frame': np.arange(1, len(kp_seq) + 1),
+        'keypoints': list(kp_seq),
+    })
+    return pd.concat([df, df_keypoints], ignore_index=True)
 
 
 def get_sequences_and_labels(words_id: List[str]) -> Tuple[List, List]:
+    """
+    Carga las secuencias de keypoints y sus etiquetas
+    
+    Usa el dataset columnar (`keypoints_dataset`) cuando existe para la palabra,
+    entregando vistas sobre memmaps; si no, lee el `.h5` legado.
+    """
     sequences, labels = [], []
     
     for word_index, word_id in enumerate(words_id):
+        dataset_path = config.get_dataset_path(word_id)
+        if dataset_exists(dataset_path):
+            dataset = KeypointsDataset(dataset_path)
+            sequences.extend(dataset)
+            labels.extend([word_index] * len(dataset))
+            logger.debug(f"Cargadas muestras de '{word_id}' (memmap): {len(dataset)}")
+            continue
+        
         hdf_path = config.get_keypoints_path(word_id)
         
         if not hdf_path.exists():
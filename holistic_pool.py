@@ -0,0 +1,365 @@
+"""
+holistic_pool.py - Pool de instancias MediaPipe Holistic por sesión
+===================================================================
+
+Una sola instancia de Holistic compartida serializa a todos los usuarios y
+mezcla su estado de tracking (Holistic usa el frame anterior para seguir
+pose, rostro y manos). El pool mantiene hasta `max_size` instancias (por
+defecto una por núcleo) y las presta por frame:
+
+    with pool.checkout(session_id) as holistic:
+        results = mediapipe_detection(frame, holistic)
+
+- Afinidad: una sesión recibe siempre la misma instancia mientras la tenga
+  asignada, por lo que el tracking sigue siendo válido entre sus frames.
+- Reasignación: si una instancia pasa a otra sesión (o a una petición suelta,
+  session_id=None) se reinicia con `reset()` antes de usarla, sin arrastrar el
+  tracking del usuario anterior. Si no quedan instancias libres ni cupo para
+  crear otra, se toma la asignada a la sesión inactiva hace más tiempo.
+- Desalojo: las instancias sin uso por más de `idle_timeout_s` se cierran,
+  conservando `min_size` instancias calientes.
+
+Métricas: tamaño, instancias ocupadas, sesiones con afinidad, utilización,
+tiempo de espera del checkout (p50/p95/p99/max) y contadores de creación,
+reasignación y desalojo.
+
+Uso:
+    from holistic_pool import HolisticPool
+    
+    pool = HolisticPool()
+    with pool.checkout(request.sid) as holistic:
+        results = mediapipe_detection(frame, holistic)
+    pool.release_session(request.sid)            # al desconectar
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, List, Optional
+
+from config_manager import config
+from latency_metrics import percentiles
+
+logger = logging.getLogger(__name__)
+
+
+def default_holistic_factory():
+    """Holistic con los umbrales de config.mediapipe"""
+    import mediapipe as mp
+    return mp.solutions.holistic.Holistic(
+        min_detection_confidence=config.mediapipe.min_detection_confidence,
+        min_tracking_confidence=config.mediapipe.min_tracking_confidence,
+    )
+
+
+class _Slot:
+    """Instancia del pool y su estado de préstamo"""
+    
+    __slots__ = ('instance', 'owner', 'busy', 'reset_pending', 'last_used')
+    
+    def __init__(self, instance, now: float):
+        self.instance = instance
+        self.owner = None           # sesión cuyo tracking contiene la instancia
+        self.busy = False
+        self.reset_pending = False  # sesión liberada mientras estaba prestada
+        self.last_used = now
+
+
+class HolisticPool:
+    """
+    Pool acotado de instancias Holistic con afinidad por sesión
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], Any] = None,
+        max_size: int = None,
+        min_size: int = None,
+        idle_timeout_s: float = None,
+        latency_window: int = 1000,
+    ):
+        """
+        Args:
+            factory: Crea una instancia nueva (default: Holistic con config.mediapipe)
+            max_size: Máximo de instancias (default: config.mediapipe.pool_size, 0 = núcleos de CPU)
+            min_size: Instancias que no se desalojan (default: config.mediapipe.pool_min_size)
+            idle_timeout_s: Segundos sin uso antes de cerrar una instancia
+            latency_window: Checkouts recientes usados para las esperas
+        """
+        settings = config.mediapipe
+        self.factory = factory or default_holistic_factory
+        self.max_size = max_size or settings.get('pool_size', 0) or os.cpu_count() or 1
+        self.min_size = settings.get('pool_min_size', 1) if min_size is None else min_size
+        self.idle_timeout_s = settings.get('pool_idle_timeout_s', 300) if idle_timeout_s is None else idle_timeout_s
+        
+        self._cond = threading.Condition()
+        self._slots: List[_Slot] = []
+        self._affinity = {}         # session_id -> _Slot
+        self._creating = 0
+        
+        self._waits = deque(maxlen=latency_window)
+        self._checkouts = 0
+        self._created = 0
+        self._reassigned = 0
+        self._evicted = 0
+        self._timeouts = 0
+        # Utilización = tiempo ocupado / (instancias x tiempo), acumulado desde el inicio
+        self._busy_seconds = 0.0
+        self._size_seconds = 0.0
+        self._size_changed_at = time.perf_counter()
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    # ==================== PRÉSTAMO ====================
+    
+    @contextmanager
+    def checkout(self, session_id: Optional[Hashable] = None, timeout: float = None):
+        """
+        Presta una instancia durante el bloque `with`
+        
+        Args:
+            session_id: Sesión dueña del flujo de video (None = imagen suelta, sin afinidad)
+            timeout: Espera máxima en segundos (None = sin límite)
+        
+        Raises:
+            TimeoutError: Si no se liberó ninguna instancia a tiempo
+        """
+        slot = self._acquire(session_id, timeout)
+        started = time.perf_counter()
+        try:
+            yield slot.instance
+        finally:
+            self._release(slot, started)
+    
+    def _acquire(self, session_id, timeout) -> _Slot:
+        requested = time.perf_counter()
+        deadline = None if timeout is None else requested + timeout
+        
+        with self._cond:
+            while True:
+                slot = self._affinity.get(session_id) if session_id is not None else None
+                if slot is not None:
+                    if not slot.busy:
+                        break
+                elif self._has_capacity():
+                    self._creating += 1
+                    break
+                else:
+                    slot = self._idle_slot()
+                    if slot is not None:
+                        break
+                
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise TimeoutError(f"Sin instancias Holistic libres tras {timeout:.2f}s")
+                self._cond.wait(remaining)
+            
+            if slot is not None:
+                stale = self._assign(slot, session_id, requested)
+        
+        if slot is not None:
+            # Reiniciar fuera del lock, como la creación: la instancia ya está
+            # marcada ocupada y no bloquea los checkouts de otras sesiones
+            if stale:
+                self._reset_checked_out(slot)
+            return slot
+        
+        # Crear fuera del lock: cargar el grafo toma cientos de ms
+        try:
+            instance = self.factory()
+        except Exception:
+            with self._cond:
+                self._creating -= 1
+                self._cond.notify_all()
+            raise
+        
+        with self._cond:
+            self._creating -= 1
+            self._account_size()
+            slot = _Slot(instance, time.perf_counter())
+            self._slots.append(slot)
+            self._created += 1
+            logger.info(f"Instancia Holistic creada ({len(self._slots)}/{self.max_size})")
+            self._assign(slot, session_id, requested)
+            return slot
+    
+    def _has_capacity(self) -> bool:
+        """Hay cupo para crear una instancia y ninguna libre sin dueño que reutilizar"""
+        if any(not slot.busy and slot.owner is None for slot in self._slots):
+            return False
+        return len(self._slots) + self._creating < self.max_size
+    
+    def _idle_slot(self) -> Optional[_Slot]:
+        """Instancia libre: primero sin dueño, si no la de la sesión inactiva hace más tiempo"""
+        idle = [slot for slot in self._slots if not slot.busy]
+        if not idle:
+            return None
+        return min(idle, key=lambda slot: (slot.owner is not None, slot.last_used))
+    
+    def _assign(self, slot: _Slot, session_id, requested: float) -> bool:
+        """Marca la instancia ocupada para `session_id`; retorna si hay que reiniciarla (fuera del lock)"""
+        stale = slot.owner is not None and (slot.owner != session_id or session_id is None)
+        if stale:
+            self._affinity.pop(slot.owner, None)
+            self._reassigned += 1
+        if session_id is not None:
+            self._affinity[session_id] = slot
+        slot.owner = session_id
+        slot.busy = True
+        self._checkouts += 1
+        self._waits.append((time.perf_counter() - requested) * 1000)
+        return stale
+    
+    def _reset_checked_out(self, slot: _Slot):
+        """Reinicia una instancia ya prestada; si falla la devuelve sin dueño"""
+        try:
+            self._reset(slot)
+        except Exception:
+            with self._cond:
+                if slot.owner is not None and self._affinity.get(slot.owner) is slot:
+                    del self._affinity[slot.owner]
+                slot.owner = None
+            self._release(slot, time.perf_counter())
+            raise
+    
+    def _release(self, slot: _Slot, started: float):
+        with self._cond:
+            reset = slot.reset_pending
+            slot.reset_pending = False
+        failed = False
+        if reset:
+            # release_session llegó con la instancia prestada: reiniciar antes de
+            # devolverla, fuera del lock (sigue marcada ocupada)
+            try:
+                self._reset(slot)
+            except Exception as e:
+                logger.warning(f"Error reiniciando instancia Holistic, se descarta: {e}")
+                failed = True
+        
+        with self._cond:
+            now = time.perf_counter()
+            if failed:
+                # Con el tracking sin reiniciar no puede pasar a otra sesión
+                self._account_size()
+                self._slots.remove(slot)
+            slot.busy = False
+            slot.last_used = now
+            self._busy_seconds += now - started
+            expired = self._evict_idle(now)
+            self._cond.notify_all()
+        if failed:
+            expired.append(slot)
+        # Cerrar fuera del lock: destruir el grafo toma decenas a cientos de ms
+        self._close_all(expired)
+    
+    @staticmethod
+    def _reset(slot: _Slot):
+        # SolutionBase.reset reinicia el grafo: descarta el tracking del flujo anterior
+        reset = getattr(slot.instance, 'reset', None)
+        if reset is not None:
+            reset()
+    
+    # ==================== SESIONES Y DESALOJO ====================
+    
+    def release_session(self, session_id: Hashable):
+        """Libera la afinidad de una sesión (al desconectar o reiniciar)"""
+        with self._cond:
+            slot = self._affinity.pop(session_id, None)
+            if slot is None:
+                return
+            if slot.busy:
+                # El frame en curso la devuelve: _release la reinicia al liberarla
+                slot.owner = None
+                slot.reset_pending = True
+                return
+            # Ocupada mientras se reinicia fuera del lock
+            slot.owner = None
+            slot.busy = True
+        try:
+            self._reset(slot)
+        finally:
+            with self._cond:
+                slot.busy = False
+                self._cond.notify_all()
+    
+    def evict_idle(self) -> int:
+        """Cierra las instancias sin uso por más de `idle_timeout_s` (retorna cuántas)"""
+        with self._cond:
+            expired = self._evict_idle(time.perf_counter())
+        self._close_all(expired)
+        return len(expired)
+    
+    def _evict_idle(self, now: float) -> List[_Slot]:
+        """Saca del pool las instancias vencidas; el llamador las cierra fuera del lock"""
+        expired = [slot for slot in self._slots
+                   if not slot.busy and now - slot.last_used > self.idle_timeout_s]
+        expired = expired[:max(0, len(self._slots) - self.min_size)]
+        for slot in expired:
+            self._account_size()
+            self._slots.remove(slot)
+            if slot.owner is not None:
+                self._affinity.pop(slot.owner, None)
+            self._evicted += 1
+        if expired:
+            logger.info(f"{len(expired)} instancias Holistic inactivas cerradas ({len(self._slots)} en el pool)")
+        return expired
+    
+    @staticmethod
+    def _close_all(slots: List[_Slot]):
+        for slot in slots:
+            close = getattr(slot.instance, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error cerrando instancia Holistic: {e}")
+    
+    def close(self):
+        """Cierra todas las instancias libres"""
+        with self._cond:
+            free = [slot for slot in self._slots if not slot.busy]
+            for slot in free:
+                self._account_size()
+                self._slots.remove(slot)
+            self._affinity = {sid: slot for sid, slot in self._affinity.items() if slot in self._slots}
+        self._close_all(free)
+    
+    def _account_size(self):
+        """Acumula instancias x tiempo hasta ahora (llamar antes de cambiar el tamaño)"""
+        now = time.perf_counter()
+        self._size_seconds += len(self._slots) * (now - self._size_changed_at)
+        self._size_changed_at = now
+    
+    # ==================== MÉTRICAS ====================
+    
+    def metrics(self) -> dict:
+        """
+        Métricas del pool
+        
+        Returns:
+            dict: size, max_size, busy, sessions, utilization (fracción del tiempo
+                  de las instancias en uso), checkouts, created, reassigned,
+                  evicted, timeouts y wait_ms (p50/p95/p99/max)
+        """
+        with self._cond:
+            now = time.perf_counter()
+            size_seconds = self._size_seconds + len(self._slots) * (now - self._size_changed_at)
+            busy_now = [slot for slot in self._slots if slot.busy]
+            return {
+                'size': len(self._slots),
+                'max_size': self.max_size,
+                'busy': len(busy_now),
+                'sessions': len(self._affinity),
+                'utilization': self._busy_seconds / size_seconds if size_seconds > 0 else 0.0,
+                'checkouts': self._checkouts,
+                'created': self._created,
+                'reassigned': self._reassigned,
+                'evicted': self._evicted,
+                'timeouts': self._timeouts,
+                'wait_ms': percentiles(list(self._waits)),
+            }
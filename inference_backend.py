@@ -0,0 +1,61 @@
+"""
+inference_backend.py - Selección del backend de inferencia
+==========================================================
+
+Carga el modelo de inferencia indicado en `inference.backend` de config.yaml:
+
+- keras:  `InferenceModel` (tf.function sobre el `.keras`, requiere TensorFlow)
+- tflite: `TFLiteModel` (modelo exportado con `model_export.py tflite`)
+- onnx:   `OnnxModel` (ONNX Runtime en CPU, exportado con `model_export.py onnx`)
+
+Los backends se importan solo al cargarse, de modo que el backend TFLite no
+arrastra TensorFlow cuando hay un intérprete liviano instalado, y el backend
+ONNX no lo necesita en absoluto. Todos exponen la misma interfaz:
+input_shape, n_classes, predict_one, predict_batch.
+
+Uso:
+    from inference_backend import load_inference_model
+    
+    model = load_inference_model()                  # backend desde config
+    model = load_inference_model('tflite', path)
+"""
+
+from pathlib import Path
+from typing import Union
+
+from config_manager import config
+
+BACKENDS = ('keras', 'tflite', 'onnx')
+
+
+def load_inference_model(backend: str = None, path: Union[str, Path] = None):
+    """
+    Carga el modelo de inferencia
+    
+    Args:
+        backend: keras, tflite u onnx (default: config.inference.backend)
+        path: Archivo del modelo (default: config.get_inference_model_path(backend))
+    
+    Returns:
+        InferenceModel, TFLiteModel u OnnxModel
+    """
+    backend = backend or config.inference.backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de inferencia desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    if path is None:
+        path = config.get_inference_model_path(backend)
+    
+    if backend == 'tflite':
+        from tflite_model import TFLiteModel
+        return TFLiteModel(path, num_threads=config.inference.get('num_threads'))
+    
+    if backend == 'onnx':
+        from onnx_model import OnnxModel
+        return OnnxModel(
+            path,
+            intra_op_threads=config.inference.get('intra_op_threads', 0),
+            inter_op_threads=config.inference.get('inter_op_threads', 0)
+        )
+    
+    from inference_model import InferenceModel
+    return InferenceModel(path)
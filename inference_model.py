@@ -0,0 +1,106 @@
+"""
+inference_model.py - Modelo compilado para inferencia
+=====================================================
+
+Envuelve el modelo `.keras` en un `tf.function` con firma fija
+`(None, frames, 1662) float32`, evitando la maquinaria de `model.predict`
+(data adapters, callbacks, progbar) en cada llamada. Se traza una sola vez
+para cualquier tamaño de batch y se calienta al cargar.
+
+Uso:
+    from inference_model import InferenceModel
+    
+    model = InferenceModel()                     # carga config.get_model_path()
+    probabilities = model.predict_one(kp_seq)    # (n_clases,)
+    probabilities = model.predict_batch(batch)   # (batch, n_clases)
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import tensorflow as tf
+
+from config_manager import config
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceModel:
+    """
+    Modelo de clasificación listo para inferencia de baja latencia
+    """
+    
+    def __init__(self, model: Union[str, Path, tf.keras.Model] = None, warmup: bool = True):
+        """
+        Args:
+            model: Ruta al `.keras` o modelo ya cargado (default: config.get_model_path())
+            warmup: Ejecuta una predicción inicial para trazar el grafo al cargar
+        """
+        if model is None:
+            model = config.get_model_path()
+        if isinstance(model, (str, Path)):
+            self.path = Path(model)
+            model = tf.keras.models.load_model(self.path, compile=False)
+        else:
+            self.path = None
+        
+        self.model = model
+        _, frames, keypoints_length = model.input_shape
+        self.input_shape = (frames or config.model.frames, keypoints_length or config.model.keypoints_length)
+        
+        self._forward = tf.function(
+            self._call,
+            input_signature=[tf.TensorSpec(shape=(None, *self.input_shape), dtype=tf.float32)],
+        )
+        
+        if warmup:
+            self.warmup()
+    
+    def _call(self, batch):
+        return self.model(batch, training=False)
+    
+    @property
+    def n_classes(self) -> int:
+        return self.model.output_shape[-1]
+    
+    def warmup(self) -> float:
+        """
+        Traza el grafo con un batch de ceros
+        
+        Returns:
+            float: Segundos que tomó la primera llamada
+        """
+        start = time.perf_counter()
+        self.predict_batch(np.zeros((1, *self.input_shape), dtype=np.float32))
+        elapsed = time.perf_counter() - start
+        logger.info(f"Modelo de inferencia listo: input {self.input_shape}, warmup {elapsed * 1000:.0f}ms")
+        return elapsed
+    
+    def predict_batch(self, batch) -> np.ndarray:
+        """
+        Predice un batch de secuencias normalizadas
+        
+        Args:
+            batch: (batch, frames, 1662)
+        
+        Returns:
+            np.ndarray: Probabilidades (batch, n_clases) float32
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.ndim != 3 or batch.shape[1:] != self.input_shape:
+            raise ValueError(f"Se esperaba un batch (n, {self.input_shape[0]}, {self.input_shape[1]}), recibido {batch.shape}")
+        return self._forward(batch).numpy()
+    
+    def predict_one(self, sequence) -> np.ndarray:
+        """
+        Predice una secuencia normalizada (frames, 1662)
+        
+        Returns:
+            np.ndarray: Probabilidades (n_clases,) float32
+        """
+        return self.predict_batch(np.expand_dims(sequence, axis=0))[0]
+    
+    __call__ = predict_batch
@@ -0,0 +1,237 @@
+"""
+inference_server.py - Servidor de inferencia con micro-batching
+================================================================
+
+Agrupa las secuencias que llegan desde todas las sesiones (sockets) en un único
+batch para el modelo:
+
+    submit(secuencia) -> Future
+        cola -> hilo de inferencia: toma la primera petición, espera hasta
+        `max_wait_ms` o hasta juntar `max_batch_size`, ejecuta una sola pasada
+        del modelo y resuelve el Future de cada petición con su fila.
+
+Expone métricas de profundidad de cola, histograma de tamaños de batch y
+latencias (espera en cola y total).
+
+Uso:
+    from inference_server import BatchInferenceServer
+    
+    server = BatchInferenceServer(lambda batch: model.predict(batch, verbose=0))
+    server.start()
+    probabilities = server.predict(kp_normalized)   # (n_clases,)
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Callable, List, NamedTuple
+
+import numpy as np
+
+from latency_metrics import percentiles
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Request(NamedTuple):
+    sequence: np.ndarray
+    future: Future
+    enqueued_at: float
+
+
+class BatchInferenceServer:
+    """
+    Cola de inferencia compartida que ejecuta el modelo por micro-batches
+    """
+    
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_queue_size: int = 0,
+        latency_window: int = 1000,
+    ):
+        """
+        Args:
+            predict_fn: Recibe (batch, frames, 1662) float32 y retorna (batch, n_clases)
+            max_batch_size: Máximo de secuencias por pasada del modelo
+            max_wait_ms: Espera máxima para completar un batch desde la primera petición
+            max_queue_size: Límite de peticiones en cola (0 = sin límite)
+            latency_window: Cantidad de peticiones recientes usadas para las latencias
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size debe ser >= 1")
+        
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue(max_queue_size)
+        self._thread = None
+        self._stopping = False
+        
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._latencies = deque(maxlen=latency_window)
+        self._queue_waits = deque(maxlen=latency_window)
+        self._n_requests = 0
+        self._n_errors = 0
+    
+    # ==================== CICLO DE VIDA ====================
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Inicia el hilo de inferencia"""
+        if self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='batch-inference', daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Servidor de inferencia iniciado (max_batch_size={self.max_batch_size}, "
+            f"max_wait={self.max_wait * 1000:.1f}ms)"
+        )
+    
+    def stop(self, timeout: float = None):
+        """Detiene el hilo tras procesar las peticiones ya encoladas"""
+        with self._lock:
+            if not self.running or self._stopping:
+                return
+            # Desde aquí submit rechaza peticiones: ninguna queda detrás de _STOP
+            self._stopping = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._fail_pending()
+        self._thread = None
+    
+    def _fail_pending(self):
+        """Resuelve con error las peticiones que quedaron en la cola sin procesar"""
+        pending = 0
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not _STOP and request.future.set_running_or_notify_cancel():
+                request.future.set_exception(RuntimeError("El servidor de inferencia se detuvo"))
+                pending += 1
+        if pending:
+            logger.warning(f"{pending} peticiones descartadas al detener el servidor de inferencia")
+    
+    # ==================== PETICIONES ====================
+    
+    def submit(self, sequence) -> Future:
+        """
+        Encola una secuencia normalizada (frames, 1662)
+        
+        Returns:
+            Future: Se resuelve con las probabilidades (n_clases,) de la secuencia
+        
+        Raises:
+            RuntimeError: Si el servidor no está iniciado o se está deteniendo
+            queue.Full: Si la cola alcanzó `max_queue_size`
+        """
+        future = Future()
+        sequence = np.asarray(sequence, dtype=np.float32)
+        with self._lock:
+            if not self.running or self._stopping:
+                raise RuntimeError("El servidor de inferencia no está iniciado")
+            self._queue.put_nowait(_Request(sequence, future, time.perf_counter()))
+        return future
+    
+    def predict(self, sequence, timeout: float = None) -> np.ndarray:
+        """Versión bloqueante de `submit`"""
+        return self.submit(sequence).result(timeout)
+    
+    # ==================== HILO DE INFERENCIA ====================
+    
+    def _collect(self):
+        """Toma la primera petición y completa el batch hasta el tamaño o la espera máxima"""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return batch, True
+            batch.append(request)
+        return batch, False
+    
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if batch:
+                self._run_batch(batch)
+        logger.info("Servidor de inferencia detenido")
+    
+    def _run_batch(self, batch: List[_Request]):
+        started = time.perf_counter()
+        try:
+            inputs = np.stack([request.sequence for request in batch])
+            outputs = np.asarray(self.predict_fn(inputs))
+        except Exception as e:
+            logger.error(f"Error en batch de inferencia ({len(batch)} secuencias): {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            with self._lock:
+                self._n_errors += len(batch)
+            return
+        
+        finished = time.perf_counter()
+        for request, output in zip(batch, outputs):
+            request.future.set_result(output)
+        
+        with self._lock:
+            self._batch_sizes[len(batch)] += 1
+            self._n_requests += len(batch)
+            for request in batch:
+                self._queue_waits.append((started - request.enqueued_at) * 1000)
+                self._latencies.append((finished - request.enqueued_at) * 1000)
+    
+    # ==================== MÉTRICAS ====================
+    
+    def metrics(self) -> dict:
+        """
+        Métricas del servidor
+        
+        Returns:
+            dict: queue_depth, requests, batches, errors, mean_batch_size,
+                  batch_size_histogram {tamaño: batches}, latency_ms y
+                  queue_wait_ms (p50/p95/p99/max de las últimas peticiones)
+        """
+        with self._lock:
+            histogram = dict(sorted(self._batch_sizes.items()))
+            latencies = list(self._latencies)
+            queue_waits = list(self._queue_waits)
+            n_requests, n_errors = self._n_requests, self._n_errors
+        
+        n_batches = sum(histogram.values())
+        return {
+            'running': self.running,
+            'queue_depth': self._queue.qsize(),
+            'requests': n_requests,
+            'batches': n_batches,
+            'errors': n_errors,
+            'mean_batch_size': n_requests / n_batches if n_batches else 0.0,
+            'batch_size_histogram': histogram,
+            'latency_ms': percentiles(latencies),
+            'queue_wait_ms': percentiles(queue_waits),
+        }
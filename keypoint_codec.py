@@ -0,0 +1,140 @@
+"""
+keypoint_codec.py - Formato binario de keypoints extraídos en el cliente
+========================================================================
+
+En el modo de landmarks en el cliente el navegador corre MediaPipe Holistic
+(JS/WASM) y envía por Socket.IO (evento `process_keypoints`) solo el vector
+de keypoints de cada frame; el servidor se salta la decodificación de imagen
+y MediaPipe, y solo segmenta y clasifica.
+
+Mensaje (little-endian), cabecera de 8 bytes + valores:
+
+    offset  tipo   campo
+    0       2s     magic  b'KP'
+    2       u8     versión del formato (1)
+    3       u8     dtype de los valores: 1 = float16, 2 = float32
+    4       u8     layout: 0 = completo (1662), 1 = pose + manos (258)
+    5       u8     reservado (0)
+    6       u16    cantidad de valores (debe coincidir con el layout)
+    8       ...    valores
+
+El layout completo es exactamente el de `helpers.extract_keypoints`:
+pose (33 x x, y, z, visibility), rostro (468 x x, y, z), mano izquierda y
+mano derecha (21 x x, y, z), con ceros en los grupos no detectados. El layout
+pose + manos omite el rostro y se reconstruye con el rostro en ceros, como
+si no se hubiese detectado: el modelo actual fue entrenado con rostro, por
+lo que ese layout solo conviene con un modelo reentrenado sin él.
+
+Tamaño por frame: 6656 B (completo float32), 3332 B (completo float16),
+524 B (pose + manos float16), frente a ~35 KB de un JPEG 640x480.
+
+Uso:
+    from keypoint_codec import decode_keypoints, encode_keypoints
+    
+    message = encode_keypoints(extract_keypoints(results), dtype='float16')
+    keypoints = decode_keypoints(message)        # (1662,) float32
+"""
+
+import struct
+
+import numpy as np
+
+from helpers import (
+    FACE_SLICE, KEYPOINTS_LENGTH, LEFT_HAND_SLICE, POSE_SLICE, RIGHT_HAND_SLICE,
+)
+
+MAGIC = b'KP'
+VERSION = 1
+
+HEADER = struct.Struct('<2sBBBBH')
+
+DTYPES = {1: np.dtype('<f2'), 2: np.dtype('<f4')}
+DTYPE_CODES = {'float16': 1, 'float32': 2}
+
+LAYOUT_FULL = 0
+LAYOUT_POSE_HANDS = 1
+# Tramos del vector completo que viaja en cada layout, en orden
+LAYOUTS = {
+    LAYOUT_FULL: (slice(0, KEYPOINTS_LENGTH),),
+    LAYOUT_POSE_HANDS: (POSE_SLICE, slice(LEFT_HAND_SLICE.start, RIGHT_HAND_SLICE.stop)),
+}
+LAYOUT_NAMES = {'full': LAYOUT_FULL, 'pose_hands': LAYOUT_POSE_HANDS}
+
+assert FACE_SLICE.stop == LEFT_HAND_SLICE.start, "El layout pose + manos asume el rostro antes de las manos"
+
+
+def layout_length(layout: int) -> int:
+    """Cantidad de valores que viajan en un layout"""
+    return sum(part.stop - part.start for part in LAYOUTS[layout])
+
+
+def encode_keypoints(keypoints: np.ndarray, dtype: str = 'float16', layout: str = 'full') -> bytes:
+    """
+    Codifica un vector de keypoints (1662,) en el formato binario
+    
+    Args:
+        keypoints: Vector con el layout de extract_keypoints
+        dtype: 'float16' o 'float32'
+        layout: 'full' o 'pose_hands'
+    
+    Returns:
+        bytes: Mensaje listo para enviar
+    """
+    keypoints = np.asarray(keypoints)
+    if keypoints.shape != (KEYPOINTS_LENGTH,):
+        raise ValueError(f"Se esperaba un vector ({KEYPOINTS_LENGTH},), se recibió {keypoints.shape}")
+    dtype_code, layout_code = DTYPE_CODES[dtype], LAYOUT_NAMES[layout]
+    
+    values = np.concatenate([keypoints[part] for part in LAYOUTS[layout_code]]).astype(DTYPES[dtype_code])
+    return HEADER.pack(MAGIC, VERSION, dtype_code, layout_code, 0, len(values)) + values.tobytes()
+
+
+def decode_keypoints(message, out: np.ndarray = None) -> np.ndarray:
+    """
+    Valida y decodifica un mensaje al vector completo de extract_keypoints
+    
+    Args:
+        message: bytes / bytearray / memoryview recibidos
+        out: Buffer (1662,) float32 opcional donde escribir el resultado
+    
+    Returns:
+        np.ndarray: Keypoints (1662,) float32
+    
+    Raises:
+        ValueError: Si el mensaje no cumple el formato
+    """
+    if not isinstance(message, (bytes, bytearray, memoryview)):
+        raise ValueError(f"Mensaje de keypoints no soportado: {type(message).__name__}")
+    message = memoryview(message).cast('B')
+    if len(message) < HEADER.size:
+        raise ValueError(f"Mensaje de keypoints truncado ({len(message)} bytes)")
+    
+    magic, version, dtype_code, layout_code, _, count = HEADER.unpack_from(message)
+    if magic != MAGIC:
+        raise ValueError("Mensaje de keypoints sin la firma KP")
+    if version != VERSION:
+        raise ValueError(f"Versión de keypoints no soportada: {version} (se espera {VERSION})")
+    if dtype_code not in DTYPES:
+        raise ValueError(f"dtype de keypoints desconocido: {dtype_code}")
+    if layout_code not in LAYOUTS:
+        raise ValueError(f"Layout de keypoints desconocido: {layout_code}")
+    if count != layout_length(layout_code):
+        raise ValueError(f"El layout {layout_code} requiere {layout_length(layout_code)} valores, se recibieron {count}")
+    
+    dtype = DTYPES[dtype_code]
+    if len(message) != HEADER.size + count * dtype.itemsize:
+        raise ValueError(f"Largo del mensaje ({len(message)} bytes) no coincide con la cabecera")
+    values = np.frombuffer(message, dtype=dtype, count=count, offset=HEADER.size)
+    if not np.isfinite(values).all():
+        raise ValueError("Los keypoints contienen NaN o infinitos")
+    
+    if out is None:
+        out = np.zeros(KEYPOINTS_LENGTH, dtype=np.float32)
+    else:
+        out[:] = 0
+    i = 0
+    for part in LAYOUTS[layout_code]:
+        size = part.stop - part.start
+        out[part] = values[i:i + size]
+        i += size
+    return out
@@ -0,0 +1,274 @@
+"""
+keypoints_augmentation.py - Aumento de datos en el espacio de keypoints
+=======================================================================
+
+Transformaciones vectorizadas sobre tensores de keypoints `(frames, 1662)` o
+batches `(batch, frames, 1662)`, sin volver a pasar por MediaPipe:
+
+- mirror: espejo horizontal (x -> 1 - x) intercambiando mano izquierda/derecha
+  y los pares izquierda/derecha de la pose; con etiquetas, intercambia también
+  las clases ligadas a una mano (`augmentation.mirror_pairs`, p. ej.
+  hola-der <-> hola-izq)
+- affine: rotación, escala y traslación 2D de (x, y) alrededor del centro
+- time_warp: cambio de velocidad de la seña (remuestreo temporal lineal)
+- frame_dropout: reemplaza frames al azar por el último frame conservado
+- jitter: ruido gaussiano sobre las coordenadas
+
+Los landmarks ausentes (ceros: mano no detectada, frames de padding) se
+mantienen en cero. La cara se espeja sin reordenar sus 468 puntos (el proyecto
+no incluye el mapa de simetría de FaceMesh).
+
+Uso en el pipeline de entrenamiento (ver `keypoints_pipeline.make_dataset`):
+    dataset = dataset.batch(8).map(augment_batch)
+"""
+
+import math
+import logging
+
+import numpy as np
+import tensorflow as tf
+
+from config_manager import config
+from helpers import (
+    POSE_SLICE, FACE_SLICE, LEFT_HAND_SLICE, RIGHT_HAND_SLICE, KEYPOINTS_LENGTH,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pose de MediaPipe: índice del landmark simétrico (nariz 0 se mantiene)
+POSE_MIRROR = [0, 4, 5, 6, 1, 2, 3, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15,
+               18, 17, 20, 19, 22, 21, 24, 23, 26, 25, 28, 27, 30, 29, 32, 31]
+
+
+def _build_layout():
+    """Índices del vector de 1662 valores usados por las transformaciones"""
+    x_index = np.concatenate([
+        np.arange(POSE_SLICE.start, POSE_SLICE.stop, 4),
+        np.arange(FACE_SLICE.start, FACE_SLICE.stop, 3),
+        np.arange(LEFT_HAND_SLICE.start, LEFT_HAND_SLICE.stop, 3),
+        np.arange(RIGHT_HAND_SLICE.start, RIGHT_HAND_SLICE.stop, 3),
+    ])
+    
+    is_x = np.zeros(KEYPOINTS_LENGTH, dtype=bool)
+    is_x[x_index] = True
+    is_y = np.roll(is_x, 1)
+    is_coord = is_x | is_y | np.roll(is_x, 2)  # todo menos visibility
+    
+    # Para cada x el índice de su y, y viceversa
+    partner = np.arange(KEYPOINTS_LENGTH)
+    partner[x_index] = x_index + 1
+    partner[x_index + 1] = x_index
+    
+    pose = (np.array(POSE_MIRROR)[:, None] * 4 + np.arange(4)).ravel()
+    mirror = np.concatenate([
+        POSE_SLICE.start + pose,
+        np.arange(FACE_SLICE.start, FACE_SLICE.stop),
+        np.arange(RIGHT_HAND_SLICE.start, RIGHT_HAND_SLICE.stop),
+        np.arange(LEFT_HAND_SLICE.start, LEFT_HAND_SLICE.stop),
+    ])
+    return is_x, is_y, is_coord, partner, mirror
+
+
+IS_X, IS_Y, IS_COORD, PARTNER_INDEX, MIRROR_INDEX = _build_layout()
+
+
+def _as_batch(keypoints):
+    """Convierte (frames, 1662) en (1, frames, 1662); retorna también si hay que deshacerlo"""
+    keypoints = tf.convert_to_tensor(keypoints, dtype=tf.float32)
+    single = keypoints.shape.rank == 2
+    return (keypoints[tf.newaxis] if single else keypoints), single
+
+
+def _restore(batch, single):
+    return batch[0] if single else batch
+
+
+def _present_xy(batch):
+    """Máscara de landmarks detectados, en las posiciones x/y"""
+    partner = tf.gather(batch, PARTNER_INDEX, axis=-1)
+    return (IS_X | IS_Y) & ((batch != 0) | (partner != 0)), partner
+
+
+def _per_sample(values):
+    """Da forma (batch, 1, 1) a un parámetro aleatorio por muestra"""
+    return tf.reshape(values, (-1, 1, 1))
+
+
+def mirror_class_map(word_ids=None, pairs=None) -> np.ndarray:
+    """
+    Índice de la clase espejada de cada clase (identidad salvo los pares)
+    
+    Args:
+        word_ids: Vocabulario en orden de índice (default: config.get_word_ids())
+        pairs: Pares [izquierda, derecha] de clases ligadas a una mano
+               (default: config.augmentation.mirror_pairs)
+    
+    Raises:
+        ValueError: Si un par nombra una palabra que no está en el vocabulario
+    """
+    word_ids = config.get_word_ids() if word_ids is None else list(word_ids)
+    if pairs is None:
+        augmentation = getattr(config, 'augmentation', None)
+        pairs = augmentation.get('mirror_pairs', []) if augmentation is not None else []
+    
+    class_map = np.arange(len(word_ids), dtype=np.int32)
+    for pair in pairs:
+        unknown = [word_id for word_id in pair if word_id not in word_ids]
+        if len(pair) != 2 or unknown:
+            raise ValueError(f"Par de espejo inválido: {pair}")
+        a, b = (word_ids.index(word_id) for word_id in pair)
+        class_map[a], class_map[b] = b, a
+    return class_map
+
+
+def mirror(keypoints, prob: float = 1.0, labels=None, class_map=None):
+    """
+    Espejo horizontal con intercambio de manos
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        prob: Probabilidad de espejar cada muestra
+        labels: Índices de clase (batch,) o escalar; las muestras espejadas
+                toman la clase espejada
+        class_map: Clase espejada de cada clase (default: mirror_class_map())
+    
+    Returns:
+        Los keypoints, o (keypoints, labels) si se entregaron etiquetas
+    """
+    batch, single = _as_batch(keypoints)
+    mirrored = tf.gather(batch, MIRROR_INDEX, axis=-1)
+    present, _ = _present_xy(mirrored)
+    mirrored = tf.where(IS_X & present, 1.0 - mirrored, mirrored)
+    
+    apply = tf.random.uniform((tf.shape(batch)[0],)) < prob
+    keypoints = _restore(tf.where(_per_sample(apply), mirrored, batch), single)
+    if labels is None:
+        return keypoints
+    
+    labels = tf.convert_to_tensor(labels)
+    class_map = mirror_class_map() if class_map is None else class_map
+    swapped = tf.gather(tf.constant(class_map, dtype=labels.dtype), labels)
+    return keypoints, tf.where(apply[0] if single else apply, swapped, labels)
+
+
+def affine(keypoints, max_rotation: float = 10.0, max_scale: float = 0.1, max_shift: float = 0.05):
+    """
+    Rotación (grados), escala y traslación 2D aleatorias por muestra, centradas en (0.5, 0.5)
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        max_rotation: Ángulo máximo en grados
+        max_scale: Variación máxima de escala (0.1 = ±10%)
+        max_shift: Traslación máxima en coordenadas normalizadas
+    """
+    batch, single = _as_batch(keypoints)
+    n = tf.shape(batch)[0]
+    
+    angle = _per_sample(tf.random.uniform((n,), -max_rotation, max_rotation) * (math.pi / 180))
+    scale = _per_sample(tf.random.uniform((n,), 1 - max_scale, 1 + max_scale))
+    shift_x = _per_sample(tf.random.uniform((n,), -max_shift, max_shift))
+    shift_y = _per_sample(tf.random.uniform((n,), -max_shift, max_shift))
+    cos, sin = tf.cos(angle) * scale, tf.sin(angle) * scale
+    
+    present, partner = _present_xy(batch)
+    x = tf.where(IS_X, batch, partner) - 0.5
+    y = tf.where(IS_X, partner, batch) - 0.5
+    new_x = cos * x - sin * y + 0.5 + shift_x
+    new_y = sin * x + cos * y + 0.5 + shift_y
+    
+    result = tf.where(IS_X, new_x, new_y)
+    return _restore(tf.where(present, result, batch), single)
+
+
+def time_warp(keypoints, max_speed: float = 0.2):
+    """
+    Cambia la velocidad de la seña remuestreando los frames alrededor del centro
+    
+    Interpola linealmente entre frames vecinos; si uno de los dos valores es
+    cero (landmark ausente o padding) usa el frame más cercano.
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        max_speed: Variación máxima de velocidad (0.2 = ±20%)
+    """
+    batch, single = _as_batch(keypoints)
+    n, frames = tf.shape(batch)[0], tf.shape(batch)[1]
+    last = tf.cast(frames - 1, tf.float32)
+    
+    speed = tf.random.uniform((n, 1), 1 - max_speed, 1 + max_speed)
+    center = last / 2
+    position = tf.clip_by_value(center + (tf.range(last + 1) - center) * speed, 0.0, last)
+    
+    lower = tf.cast(tf.floor(position), tf.int32)
+    upper = tf.minimum(lower + 1, frames - 1)
+    weight = (position - tf.floor(position))[..., tf.newaxis]
+    
+    a = tf.gather(batch, lower, axis=1, batch_dims=1)
+    b = tf.gather(batch, upper, axis=1, batch_dims=1)
+    nearest = tf.where(weight < 0.5, a, b)
+    lerp = a + (b - a) * weight
+    return _restore(tf.where((a != 0) & (b != 0), lerp, nearest), single)
+
+
+def frame_dropout(keypoints, rate: float = 0.1):
+    """
+    Descarta frames al azar repitiendo el último frame conservado (el primero se conserva siempre)
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        rate: Probabilidad de descartar cada frame
+    """
+    batch, single = _as_batch(keypoints)
+    n, frames = tf.shape(batch)[0], tf.shape(batch)[1]
+    
+    steps = tf.range(frames)
+    keep = (tf.random.uniform((n, frames)) >= rate) | (steps == 0)
+    # Índice del último frame conservado hasta cada paso: max_j<=i (j si keep[j])
+    candidates = tf.where(keep[:, tf.newaxis, :] & (steps[tf.newaxis, :] <= steps[:, tf.newaxis]), steps, 0)
+    source = tf.reduce_max(candidates, axis=-1)
+    return _restore(tf.gather(batch, source, axis=1, batch_dims=1), single)
+
+
+def jitter(keypoints, std: float = 0.005):
+    """
+    Ruido gaussiano sobre x, y, z de los landmarks detectados
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        std: Desviación estándar del ruido
+    """
+    batch, single = _as_batch(keypoints)
+    noise = tf.random.normal(tf.shape(batch), stddev=std)
+    return _restore(tf.where(IS_COORD & (batch != 0), batch + noise, batch), single)
+
+
+def augment_keypoints(keypoints, params=None, labels=None):
+    """
+    Aplica la cadena completa de aumentos con los parámetros de `config.augmentation`
+    
+    Args:
+        keypoints: (frames, 1662) o (batch, frames, 1662)
+        params: ConfigDict/dict con los parámetros (default: config.augmentation)
+        labels: Índices de clase; se corrigen en las muestras espejadas
+    
+    Returns:
+        Los keypoints, o (keypoints, labels) si se entregaron etiquetas
+    """
+    params = params or getattr(config, 'augmentation', None) or {}
+    get = params.get
+    
+    if labels is None:
+        keypoints = mirror(keypoints, get('mirror_prob', 0.5))
+    else:
+        keypoints, labels = mirror(keypoints, get('mirror_prob', 0.5), labels,
+                                   mirror_class_map(pairs=get('mirror_pairs')))
+    keypoints = affine(keypoints, get('max_rotation', 10.0), get('max_scale', 0.1), get('max_shift', 0.05))
+    keypoints = time_warp(keypoints, get('max_speed', 0.2))
+    keypoints = frame_dropout(keypoints, get('frame_dropout', 0.1))
+    keypoints = jitter(keypoints, get('jitter_std', 0.005))
+    return keypoints if labels is None else (keypoints, labels)
+
+
+def augment_batch(x, y):
+    """Versión para `tf.data.Dataset.map` sobre batches (keypoints, etiquetas)"""
+    return augment_keypoints(x, labels=y)
@@ -0,0 +1,347 @@
+"""
+keypoints_dataset.py - Dataset columnar de keypoints (memory-mapped)
+====================================================================
+
+Reemplaza los archivos HDF5 por palabra (`data/keypoints/<word>.h5`) por un
+formato columnar que se abre con `np.memmap` sin copiar ni des-serializar:
+
+    data/dataset/<word_id>/
+        frames.npy      float32 (total_frames, 1662) - todos los frames contiguos
+        offsets.npy     int64 (n_samples,) - primer frame de cada muestra
+        lengths.npy     int64 (n_samples,) - cantidad de frames de cada muestra
+        manifest.json   metadatos (versión, shapes, nombres y huellas de las muestras)
+
+La muestra `i` es la vista `frames[offsets[i]:offsets[i] + lengths[i]]`.
+
+Uso:
+    from keypoints_dataset import open_word_dataset
+
+    dataset = open_word_dataset("hola-der")
+    sample = dataset[0]          # vista (n_frames, 1662) sobre el memmap
+
+    # Conversión única desde los .h5 existentes
+    python keypoints_dataset.py --convert
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+from config_manager import config
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMAT = "lsch-keypoints"
+DATASET_VERSION = 1
+
+FRAMES_FILE = "frames.npy"
+OFFSETS_FILE = "offsets.npy"
+LENGTHS_FILE = "lengths.npy"
+MANIFEST_FILE = "manifest.json"
+
+
+class KeypointsDataset:
+    """
+    Dataset de una palabra abierto en modo memory-mapped
+
+    Cada muestra se entrega como vista (sin copia) sobre `frames`.
+    """
+
+    def __init__(self, path: Union[str, Path], mmap_mode: str = 'r'):
+        """
+        Args:
+            path: Carpeta del dataset de la palabra
+            mmap_mode: Modo de `np.load` ('r' por defecto, None carga en memoria)
+        """
+        self.path = Path(path)
+
+        with open(self.path / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get('format') != DATASET_FORMAT:
+            raise ValueError(f"Formato de dataset desconocido en {self.path}")
+        if self.manifest.get('version', 0) > DATASET_VERSION:
+            raise ValueError(f"Versión de dataset no soportada: {self.manifest.get('version')}")
+
+        self.word_id = self.manifest['word_id']
+        self.frames = np.load(self.path / FRAMES_FILE, mmap_mode=mmap_mode)
+        self.offsets = np.load(self.path / OFFSETS_FILE)
+        self.lengths = np.load(self.path / LENGTHS_FILE)
+        self.sample_names = self.manifest.get('sample_names', [])
+        self.sample_fingerprints = self.manifest.get('sample_fingerprints', {})
+
+        if self.frames.shape[0] != self.manifest['n_frames'] or len(self.offsets) != self.manifest['n_samples']:
+            raise ValueError(f"Dataset inconsistente con su manifest: {self.path}")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        start = int(self.offsets[index])
+        return self.frames[start:start + int(self.lengths[index])]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def release(self):
+        """Libera el memmap (necesario en Windows antes de reescribir los archivos)"""
+        self.frames = np.empty((0, self.manifest['keypoints_length']), dtype=np.float32)
+
+    @property
+    def n_frames(self) -> int:
+        return int(self.frames.shape[0])
+
+    def __repr__(self):
+        return f"KeypointsDataset(word_id='{self.word_id}', samples={len(self)}, frames={self.n_frames})"
+
+
+def dataset_exists(path: Union[str, Path]) -> bool:
+    """Indica si la carpeta contiene un dataset completo (el manifest se escribe al final)"""
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def open_word_dataset(word_id: str, mmap_mode: str = 'r') -> KeypointsDataset:
+    """Abre el dataset de una palabra desde `config.get_dataset_path(word_id)`"""
+    return KeypointsDataset(config.get_dataset_path(word_id), mmap_mode=mmap_mode)
+
+
+class KeypointsDatasetWriter:
+    """
+    Escritor en streaming del dataset de una palabra
+
+    Las secuencias se copian a bloques preasignados de `chunk_frames` frames
+    (sin re-copiar lo ya escrito al crecer) y se vuelcan a disco una sola vez
+    en `close()`, por lo que construir el dataset es lineal en la cantidad de
+    muestras.
+
+    Uso:
+        with KeypointsDatasetWriter(config.get_dataset_path(word_id), word_id) as writer:
+            for sample_name in samples:
+                writer.append(get_keypoints(holistic, sample_path), sample_name)
+    """
+
+    def __init__(self, path: Union[str, Path], word_id: str, chunk_frames: int = 4096):
+        self.path = Path(path)
+        self.word_id = word_id
+        self.keypoints_length = config.model.keypoints_length
+        self.chunk_frames = chunk_frames
+
+        self._chunks: List[np.ndarray] = []
+        self._chunk_used = 0
+        self._lengths: List[int] = []
+        self._sample_names: List[str] = []
+        self._fingerprints: Dict[str, dict] = {}
+        self._n_frames = 0
+        self.manifest = None
+
+    def append(self, kp_seq: np.ndarray, sample_name: str = None, fingerprint: dict = None):
+        """
+        Agrega una muestra completa (n_frames, 1662)
+
+        Args:
+            kp_seq: Keypoints de la muestra
+            sample_name: Nombre de la muestra (default: su número, desde 1)
+            fingerprint: Huella de la carpeta de frames, usada para regenerar
+                de forma incremental (ver `create_keypoints.py`)
+        """
+        if self.manifest is not None:
+            raise RuntimeError("El dataset ya fue escrito")
+
+        kp_seq = np.asarray(kp_seq, dtype=np.float32).reshape(-1, self.keypoints_length)
+        copied = 0
+        while copied < len(kp_seq):
+            if not self._chunks or self._chunk_used == self.chunk_frames:
+                self._chunks.append(np.empty((self.chunk_frames, self.keypoints_length), dtype=np.float32))
+                self._chunk_used = 0
+
+            n_copy = min(len(kp_seq) - copied, self.chunk_frames - self._chunk_used)
+            self._chunks[-1][self._chunk_used:self._chunk_used + n_copy] = kp_seq[copied:copied + n_copy]
+            self._chunk_used += n_copy
+            copied += n_copy
+
+        self._lengths.append(len(kp_seq))
+        self._sample_names.append(sample_name if sample_name is not None else str(len(self._lengths)))
+        if fingerprint is not None:
+            self._fingerprints[self._sample_names[-1]] = fingerprint
+        self._n_frames += len(kp_seq)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def close(self) -> dict:
+        """Vuelca los bloques a disco y escribe el manifest; retorna el manifest"""
+        if self.manifest is not None:
+            return self.manifest
+
+        lengths = np.array(self._lengths, dtype=np.int64)
+        offsets = np.zeros_like(lengths)
+        if len(lengths):
+            np.cumsum(lengths[:-1], out=offsets[1:])
+
+        def write_frames(frames_path: Path):
+            frames = np.lib.format.open_memmap(
+                frames_path, mode='w+', dtype=np.float32,
+                shape=(self._n_frames, self.keypoints_length)
+            )
+            start = 0
+            for chunk_index, chunk in enumerate(self._chunks):
+                used = self._chunk_used if chunk_index == len(self._chunks) - 1 else self.chunk_frames
+                frames[start:start + used] = chunk[:used]
+                start += used
+            frames.flush()
+            del frames
+
+        self.manifest = _write_dataset_files(
+            self.path, self.word_id, write_frames, self.keypoints_length,
+            offsets, lengths, self._sample_names, self._fingerprints
+        )
+        self._chunks = []
+        return self.manifest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Si hubo error no se escribe un dataset parcial
+        if exc_type is None:
+            self.close()
+        return False
+
+
+def save_word_dataset(
+    path: Union[str, Path],
+    word_id: str,
+    sequences: Sequence[np.ndarray],
+    sample_names: Sequence[str] = None
+) -> dict:
+    """
+    Guarda las secuencias de una palabra en formato columnar
+
+    Args:
+        path: Carpeta destino del dataset de la palabra
+        word_id: ID de la palabra
+        sequences: Secuencias (n_frames_i, 1662) en el orden de las muestras
+        sample_names: Nombre de cada muestra (default: "1", "2", ...)
+
+    Returns:
+        dict: Manifest escrito
+    """
+    writer = KeypointsDatasetWriter(path, word_id)
+    for index, seq in enumerate(sequences):
+        writer.append(seq, sample_names[index] if sample_names is not None else None)
+    return writer.close()
+
+
+def _write_dataset_files(
+    path, word_id, write_frames, keypoints_length, offsets, lengths, sample_names, fingerprints=None
+) -> dict:
+    """
+    Escribe los arrays y por último el manifest, que marca el dataset como completo
+
+    `write_frames` es un array (n_frames, 1662) o una función que recibe la
+    ruta de `frames.npy` y lo escribe.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = path / MANIFEST_FILE
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    if callable(write_frames):
+        write_frames(path / FRAMES_FILE)
+    else:
+        np.save(path / FRAMES_FILE, write_frames)
+    np.save(path / OFFSETS_FILE, offsets)
+    np.save(path / LENGTHS_FILE, lengths)
+
+    manifest = {
+        'format': DATASET_FORMAT,
+        'version': DATASET_VERSION,
+        'word_id': word_id,
+        'dtype': 'float32',
+        'keypoints_length': int(keypoints_length),
+        'n_samples': int(len(offsets)),
+        'n_frames': int(lengths.sum()),
+        'sample_names': list(sample_names),
+    }
+    if fingerprints:
+        manifest['sample_fingerprints'] = fingerprints
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return manifest
+
+
+def convert_hdf_to_dataset(hdf_path: Union[str, Path], dataset_path: Union[str, Path], word_id: str) -> dict:
+    """
+    Convierte un archivo `<word>.h5` (columnas sample, frame, keypoints) al formato columnar
+
+    Las muestras quedan ordenadas por número de muestra y frame, igual que
+    `groupby('sample')` en la carga anterior.
+    """
+    import pandas as pd
+
+    data = pd.read_hdf(hdf_path, key='data')
+    order = np.lexsort((data['frame'].to_numpy(), data['sample'].to_numpy()))
+    samples = data['sample'].to_numpy()[order]
+
+    if len(order):
+        frames = np.stack(data['keypoints'].to_numpy()[order]).astype(np.float32, copy=False)
+    else:
+        frames = np.empty((0, config.model.keypoints_length), dtype=np.float32)
+
+    sample_ids, offsets, lengths = np.unique(samples, return_index=True, return_counts=True)
+
+    return _write_dataset_files(
+        dataset_path, word_id, frames, frames.shape[1],
+        offsets.astype(np.int64), lengths.astype(np.int64),
+        [str(sample_id) for sample_id in sample_ids]
+    )
+
+
+def convert_all(words_id: List[str] = None) -> int:
+    """Convierte todos los `.h5` de `config.KEYPOINTS_PATH`; retorna la cantidad convertida"""
+    keypoints_path = config.get_keypoints_path()
+    if words_id is None:
+        words_id = sorted(hdf.stem for hdf in keypoints_path.glob('*.h5'))
+
+    converted = 0
+    for word_id in words_id:
+        hdf_path = config.get_keypoints_path(word_id)
+        if not hdf_path.exists():
+            logger.warning(f"Archivo de keypoints no encontrado: {hdf_path}")
+            continue
+
+        try:
+            manifest = convert_hdf_to_dataset(hdf_path, config.get_dataset_path(word_id), word_id)
+            converted += 1
+            logger.info(f"  ✓ {word_id}: {manifest['n_samples']} muestras, {manifest['n_frames']} frames")
+        except Exception as e:
+            logger.error(f"  ❌ Error convirtiendo '{word_id}': {e}", exc_info=True)
+
+    return converted
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    parser = argparse.ArgumentParser(description="Dataset columnar de keypoints")
+    parser.add_argument('--convert', action='store_true', help='convierte data/keypoints/*.h5 al formato columnar')
+    parser.add_argument('words', nargs='*', help='palabras a convertir (default: todas)')
+    args = parser.parse_args()
+
+    if args.convert:
+        total = convert_all(args.words or None)
+        logger.info(f"✓ Conversión completada: {total} palabras en {config.get_dataset_path()}")
+    else:
+        for word_id in args.words or config.get_word_ids():
+            if dataset_exists(config.get_dataset_path(word_id)):
+                print(open_word_dataset(word_id))
+            else:
+                print(f"{word_id}: sin dataset")
@@ -0,0 +1,172 @@
+"""
+keypoints_pipeline.py - Pipeline tf.data para entrenamiento
+============================================================
+
+Construye un `tf.data.Dataset` a partir de las secuencias de keypoints de cada
+palabra (vistas sobre los memmaps de `keypoints_dataset`):
+
+    generador (lee cada muestra del memmap bajo demanda)
+      -> normalización a `config.model.frames` frames (pre-padding / truncado final)
+      -> cache (en memoria, o en disco si el dataset no cabe en RAM)
+      -> shuffle con buffer acotado (solo entrenamiento)
+      -> batch -> aumento de datos (solo entrenamiento, ver `keypoints_augmentation`)
+      -> prefetch(AUTOTUNE)
+
+Las etiquetas son enteros (índice de la palabra) para usar con
+`sparse_categorical_crossentropy`, sin matriz one-hot.
+
+Uso:
+    from keypoints_pipeline import make_dataset
+    
+    train_ds = make_dataset(sequences, labels, training=True)
+    model.fit(train_ds, ...)
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+
+from config_manager import config
+from helpers import KEYPOINTS_LENGTH
+from keypoints_augmentation import augment_batch
+
+logger = logging.getLogger(__name__)
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+# Fracción de la RAM disponible que puede ocupar la cache en memoria
+MEMORY_CACHE_FRACTION = 0.5
+
+
+def normalize_length(sequence: tf.Tensor, frames: int) -> tf.Tensor:
+    """
+    Lleva una secuencia (n, 1662) a (frames, 1662)
+    
+    Equivale a `pad_sequences(padding='pre', truncating='post')`: las secuencias
+    largas conservan los primeros `frames` frames y las cortas se completan con
+    ceros al inicio.
+    """
+    sequence = sequence[:frames]
+    missing = frames - tf.shape(sequence)[0]
+    sequence = tf.pad(sequence, [[missing, 0], [0, 0]])
+    return tf.ensure_shape(sequence, (frames, KEYPOINTS_LENGTH))
+
+
+def available_memory() -> Optional[int]:
+    """Bytes de RAM disponibles, o None si el sistema no lo expone"""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def resolve_cache_mode(cache: str, n_bytes: int) -> str:
+    """
+    Decide dónde cachear el dataset ya normalizado
+    
+    Args:
+        cache: 'auto', 'memory', 'disk' o 'none'
+        n_bytes: Tamaño estimado del dataset normalizado
+    
+    Returns:
+        str: 'memory', 'disk' o 'none'
+    """
+    if cache not in ('auto', 'memory', 'disk', 'none'):
+        raise ValueError(f"Modo de cache inválido: {cache!r}")
+    if cache != 'auto':
+        return cache
+    
+    memory = available_memory()
+    if memory is None or n_bytes <= memory * MEMORY_CACHE_FRACTION:
+        return 'memory'
+    return 'disk'
+
+
+def _clear_cache_files(cache_file: Path):
+    """Borra la cache en disco de una ejecución anterior (tf.data la reutilizaría tal cual)"""
+    for path in cache_file.parent.glob(f"{cache_file.name}*"):
+        path.unlink()
+
+
+def make_dataset(
+    sequences: Sequence,
+    labels: Sequence[int],
+    training: bool = False,
+    frames: int = None,
+    batch_size: int = None,
+    cache: str = None,
+    shuffle_buffer: int = None,
+    seed: int = None,
+    augment: bool = None,
+    name: str = 'train',
+) -> tf.data.Dataset:
+    """
+    Crea el pipeline tf.data de un conjunto de muestras
+    
+    Args:
+        sequences: Secuencias (n_frames, 1662) de longitud variable; pueden ser
+            vistas sobre memmap, se leen de disco al recorrer el dataset
+        labels: Índice de palabra de cada secuencia
+        training: Si es True mezcla las muestras en cada época
+        frames: Frames por muestra (default: config.model.frames)
+        batch_size: Tamaño de batch (default: config.training.batch_size)
+        cache: 'auto', 'memory', 'disk' o 'none' (default: config.training.cache)
+        shuffle_buffer: Tamaño máximo del buffer de shuffle (default: config.training.shuffle_buffer)
+        seed: Semilla del shuffle (default: config.training.random_seed)
+        augment: Aplica el aumento de datos por batch en entrenamiento
+            (default: config.augmentation.enabled)
+        name: Nombre de la cache en disco (`data/cache/<name>`)
+    
+    Returns:
+        tf.data.Dataset: Batches (batch, frames, 1662) float32 y etiquetas (batch,) int32
+    """
+    if len(sequences) != len(labels):
+        raise ValueError(f"{len(sequences)} secuencias para {len(labels)} etiquetas")
+    
+    frames = frames or config.model.frames
+    batch_size = batch_size or config.training.batch_size
+    cache = cache or config.training.get('cache', 'auto')
+    shuffle_buffer = shuffle_buffer or config.training.get('shuffle_buffer', 1024)
+    seed = config.training.random_seed if seed is None else seed
+    if augment is None:
+        augment = getattr(config, 'augmentation', None) is not None and config.augmentation.get('enabled', False)
+    labels = np.asarray(labels, dtype=np.int32)
+    
+    def generator():
+        for sequence, label in zip(sequences, labels):
+            yield np.asarray(sequence, dtype=np.float32), label
+    
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(None, KEYPOINTS_LENGTH), dtype=tf.float32),
+            tf.TensorSpec(shape=(), dtype=tf.int32),
+        ),
+    ).apply(tf.data.experimental.assert_cardinality(len(sequences)))
+    dataset = dataset.map(lambda x, y: (normalize_length(x, frames), y), num_parallel_calls=AUTOTUNE)
+    
+    n_bytes = len(sequences) * frames * KEYPOINTS_LENGTH * np.dtype(np.float32).itemsize
+    cache_mode = resolve_cache_mode(cache, n_bytes)
+    if cache_mode == 'memory':
+        dataset = dataset.cache()
+    elif cache_mode == 'disk':
+        cache_file = config.DATA_PATH / 'cache' / name
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        _clear_cache_files(cache_file)
+        dataset = dataset.cache(str(cache_file))
+    logger.info(f"Pipeline '{name}': {len(sequences)} muestras, {n_bytes / 2**20:.1f} MB, cache={cache_mode}")
+    
+    if training:
+        buffer_size = max(1, min(shuffle_buffer, len(sequences)))
+        dataset = dataset.shuffle(buffer_size, seed=seed, reshuffle_each_iteration=True)
+    
+    dataset = dataset.batch(batch_size)
+    if training and augment:
+        # Después de la cache: cada época ve variaciones distintas
+        dataset = dataset.map(augment_batch, num_parallel_calls=AUTOTUNE)
+    
+    return dataset.prefetch(AUTOTUNE)
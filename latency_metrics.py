@@ -0,0 +1,33 @@
+"""
+latency_metrics.py - Resumen de latencias para las métricas de los servicios
+============================================================================
+
+Resumen común (p50/p95/p99/max en ms) de las ventanas de latencia que
+exponen el servidor de inferencia, el pool de Holistic, el pipeline de
+frames y el sink de predicciones.
+
+Uso:
+    from latency_metrics import percentiles
+    
+    metrics['latency_ms'] = percentiles(list(self._latencies))
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def percentiles(values_ms: Sequence[float]) -> Dict[str, float]:
+    """
+    Percentiles de una ventana de latencias
+    
+    Args:
+        values_ms: Latencias en milisegundos
+    
+    Returns:
+        dict: p50, p95, p99 y max (todos 0.0 si no hay valores)
+    """
+    if not len(values_ms):
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    p50, p95, p99 = np.percentile(values_ms, [50, 95, 99])
+    return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(max(values_ms))}
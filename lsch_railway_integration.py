@@ -12,6 +12,8 @@ from datetime import datetime
 import json
 from pathlib import Path
 
+from inference_model import InferenceModel
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,6 +23,7 @@ class LSChModelManager:
     
     def __init__(self):
         self.model = None
+        self.inference = None
         self.word_ids = []
         self.model_path = 'models/actions_15.keras'
         self.words_path = 'models/words.json'
@@ -47,6 +50,7 @@ class LSChModelManager:
             # Load model
             if os.path.exists(self.model_path):
                 self.model = tf.keras.models.load_model(self.model_path)
+                self.inference = InferenceModel(self.model)
                 logger.info(f"✅ Model loaded successfully")
                 logger.info(f"   Input shape: {self.model.input_shape}")
                 logger.info(f"   Output classes: {len(self.word_ids)}")
@@ -79,6 +83,7 @@ class LSChModelManager:
             loss='categorical_crossentropy',
             metrics=['accuracy']
         )
+        self.inference = InferenceModel(self.model)
         
         self.is_loaded = True
         logger.info("✅ Dummy model created for testing")
@@ -101,8 +106,8 @@ class LSChModelManager:
             if len(keypoints_sequence.shape) == 2:
                 keypoints_sequence = np.expand_dims(keypoints_sequence, axis=0)
                 
-            # Make prediction
-            predictions = self.model.predict(keypoints_sequence, verbose=0)
+            # Make prediction (compiled tf.function, no model.predict overhead)
+            predictions = self.inference.predict_batch(keypoints_sequence)
             
             # Get top predictions
             top_indices = np.argsort(predictions[0])[::-1][:3]
@@ -6,18 +6,13 @@ from PyQt5.QtCore import QTimer, Qt
 from PyQt5.uic import loadUi
 
 import numpy as np
-try:
-    import tensorflow as tf
-    load_model = tf.keras.models.load_model
-except Exception:
-    try:
-        from keras.models import load_model
-    except Exception:
-        raise ImportError("Could not import 'load_model' from tensorflow.keras or keras. Install TensorFlow or Keras.")
 import mediapipe as mp
-from evaluate_model import normalize_keypoints
 from helpers import *
+from inference_model import InferenceModel
 from constants import *
+from config_manager import config
+from sign_segmenter import SignSegmenter
+from sign_spotting import SignSpotter
 from text_to_speech import text_to_speech
 from logger_config import get_logger
 
@@ -56,13 +51,11 @@ class VideoRecorder(QMainWindow):
     
     def init_lsp(self):
         self.holistic_model = mp.solutions.holistic.Holistic()
-        self.kp_seq, self.sentence = [], []
-        self.count_frame = 0
-        self.fix_frames = 0
-        self.margin_frame = 1
-        self.delay_frames = 3
-        self.model = load_model(MODEL_PATH)
-        self.recording = False
+        self.sentence = []
+        self.segmenter = SignSegmenter(margin_frame=1, delay_frames=3)
+        self.model = InferenceModel(MODEL_PATH)
+        # Reconocimiento continuo: no requiere bajar las manos entre señas
+        self.spotter = SignSpotter(self.model.predict_batch) if config.spotting.enabled else None
     
     def update_frame(self):
         word_ids = get_word_ids(WORDS_JSON_PATH)
@@ -73,33 +66,19 @@ class VideoRecorder(QMainWindow):
         
         results = mediapipe_detection(frame, self.holistic_model)
         
-        if there_hand(results) or self.recording:
-            self.recording = False
-            self.count_frame += 1
-            if self.count_frame > self.margin_frame:
-                self.kp_seq.append(extract_keypoints(results))
-            
+        if self.spotter is not None:
+            for sign in self.spotter.push(extract_keypoints(results)):
+                self.add_word(word_ids[sign.word_index])
+        
         else:
-            if self.count_frame >= MIN_LENGTH_FRAMES + self.margin_frame:
-                self.fix_frames += 1
-                if self.fix_frames < self.delay_frames:
-                    self.recording = True
-                    return
-                
-                self.kp_seq = self.kp_seq[: - (self.margin_frame + self.delay_frames)]
-                kp_normalized = normalize_keypoints(self.kp_seq, int(MODEL_FRAMES))
-                res = self.model.predict(np.expand_dims(kp_normalized, axis=0))[0]
+            # La seña se cierra al bajar las manos o al llegar a model.max_length_frames
+            kp_seq = self.segmenter.push(results)
+            if kp_seq is not None:
+                kp_normalized = normalize_keypoints(kp_seq, int(MODEL_FRAMES))
+                res = self.model.predict_one(kp_normalized)
                 
                 if res[np.argmax(res)] > 0.7:
-                    word_id = word_ids[np.argmax(res)].split('-')[0]
-                    sent = words_text.get(word_id)
-                    self.sentence.insert(0, sent)
-                    text_to_speech(sent) # ONLY LOCAL (NO SERVER)
-            
-            self.recording = False
-            self.fix_frames = 0
-            self.count_frame = 0
-            self.kp_seq = []
+                    self.add_word(word_ids[np.argmax(res)])
         
         self.lbl_output.setText(" - ".join(self.sentence))
         draw_keypoints(image, results)
@@ -112,6 +91,11 @@ class VideoRecorder(QMainWindow):
         
         self.lbl_video.setPixmap(QPixmap.fromImage(scaled_qImg))
 
+    def add_word(self, word_id):
+        sent = words_text.get(word_id.split('-')[0])
+        self.sentence.insert(0, sent)
+        text_to_speech(sent) # ONLY LOCAL (NO SERVER)
+    
     # def start_recording(self):
     #     if not self.recording:
     #         self.recording = True
@@ -0,0 +1,216 @@
+"""
+model_export.py - Exportación del modelo para inferencia
+========================================================
+
+Convierte el modelo `.keras` entrenado a formatos de inferencia y verifica
+que la precisión se mantiene sobre el split de validación del entrenamiento.
+
+TFLite:
+    El LSTM se convierte desde un grafo congelado con batch fijo 1 (con batch
+    dinámico la conversión falla en TensorListReserve). Cuantizaciones:
+    
+    - none:    float32, resultados prácticamente idénticos a Keras
+    - float16: pesos en float16 (~1/2 del tamaño)
+    - dynamic: pesos int8 con cuantización dinámica de rango (~1/4 del tamaño)
+
+ONNX:
+    Exportado con tf2onnx con batch dinámico; el while del LSTM de Keras se
+    reescribe como el operador LSTM nativo de ONNX.
+
+Uso:
+    python model_export.py tflite [--quantization float16] [--output models/x.tflite]
+    python model_export.py onnx [--opset 17] [--output models/x.onnx]
+    python model_export.py parity --backend tflite [--path models/x.tflite]
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+from config_manager import config
+from inference_backend import BACKENDS, load_inference_model
+from inference_model import InferenceModel
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+QUANTIZATIONS = ('none', 'float16', 'dynamic')
+_QUANTIZATION_SUFFIX = {'none': '', 'float16': '.float16', 'dynamic': '.int8'}
+
+
+def default_export_path(model_path: Path, fmt: str, quantization: str = 'none') -> Path:
+    """Ruta de exportación junto al modelo: actions_15.keras -> actions_15.float16.tflite"""
+    return model_path.with_name(f"{model_path.stem}{_QUANTIZATION_SUFFIX[quantization]}.{fmt}")
+
+
+def export_tflite(model_path=None, output=None, quantization: str = 'none') -> Path:
+    """
+    Exporta el modelo a TFLite
+    
+    Args:
+        model_path: Modelo `.keras` (default: config.get_model_path())
+        output: Archivo `.tflite` de salida (default: junto al modelo)
+        quantization: none, float16 o dynamic
+    
+    Returns:
+        Path: Archivo generado
+    """
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Cuantización desconocida: {quantization} (opciones: {', '.join(QUANTIZATIONS)})")
+    
+    model_path = Path(model_path or config.get_model_path())
+    output = Path(output) if output else default_export_path(model_path, 'tflite', quantization)
+    model = tf.keras.models.load_model(model_path, compile=False)
+    _, frames, keypoints_length = model.input_shape
+    
+    # Grafo congelado con batch 1: los ResourceVariable del LSTM no sobreviven
+    # la conversión con batch dinámico
+    forward = tf.function(
+        lambda x: model(x, training=False),
+        input_signature=[tf.TensorSpec((1, frames, keypoints_length), tf.float32)],
+        autograph=False,
+    )
+    frozen = convert_variables_to_constants_v2(forward.get_concrete_function())
+    
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([frozen])
+    if quantization != 'none':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(converter.convert())
+    logger.info(f"Modelo TFLite ({quantization}) guardado en {output}: {output.stat().st_size / 1e6:.2f} MB "
+                f"(keras {model_path.stat().st_size / 1e6:.2f} MB)")
+    return output
+
+
+def export_onnx(model_path=None, output=None, opset: int = 17) -> Path:
+    """
+    Exporta el modelo a ONNX (requiere tf2onnx)
+    
+    Args:
+        model_path: Modelo `.keras` (default: config.get_model_path())
+        output: Archivo `.onnx` de salida (default: junto al modelo)
+        opset: Versión del opset ONNX
+    
+    Returns:
+        Path: Archivo generado
+    """
+    import tf2onnx
+    
+    model_path = Path(model_path or config.get_model_path())
+    output = Path(output) if output else default_export_path(model_path, 'onnx')
+    model = tf.keras.models.load_model(model_path, compile=False)
+    _, frames, keypoints_length = model.input_shape
+    
+    forward = tf.function(lambda x: model(x, training=False))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tf2onnx.convert.from_function(
+        forward,
+        input_signature=[tf.TensorSpec((None, frames, keypoints_length), tf.float32, name='keypoints')],
+        opset=opset,
+        output_path=str(output),
+    )
+    logger.info(f"Modelo ONNX (opset {opset}) guardado en {output}: {output.stat().st_size / 1e6:.2f} MB "
+                f"(keras {model_path.stat().st_size / 1e6:.2f} MB)")
+    return output
+
+
+def parity_report(backend: str, path=None, model_path=None, batch_size: int = 64) -> dict:
+    """
+    Compara un backend exportado contra el modelo Keras en el split de validación
+    
+    Args:
+        backend: Backend a evaluar (ver inference_backend.BACKENDS)
+        path: Modelo exportado (default: config.get_inference_model_path(backend))
+        model_path: Modelo `.keras` de referencia (default: config.get_model_path())
+        batch_size: Secuencias por llamada
+    
+    Returns:
+        dict: samples, accuracy de cada modelo, acuerdo de argmax y
+              diferencia absoluta máxima de probabilidades
+    """
+    # Mismo split y normalización que training_model.py
+    from helpers import get_sequences_and_labels
+    from keypoints_pipeline import make_dataset
+    from training_model import split_train_validation
+    
+    sequences, labels = get_sequences_and_labels(config.get_word_ids())
+    if len(sequences) == 0:
+        raise ValueError("No se encontraron datos. Ejecute create_keypoints.py primero.")
+    labels = np.asarray(labels, dtype=np.int32)
+    _, val_idx = split_train_validation(labels)
+    dataset = make_dataset(
+        [sequences[i] for i in val_idx], labels[val_idx],
+        batch_size=batch_size, cache='none', name='parity'
+    )
+    
+    reference = InferenceModel(model_path or config.get_model_path())
+    candidate = load_inference_model(backend, path)
+    
+    reference_hits = candidate_hits = agreement = 0
+    max_abs_diff = 0.0
+    for batch, batch_labels in dataset.as_numpy_iterator():
+        expected = reference.predict_batch(batch)
+        predicted = candidate.predict_batch(batch)
+        reference_hits += int(np.sum(expected.argmax(axis=1) == batch_labels))
+        candidate_hits += int(np.sum(predicted.argmax(axis=1) == batch_labels))
+        agreement += int(np.sum(expected.argmax(axis=1) == predicted.argmax(axis=1)))
+        max_abs_diff = max(max_abs_diff, float(np.abs(expected - predicted).max()))
+    
+    samples = len(val_idx)
+    report = {
+        'backend': backend,
+        'samples': samples,
+        'keras_accuracy': reference_hits / samples,
+        'backend_accuracy': candidate_hits / samples,
+        'argmax_agreement': agreement / samples,
+        'max_abs_diff': max_abs_diff,
+    }
+    logger.info(f"Paridad {backend} vs keras ({samples} muestras de validación):")
+    logger.info(f"  Accuracy keras:   {report['keras_accuracy'] * 100:.2f}%")
+    logger.info(f"  Accuracy {backend}: {report['backend_accuracy'] * 100:.2f}%")
+    logger.info(f"  Acuerdo argmax:   {report['argmax_agreement'] * 100:.2f}%")
+    logger.info(f"  Máx |Δp|:         {report['max_abs_diff']:.2e}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    tflite_parser = subparsers.add_parser('tflite', help='exporta a TFLite')
+    tflite_parser.add_argument('--model', type=Path, default=None, help='modelo .keras')
+    tflite_parser.add_argument('--output', type=Path, default=None)
+    tflite_parser.add_argument('--quantization', choices=QUANTIZATIONS, default='none')
+    
+    onnx_parser = subparsers.add_parser('onnx', help='exporta a ONNX')
+    onnx_parser.add_argument('--model', type=Path, default=None, help='modelo .keras')
+    onnx_parser.add_argument('--output', type=Path, default=None)
+    onnx_parser.add_argument('--opset', type=int, default=17)
+    
+    parity_parser = subparsers.add_parser('parity', help='compara un backend con keras en validación')
+    parity_parser.add_argument('--backend', choices=BACKENDS, default=config.inference.backend)
+    parity_parser.add_argument('--path', type=Path, default=None, help='modelo exportado')
+    parity_parser.add_argument('--model', type=Path, default=None, help='modelo .keras de referencia')
+    parity_parser.add_argument('--batch-size', type=int, default=64)
+    
+    args = parser.parse_args()
+    if args.command == 'tflite':
+        export_tflite(args.model, args.output, args.quantization)
+    elif args.command == 'onnx':
+        export_onnx(args.model, args.output, args.opset)
+    else:
+        parity_report(args.backend, args.path, args.model, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
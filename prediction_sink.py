@@ -0,0 +1,204 @@
+"""
+prediction_sink.py - Escritura diferida (write-behind) de predicciones
+======================================================================
+
+Saca los INSERT de la ruta de tiempo real: las predicciones reconocidas se
+encolan en memoria y un hilo escritor las inserta por lotes.
+
+    submit(fila) -> cola acotada (max_pending)
+        hilo escritor: junta hasta `batch_size` filas o `flush_interval_ms`
+        desde la primera, y llama a `write_fn(filas)` una vez por lote
+
+- `submit` nunca espera a la base de datos: si la cola está llena la fila se
+  descarta y se cuenta en `dropped`.
+- Si `write_fn` falla, el lote se reintenta con espera exponencial
+  (`retry_backoff_ms` x 2^intento, hasta `max_retries`); agotados los
+  reintentos se descarta y se cuenta en `failed`.
+- `close()` escribe lo pendiente antes de detener el hilo.
+
+Uso:
+    from prediction_sink import PredictionSink
+    
+    sink = PredictionSink(lambda rows: insert_predictions(rows))
+    sink.start()
+    sink.submit({'user_id': 1, 'word': 'HOLA', ...})
+    sink.close()                                 # al apagar el servidor
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, List
+
+from config_manager import config
+from latency_metrics import percentiles
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PredictionSink:
+    """
+    Cola de filas con un hilo que las escribe por lotes
+    """
+    
+    def __init__(
+        self,
+        write_fn: Callable[[List[dict]], None],
+        batch_size: int = None,
+        flush_interval_ms: float = None,
+        max_pending: int = None,
+        max_retries: int = None,
+        retry_backoff_ms: float = None,
+        latency_window: int = 1000,
+    ):
+        """
+        Args:
+            write_fn: Inserta una lista de filas en una sola operación
+            batch_size: Filas por lote (default: config.persistence.batch_size)
+            flush_interval_ms: Espera máxima desde la primera fila del lote
+            max_pending: Filas en cola como máximo (memoria acotada)
+            max_retries: Reintentos de un lote fallido antes de descartarlo
+            retry_backoff_ms: Espera antes del primer reintento (se duplica en cada uno)
+            latency_window: Lotes recientes usados para las latencias
+        """
+        settings = config.persistence
+        self.write_fn = write_fn
+        self.batch_size = batch_size or settings.batch_size
+        self.flush_interval = (settings.flush_interval_ms if flush_interval_ms is None else flush_interval_ms) / 1000
+        self.max_retries = settings.max_retries if max_retries is None else max_retries
+        self.retry_backoff = (settings.retry_backoff_ms if retry_backoff_ms is None else retry_backoff_ms) / 1000
+        if self.batch_size < 1:
+            raise ValueError("batch_size debe ser >= 1")
+        self._queue = queue.Queue(max_pending or settings.max_pending)
+        self._thread = None
+        self._closing = threading.Event()
+        
+        self._lock = threading.Lock()
+        self._write_ms = deque(maxlen=latency_window)
+        self._written = 0
+        self._batches = 0
+        self._dropped = 0
+        self._failed = 0
+        self._retries = 0
+    
+    # ==================== CICLO DE VIDA ====================
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Inicia el hilo escritor"""
+        if self.running:
+            return
+        self._closing.clear()
+        self._thread = threading.Thread(target=self._run, name='prediction-sink', daemon=True)
+        self._thread.start()
+    
+    def close(self, timeout: float = None):
+        """Escribe las filas pendientes y detiene el hilo"""
+        if not self.running:
+            return
+        self._closing.set()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    # ==================== ENTRADA ====================
+    
+    def submit(self, row: dict) -> bool:
+        """
+        Encola una fila sin bloquear
+        
+        Returns:
+            bool: False si se descartó (cola llena o sink detenido)
+        """
+        if not self.running or self._closing.is_set():
+            with self._lock:
+                self._dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Cola de predicciones llena: fila descartada")
+            return False
+        return True
+    
+    # ==================== HILO ESCRITOR ====================
+    
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.perf_counter())
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(batch)
+                batch = []
+                continue
+            
+            if row is _STOP:
+                self._flush(batch)
+                return
+            batch.append(row)
+            if len(batch) == 1:
+                deadline = time.perf_counter() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+    
+    def _flush(self, batch: List[dict]):
+        if not batch:
+            return
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                self.write_fn(batch)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Lote de {len(batch)} predicciones descartado tras {attempt} reintentos: {e}")
+                    with self._lock:
+                        self._failed += len(batch)
+                    return
+                backoff = self.retry_backoff * 2 ** attempt
+                logger.warning(f"Error escribiendo {len(batch)} predicciones, reintento en {backoff * 1000:.0f}ms: {e}")
+                with self._lock:
+                    self._retries += 1
+                time.sleep(backoff)
+                continue
+            
+            with self._lock:
+                self._written += len(batch)
+                self._batches += 1
+                self._write_ms.append((time.perf_counter() - started) * 1000)
+            return
+    
+    # ==================== MÉTRICAS ====================
+    
+    def metrics(self) -> dict:
+        """
+        Métricas del sink
+        
+        Returns:
+            dict: pending, written, batches, mean_batch_size, dropped, failed,
+                  retries y write_ms (p50/p95/p99/max por lote)
+        """
+        with self._lock:
+            return {
+                'running': self.running,
+                'pending': self._queue.qsize(),
+                'written': self._written,
+                'batches': self._batches,
+                'mean_batch_size': self._written / self._batches if self._batches else 0.0,
+                'dropped': self._dropped,
+                'failed': self._failed,
+                'retries': self._retries,
+                'write_ms': percentiles(list(self._write_ms)),
+            }
@@ -3,6 +3,7 @@ from flask import Flask, request, jsonify
 from werkzeug.utils import secure_filename
 from process_video import process_video
 from evaluate_model import evaluate_model
+from helpers import extract_keypoints
 import cv2
 import numpy as np
 import base64
@@ -19,26 +20,6 @@ def mediapipe_detection(image, model):
 
 app = Flask(__name__)
 
-def extract_keypoints(results):
-    """Extract pose, face, left and right hand landmarks from MediaPipe result and return flattened numpy array."""
-    # Pose: 33 landmarks with x,y,z,visibility
-    pose = np.zeros(33 * 4)
-    if results.pose_landmarks:
-        pose = np.array([[lm.x, lm.y, lm.z, lm.visibility] for lm in results.pose_landmarks.landmark]).flatten()
-    # Face: 468 landmarks with x,y,z
-    face = np.zeros(468 * 3)
-    if results.face_landmarks:
-        face = np.array([[lm.x, lm.y, lm.z] for lm in results.face_landmarks.landmark]).flatten()
-    # Left hand: 21 landmarks with x,y,z
-    lh = np.zeros(21 * 3)
-    if results.left_hand_landmarks:
-        lh = np.array([[lm.x, lm.y, lm.z] for lm in results.left_hand_landmarks.landmark]).flatten()
-    # Right hand: 21 landmarks with x,y,z
-    rh = np.zeros(21 * 3)
-    if results.right_hand_landmarks:
-        rh = np.array([[lm.x, lm.y, lm.z] for lm in results.right_hand_landmarks.landmark]).flatten()
-    return np.concatenate([pose, face, lh, rh])
-
 # Try to load a trained model and word ids if available, otherwise provide a safe dummy.
 model = None
 word_ids = []
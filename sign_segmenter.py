@@ -0,0 +1,128 @@
+"""
+sign_segmenter.py - Segmentación de señas por presencia de manos
+================================================================
+
+Máquina de estados compartida por main.py, evaluate_model.py y el backend web:
+
+- Mientras haya manos (o se esté en la espera de `delay_frames`) se acumulan
+  los keypoints, descartando los primeros `margin_frame` frames.
+- Cuando las manos desaparecen y el segmento tiene al menos
+  `min_length_frames + margin_frame` frames, se esperan `delay_frames` frames
+  (alternando frames de gracia) antes de cerrar la seña y se descartan los
+  últimos `margin_frame + delay_frames` frames.
+- Si la seña llega a `max_length_frames` se cierra aunque sigan las manos.
+
+Los keypoints se escriben directamente en un buffer float32 reservado una vez
+(`max_length_frames` x 1662), por lo que mantener un segmentador por sesión
+cuesta una matriz fija y ninguna lista que crezca.
+
+Uso:
+    from sign_segmenter import SignSegmenter
+    
+    segmenter = SignSegmenter()
+    segment = segmenter.push(results)            # por frame de MediaPipe
+    if segment is not None:
+        probabilities = model.predict_one(normalize_keypoints(segment))
+"""
+
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+
+from config_manager import config
+from helpers import KEYPOINTS_LENGTH, extract_keypoints, has_hands, there_hand
+
+logger = logging.getLogger(__name__)
+
+
+class SignSegmenter:
+    """
+    Segmentador incremental de señas con buffer de capacidad fija
+    """
+    
+    def __init__(
+        self,
+        margin_frame: int = None,
+        delay_frames: int = None,
+        min_length_frames: int = None,
+        max_length_frames: int = None,
+        on_frame: Callable[[np.ndarray, int], None] = None,
+    ):
+        """
+        Args:
+            margin_frame: Frames ignorados al inicio/fin (default: config.capture.margin_frame)
+            delay_frames: Frames de espera sin manos (default: config.capture.delay_frames)
+            min_length_frames: Frames mínimos de una seña (default: config.model.min_length_frames)
+            max_length_frames: Frames máximos de una seña (default: config.model.max_length_frames)
+            on_frame: Llamado con (keypoints, largo del segmento) por cada frame guardado
+        """
+        self.margin_frame = config.capture.margin_frame if margin_frame is None else margin_frame
+        self.delay_frames = config.capture.delay_frames if delay_frames is None else delay_frames
+        self.min_length_frames = min_length_frames or config.model.min_length_frames
+        self.max_length_frames = max_length_frames or config.model.max_length_frames
+        self.on_frame = on_frame
+        
+        self._buffer = np.zeros((self.max_length_frames, KEYPOINTS_LENGTH), dtype=np.float32)
+        self.reset()
+    
+    def __len__(self) -> int:
+        """Frames guardados del segmento actual"""
+        return self._length
+    
+    def reset(self):
+        """Descarta el segmento actual"""
+        self._length = 0
+        self.count_frame = 0
+        self.fix_frames = 0
+        # True durante la espera de delay_frames: el frame siguiente se graba aunque no haya manos
+        self.recording = False
+    
+    def push(self, results) -> Optional[np.ndarray]:
+        """
+        Procesa un resultado de MediaPipe Holistic
+        
+        Returns:
+            Optional[np.ndarray]: Segmento (n, 1662) float32 si la seña terminó con este frame
+        """
+        return self._step(bool(there_hand(results)), lambda out: extract_keypoints(results, out=out))
+    
+    def push_keypoints(self, keypoints: np.ndarray) -> Optional[np.ndarray]:
+        """Igual que `push` para keypoints ya extraídos (1662,)"""
+        def write(out):
+            out[:] = keypoints
+            return out
+        return self._step(bool(has_hands(keypoints)), write)
+    
+    def _step(self, hands: bool, write_keypoints) -> Optional[np.ndarray]:
+        if hands or self.recording:
+            self.recording = False
+            self.count_frame += 1
+            if self.count_frame > self.margin_frame:
+                keypoints = write_keypoints(self._buffer[self._length])
+                self._length += 1
+                if self.on_frame is not None:
+                    self.on_frame(keypoints, self._length)
+                if self._length == self.max_length_frames:
+                    logger.debug(f"Seña cortada al llegar a {self.max_length_frames} frames")
+                    segment = self._close(self._length)
+                    # Las manos siguen: el frame siguiente ya pertenece a la próxima seña
+                    self.count_frame = self.margin_frame
+                    return segment
+            return None
+        
+        if self.count_frame < self.min_length_frames + self.margin_frame:
+            self.reset()
+            return None
+        
+        self.fix_frames += 1
+        if self.fix_frames < self.delay_frames:
+            self.recording = True
+            return None
+        
+        return self._close(self._length - (self.margin_frame + self.delay_frames))
+    
+    def _close(self, length: int) -> Optional[np.ndarray]:
+        segment = self._buffer[:length].copy() if length >= self.min_length_frames else None
+        self.reset()
+        return segment
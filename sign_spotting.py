@@ -0,0 +1,195 @@
+"""
+sign_spotting.py - Reconocimiento continuo por ventana deslizante
+=================================================================
+
+Reconoce señas sin exigir que las manos salgan del cuadro entre una y otra:
+
+    frame -> ring buffer de los últimos `window` frames
+          -> cada `stride` frames una ventana (si tiene manos suficientes)
+          -> clasificador sobre las ventanas pendientes en un solo batch
+          -> candidatos con confianza >= threshold
+          -> supresión de no-máximos temporal: de los candidatos a menos de
+             `nms_frames` entre sí solo se emite el de mayor confianza
+
+Un candidato se decide cuando ya no puede llegar una ventana que lo supere,
+es decir `nms_frames` frames después de su fin: la latencia de una seña es
+`nms_frames` frames desde el final de su ventana, sin esperar a que bajen
+las manos.
+
+Uso:
+    from sign_spotting import SignSpotter
+    
+    spotter = SignSpotter(model.predict_batch)
+    for keypoints in frames:                     # en vivo
+        for sign in spotter.push(keypoints):
+            print(word_ids[sign.word_index], sign.confidence)
+    signs = spotter.flush()                      # fin del video
+    
+    signs = SignSpotter(model.predict_batch).spot(sequence)   # secuencia completa
+"""
+
+import logging
+from typing import Callable, List, NamedTuple
+
+import numpy as np
+
+from config_manager import config
+from helpers import KEYPOINTS_LENGTH, has_hands, normalize_keypoints_batch
+
+logger = logging.getLogger(__name__)
+
+
+class SpottedSign(NamedTuple):
+    """Seña detectada: clase, confianza y frames [start_frame, end_frame) de la ventana"""
+    word_index: int
+    confidence: float
+    start_frame: int
+    end_frame: int
+
+
+class SignSpotter:
+    """
+    Detector continuo de señas sobre un flujo de keypoints
+    """
+    
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        window: int = None,
+        stride: int = None,
+        threshold: float = None,
+        nms_frames: int = None,
+        min_hand_ratio: float = None,
+        batch_windows: int = None,
+        frames: int = None,
+    ):
+        """
+        Args:
+            predict_fn: (batch, frames, 1662) -> (batch, n_clases), p. ej. InferenceModel.predict_batch
+            window: Frames crudos por ventana (default: config.spotting.window)
+            stride: Frames entre ventanas consecutivas (default: config.spotting.stride)
+            threshold: Confianza mínima de un candidato (default: config.spotting.threshold)
+            nms_frames: Radio de la supresión de no-máximos (default: config.spotting.nms_frames)
+            min_hand_ratio: Fracción mínima de frames con manos para evaluar la ventana
+            batch_windows: Ventanas acumuladas antes de llamar al modelo (en `push`)
+            frames: Frames de entrada del modelo (default: config.model.frames)
+        """
+        settings = config.spotting
+        self.predict_fn = predict_fn
+        self.window = window or settings.window
+        self.stride = stride or settings.stride
+        self.threshold = settings.threshold if threshold is None else threshold
+        self.nms_frames = settings.nms_frames if nms_frames is None else nms_frames
+        self.min_hand_ratio = settings.min_hand_ratio if min_hand_ratio is None else min_hand_ratio
+        self.batch_windows = batch_windows or settings.batch_windows
+        self.frames = frames or config.model.frames
+        
+        self._buffer = np.zeros((self.window, KEYPOINTS_LENGTH), dtype=np.float32)
+        self._hands = np.zeros(self.window, dtype=bool)
+        self.reset()
+    
+    def reset(self):
+        """Descarta el flujo actual (conserva los buffers reservados)"""
+        self.frame_count = 0
+        self._pending = []          # (start_frame, ventana)
+        self._candidates = []       # SpottedSign sobre el umbral, en orden de fin
+        self._decided = set()       # candidatos ya emitidos o suprimidos
+    
+    # ==================== FLUJO ====================
+    
+    def push(self, keypoints: np.ndarray) -> List[SpottedSign]:
+        """
+        Agrega un frame (1662,)
+        
+        Returns:
+            List[SpottedSign]: Señas confirmadas con este frame (normalmente 0 o 1)
+        """
+        slot = self.frame_count % self.window
+        self._buffer[slot] = keypoints
+        self._hands[slot] = has_hands(self._buffer[slot])
+        self.frame_count += 1
+        
+        if self.frame_count >= self.window and (self.frame_count - self.window) % self.stride == 0:
+            if self._hands.mean() >= self.min_hand_ratio:
+                order = (np.arange(self.window) + self.frame_count) % self.window
+                self._pending.append((self.frame_count - self.window, self._buffer[order]))
+        
+        if len(self._pending) >= self.batch_windows:
+            self._evaluate_pending()
+        return self._confirm(self.frame_count)
+    
+    def flush(self) -> List[SpottedSign]:
+        """Evalúa lo pendiente y emite todos los candidatos restantes (fin del flujo)"""
+        self._evaluate_pending()
+        return self._confirm(None)
+    
+    def spot(self, sequence) -> List[SpottedSign]:
+        """
+        Detecta las señas de una secuencia completa (n, 1662) en un solo batch
+        
+        Reinicia el estado del detector.
+        """
+        sequence = np.asarray(sequence, dtype=np.float32)
+        self.reset()
+        hands = has_hands(sequence)
+        for start in range(0, len(sequence) - self.window + 1, self.stride):
+            if hands[start:start + self.window].mean() >= self.min_hand_ratio:
+                self._pending.append((start, sequence[start:start + self.window]))
+        self.frame_count = len(sequence)
+        return self.flush()
+    
+    # ==================== INFERENCIA Y NMS ====================
+    
+    def _evaluate_pending(self):
+        if not self._pending:
+            return
+        starts = [start for start, _ in self._pending]
+        windows = [window for _, window in self._pending]
+        self._pending = []
+        
+        batch = (np.stack(windows) if self.window == self.frames
+                 else normalize_keypoints_batch(windows, self.frames))
+        probabilities = np.asarray(self.predict_fn(batch))
+        word_indices = probabilities.argmax(axis=1)
+        confidences = probabilities[np.arange(len(probabilities)), word_indices]
+        
+        for start, word_index, confidence in zip(starts, word_indices, confidences):
+            if confidence >= self.threshold:
+                self._candidates.append(
+                    SpottedSign(int(word_index), float(confidence), start, start + self.window)
+                )
+    
+    def _confirm(self, frame_count) -> List[SpottedSign]:
+        """
+        Decide los candidatos que ya no pueden ser superados por una ventana futura
+        
+        Un candidato se emite si es el máximo local: ningún otro candidato a menos
+        de `nms_frames` tiene mayor confianza (en empate gana el anterior).
+        
+        Args:
+            frame_count: Frames vistos, o None para decidir todos (fin del flujo)
+        """
+        if frame_count is None:
+            frontier = float('inf')
+        else:
+            # Ventanas futuras o aún sin evaluar terminan desde aquí en adelante
+            frontier = min([frame_count + 1] + [start + self.window for start, _ in self._pending])
+        
+        emitted = []
+        for candidate in self._candidates:
+            if candidate in self._decided or frontier - candidate.end_frame < self.nms_frames:
+                continue
+            self._decided.add(candidate)
+            if all(_rank(candidate) >= _rank(other) for other in self._candidates
+                   if abs(candidate.end_frame - other.end_frame) < self.nms_frames):
+                emitted.append(candidate)
+        
+        # Los decididos solo influyen sobre candidatos a menos de nms_frames de los pendientes
+        keep_from = frontier - 2 * self.nms_frames
+        self._candidates = [c for c in self._candidates if c.end_frame > keep_from]
+        self._decided.intersection_update(self._candidates)
+        return emitted
+
+
+def _rank(sign: SpottedSign):
+    return (sign.confidence, -sign.end_frame)
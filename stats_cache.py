@@ -0,0 +1,231 @@
+"""
+stats_cache.py - Caché de lectura para las estadísticas del dashboard
+=====================================================================
+
+Las estadísticas (/dashboard, /api/user/stats, /api/system/stats) solo
+cambian al guardarse predicciones, así que se sirven desde caché y se
+invalidan al insertar:
+
+    cache.get_user(user_id, 'dashboard', compute)   # lee o calcula y guarda
+    cache.get_global('system', compute)
+    cache.invalidate(user_ids)                      # al insertar predicciones
+
+- Las claves se declaran al crear el caché (`user_keys`, `global_keys`):
+  invalidar un usuario borra todas sus claves y las globales sin tener que
+  listar el almacenamiento.
+- El almacenamiento usa la interfaz de Redis que hace falta (`get`,
+  `set(..., ex=segundos)`, `delete(*claves)`) con valores en bytes
+  (pickle), así que sirve `redis.Redis` o cualquier reemplazo compatible.
+  `MemoryCache` es el de por defecto: LRU acotado con expiración, en el
+  proceso (con varios procesos conviene Redis para que la invalidación
+  llegue a todos).
+- Si el almacenamiento falla se calcula igual y se cuenta en `errors`.
+- `ttl_s` acota además cuánto puede durar un valor calculado justo antes
+  de una inserción concurrente.
+
+Uso:
+    from stats_cache import StatsCache, create_cache_backend
+    
+    cache = StatsCache(create_cache_backend(), user_keys=('dashboard',), global_keys=('system',))
+    stats = cache.get_user(user.id, 'dashboard', lambda: get_user_stats(user.id))
+"""
+
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from config_manager import config
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('memory', 'redis')
+
+
+class MemoryCache:
+    """
+    Almacenamiento LRU en memoria con expiración, compatible con la parte
+    de la interfaz de Redis que usa StatsCache
+    """
+    
+    def __init__(self, max_entries: int = 10000, clock=time.monotonic):
+        """
+        Args:
+            max_entries: Entradas máximas; al superarlas se descarta la menos usada
+            clock: Reloj en segundos (inyectable en tests)
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()       # clave -> (valor, vence en)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, name: str):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._entries[name]
+                return None
+            self._entries.move_to_end(name)
+            return value
+    
+    def set(self, name: str, value: bytes, ex: float = None):
+        with self._lock:
+            self._entries[name] = (value, None if ex is None else self.clock() + ex)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+    
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._entries.pop(name, None) is not None for name in names)
+
+
+def create_cache_backend(backend: str = None, redis_url: str = None, max_entries: int = None):
+    """
+    Crea el almacenamiento del caché
+    
+    Args:
+        backend: 'memory' o 'redis' (default: config.cache.backend)
+        redis_url: URL de Redis (default: config.cache.redis_url o $REDIS_URL)
+        max_entries: Entradas de MemoryCache (default: config.cache.max_entries)
+    """
+    settings = config.cache
+    backend = backend or settings.backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend de caché desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    
+    if backend == 'redis':
+        import redis
+        return redis.Redis.from_url(redis_url or settings.redis_url or os.environ['REDIS_URL'])
+    return MemoryCache(max_entries or settings.max_entries)
+
+
+class StatsCache:
+    """
+    Caché de lectura (read-through) con claves por usuario y globales
+    """
+    
+    def __init__(
+        self,
+        backend=None,
+        user_keys: Iterable[str] = (),
+        global_keys: Iterable[str] = (),
+        ttl_s: float = None,
+        prefix: str = 'lsch:stats:',
+    ):
+        """
+        Args:
+            backend: Almacenamiento con get/set(ex=)/delete (default: create_cache_backend())
+            user_keys: Nombres de las claves por usuario
+            global_keys: Nombres de las claves globales (se invalidan con cualquier inserción)
+            ttl_s: Segundos de vida de cada valor (default: config.cache.ttl_s, 0 = sin expiración)
+            prefix: Prefijo de las claves en el almacenamiento
+        """
+        self.backend = backend if backend is not None else create_cache_backend()
+        self.user_keys = frozenset(user_keys)
+        self.global_keys = frozenset(global_keys)
+        # Segundos enteros: redis-py no acepta `ex` con decimales
+        ttl_s = config.cache.ttl_s if ttl_s is None else ttl_s
+        self.ttl_s = math.ceil(ttl_s) if ttl_s else None
+        self.prefix = prefix
+        
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._invalidations = 0
+    
+    # ==================== CLAVES ====================
+    
+    def user_key(self, user_id: Hashable, name: str) -> str:
+        if name not in self.user_keys:
+            raise ValueError(f"Clave de usuario no declarada: {name}")
+        return f"{self.prefix}user:{user_id}:{name}"
+    
+    def global_key(self, name: str) -> str:
+        if name not in self.global_keys:
+            raise ValueError(f"Clave global no declarada: {name}")
+        return f"{self.prefix}global:{name}"
+    
+    # ==================== LECTURA ====================
+    
+    def get_user(self, user_id: Hashable, name: str, compute: Callable[[], Any]):
+        """Valor `name` del usuario desde caché, o `compute()` guardado en caché"""
+        return self._get_or_compute(self.user_key(user_id, name), compute)
+    
+    def get_global(self, name: str, compute: Callable[[], Any]):
+        """Valor global `name` desde caché, o `compute()` guardado en caché"""
+        return self._get_or_compute(self.global_key(name), compute)
+    
+    def _get_or_compute(self, key: str, compute: Callable[[], Any]):
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Error leyendo caché {key}: {e}")
+            self._count('_errors')
+            cached = None
+        if cached is not None:
+            self._count('_hits')
+            return pickle.loads(cached)
+        
+        self._count('_misses')
+        value = compute()
+        try:
+            self.backend.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=self.ttl_s)
+        except Exception as e:
+            logger.warning(f"Error guardando caché {key}: {e}")
+            self._count('_errors')
+        return value
+    
+    # ==================== INVALIDACIÓN ====================
+    
+    def invalidate(self, user_ids: Iterable[Hashable] = ()):
+        """Borra las claves de los usuarios indicados y todas las globales"""
+        keys = [self.user_key(user_id, name) for user_id in set(user_ids) for name in sorted(self.user_keys)]
+        keys += [self.global_key(name) for name in sorted(self.global_keys)]
+        if not keys:
+            return
+        try:
+            self.backend.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Error invalidando caché: {e}")
+            self._count('_errors')
+            return
+        self._count('_invalidations')
+    
+    # ==================== MÉTRICAS ====================
+    
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def metrics(self) -> dict:
+        """
+        Métricas del caché
+        
+        Returns:
+            dict: backend, hits, misses, hit_ratio, errors, invalidations y
+                  entries (solo MemoryCache)
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'errors': self._errors,
+                'invalidations': self._invalidations,
+                'entries': len(self.backend) if isinstance(self.backend, MemoryCache) else None,
+            }
@@ -0,0 +1,269 @@
+"""
+streaming_model.py - Inferencia incremental del LSTM por sesión
+===============================================================
+
+El modelo recibe la seña normalizada a `frames` frames, y esa normalización
+depende del largo final del segmento: no se conoce hasta que la seña termina.
+Lo que sí se puede adelantar es la parte cara de la primera capa LSTM, la
+proyección de entrada `x_t @ W + b` (1662 -> 4 * unidades): es lineal en x_t y
+cada frame normalizado es una interpolación lineal de dos frames crudos, por
+lo que
+
+    proyección(normalize(kp)) == normalize(proyección(kp))
+
+Cada sesión guarda la proyección de cada frame al llegar (`KeypointStream.push`)
+y al cerrar el segmento solo resta normalizar esas proyecciones y correr las
+recurrencias pequeñas (64/128 unidades) y las capas densas, sin volver a
+multiplicar los 15 x 1662 keypoints. Las probabilidades en curso
+(`probabilities()`) están disponibles en cualquier momento con el mismo costo.
+
+Los pesos se extraen del `.keras` a NumPy; solo soporta la arquitectura de
+`model.get_model` (LSTM, Dropout, Dense).
+
+Uso:
+    from streaming_model import StreamingModel
+    
+    model = StreamingModel(config.get_model_path())
+    stream = model.new_stream()
+    stream.push(keypoints)                       # por frame
+    probabilities = stream.probabilities()       # (n_clases,)
+    
+    python streaming_model.py                    # paridad con el modelo batch en validación
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from config_manager import config
+from helpers import gather_lerp, resample_plan
+
+logger = logging.getLogger(__name__)
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+}
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _activation(layer) -> callable:
+    name = getattr(layer.activation, '__name__', str(layer.activation))
+    if name == 'softmax':
+        return _softmax
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Activación no soportada en streaming: {name} ({layer.name})")
+    return _ACTIVATIONS[name]
+
+
+class _LSTMWeights:
+    """Pesos de una capa keras.layers.LSTM (compuertas en orden i, f, c, o)"""
+    
+    def __init__(self, layer):
+        if getattr(layer.recurrent_activation, '__name__', '') != 'sigmoid':
+            raise ValueError(f"recurrent_activation no soportada en streaming ({layer.name})")
+        self.kernel, self.recurrent_kernel, self.bias = (w.astype(np.float32) for w in layer.get_weights())
+        self.units = self.recurrent_kernel.shape[0]
+        self.activation = _activation(layer)
+        self.return_sequences = layer.return_sequences
+    
+    def run(self, projections: np.ndarray) -> np.ndarray:
+        """
+        Corre la recurrencia sobre proyecciones de entrada ya calculadas
+        
+        Args:
+            projections: (T, 4 * units) = x_t @ kernel + bias
+        
+        Returns:
+            np.ndarray: (T, units) si return_sequences, si no (units,)
+        """
+        sigmoid, units = _ACTIVATIONS['sigmoid'], self.units
+        h = np.zeros(units, dtype=np.float32)
+        c = np.zeros(units, dtype=np.float32)
+        outputs = np.empty((len(projections), units), dtype=np.float32)
+        for t, projection in enumerate(projections):
+            z = projection + h @ self.recurrent_kernel
+            i = sigmoid(z[:units])
+            f = sigmoid(z[units:2 * units])
+            o = sigmoid(z[3 * units:])
+            c = f * c + i * self.activation(z[2 * units:3 * units])
+            h = o * self.activation(c)
+            outputs[t] = h
+        return outputs if self.return_sequences else h
+
+
+class StreamingModel:
+    """
+    Clasificador LSTM evaluado en NumPy, con la primera proyección incremental
+    """
+    
+    def __init__(self, model=None, frames: int = None):
+        """
+        Args:
+            model: Ruta al `.keras` o modelo ya cargado (default: config.get_model_path())
+            frames: Frames de la normalización (default: config.model.frames)
+        """
+        if model is None or isinstance(model, (str, Path)):
+            import tensorflow as tf
+            model = tf.keras.models.load_model(model or config.get_model_path(), compile=False)
+        
+        self.frames = frames or config.model.frames
+        self.layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind == 'LSTM':
+                self.layers.append(_LSTMWeights(layer))
+            elif kind == 'Dense':
+                kernel, bias = (w.astype(np.float32) for w in layer.get_weights())
+                self.layers.append((kernel, bias, _activation(layer)))
+            elif kind not in ('Dropout', 'InputLayer'):
+                raise ValueError(f"Capa no soportada en streaming: {kind} ({layer.name})")
+        
+        if not self.layers or not isinstance(self.layers[0], _LSTMWeights):
+            raise ValueError("El modelo debe comenzar con una capa LSTM")
+        self.input_kernel = self.layers[0].kernel
+        self.input_bias = self.layers[0].bias
+        self.n_classes = self.layers[-1][0].shape[-1]
+    
+    @property
+    def projection_size(self) -> int:
+        return self.input_kernel.shape[1]
+    
+    def project(self, keypoints: np.ndarray) -> np.ndarray:
+        """Proyección de entrada de la primera LSTM para uno o varios frames (..., 1662)"""
+        return np.asarray(keypoints, dtype=np.float32) @ self.input_kernel
+    
+    def predict_projections(self, projections: np.ndarray) -> np.ndarray:
+        """
+        Clasifica un segmento a partir de las proyecciones de sus frames crudos
+        
+        Args:
+            projections: (n, 4 * units) sin bias, n >= 1
+        
+        Returns:
+            np.ndarray: Probabilidades (n_clases,) float32
+        """
+        x = gather_lerp(projections, *resample_plan(len(projections), self.frames)) + self.input_bias
+        x = self.layers[0].run(x)
+        for layer in self.layers[1:]:
+            if isinstance(layer, _LSTMWeights):
+                x = layer.run(x @ layer.kernel + layer.bias)
+            else:
+                kernel, bias, activation = layer
+                x = activation(x @ kernel + bias)
+        return x
+    
+    def predict_sequence(self, keypoints) -> np.ndarray:
+        """Clasifica una secuencia cruda (n, 1662) completa"""
+        return self.predict_projections(self.project(keypoints))
+    
+    def new_stream(self, capacity: int = 64) -> 'KeypointStream':
+        """Crea el estado incremental de una sesión"""
+        return KeypointStream(self, capacity)
+
+
+class KeypointStream:
+    """
+    Estado incremental de una sesión: proyecciones de los frames del segmento actual
+    """
+    
+    def __init__(self, model: StreamingModel, capacity: int = 64):
+        self.model = model
+        self._projections = np.empty((capacity, model.projection_size), dtype=np.float32)
+        self._length = 0
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def push(self, keypoints: np.ndarray):
+        """Agrega un frame (1662,) al segmento"""
+        if self._length == len(self._projections):
+            grown = np.empty((2 * len(self._projections), self.model.projection_size), dtype=np.float32)
+            grown[:self._length] = self._projections[:self._length]
+            self._projections = grown
+        self._projections[self._length] = self.model.project(keypoints)
+        self._length += 1
+    
+    def probabilities(self, length: int = None) -> np.ndarray:
+        """
+        Probabilidades del segmento como si terminara ahora
+        
+        Args:
+            length: Usa solo los primeros `length` frames (p. ej. para descartar
+                    los frames de espera del final del segmento)
+        
+        Returns:
+            np.ndarray: Probabilidades (n_clases,) float32
+        """
+        length = self._length if length is None else min(length, self._length)
+        if length < 1:
+            raise ValueError("El segmento no tiene frames")
+        return self.model.predict_projections(self._projections[:length])
+    
+    def reset(self):
+        """Descarta el segmento actual (conserva el buffer reservado)"""
+        self._length = 0
+
+
+def streaming_parity_report(model_path=None) -> dict:
+    """
+    Compara StreamingModel con InferenceModel sobre las secuencias crudas de validación
+    
+    Returns:
+        dict: samples, accuracy de cada modo, acuerdo de argmax y máx |Δp|
+    """
+    from helpers import get_sequences_and_labels, normalize_keypoints
+    from inference_model import InferenceModel
+    from training_model import split_train_validation
+    
+    sequences, labels = get_sequences_and_labels(config.get_word_ids())
+    if len(sequences) == 0:
+        raise ValueError("No se encontraron datos. Ejecute create_keypoints.py primero.")
+    labels = np.asarray(labels, dtype=np.int32)
+    _, val_idx = split_train_validation(labels)
+    
+    batch_model = InferenceModel(model_path or config.get_model_path())
+    streaming = StreamingModel(batch_model.model)
+    
+    batch_hits = stream_hits = agreement = 0
+    max_abs_diff = 0.0
+    for i in val_idx:
+        expected = batch_model.predict_one(normalize_keypoints(sequences[i], streaming.frames))
+        stream = streaming.new_stream()
+        for keypoints in sequences[i]:
+            stream.push(keypoints)
+        predicted = stream.probabilities()
+        batch_hits += int(expected.argmax() == labels[i])
+        stream_hits += int(predicted.argmax() == labels[i])
+        agreement += int(expected.argmax() == predicted.argmax())
+        max_abs_diff = max(max_abs_diff, float(np.abs(expected - predicted).max()))
+    
+    samples = len(val_idx)
+    report = {
+        'samples': samples,
+        'batch_accuracy': batch_hits / samples,
+        'streaming_accuracy': stream_hits / samples,
+        'argmax_agreement': agreement / samples,
+        'max_abs_diff': max_abs_diff,
+    }
+    logger.info(f"Paridad streaming vs batch ({samples} muestras de validación):")
+    logger.info(f"  Accuracy batch:     {report['batch_accuracy'] * 100:.2f}%")
+    logger.info(f"  Accuracy streaming: {report['streaming_accuracy'] * 100:.2f}%")
+    logger.info(f"  Acuerdo argmax:     {report['argmax_agreement'] * 100:.2f}%")
+    logger.info(f"  Máx |Δp|:           {report['max_abs_diff']:.2e}")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    streaming_parity_report()
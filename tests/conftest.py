@@ -59,6 +59,7 @@ model:
   frames: 15
   keypoints_length: 1662
   min_length_frames: 5
+  max_length_frames: 60
   model_filename: "actions_15.keras"
 
 capture:
@@ -76,6 +77,21 @@ training:
 evaluation:
   confidence_threshold: 0.8
 
+inference:
+  max_batch_size: 32
+  max_wait_ms: 5
+  backend: "keras"
+  tflite_filename: "actions_15.tflite"
+
+spotting:
+  enabled: false
+  window: 15
+  stride: 3
+  threshold: 0.8
+  nms_frames: 12
+  min_hand_ratio: 0.5
+  batch_windows: 1
+
 network:
   lstm1_units: 64
   lstm1_l2: 0.01
@@ -124,10 +140,41 @@ server:
   port: 5000
   debug: true
   upload_folder: "tmp"
+  client_keypoints: true
+
+adaptive_rate:
+  target_latency_ms: 150
+  min_fps: 5
+  max_fps: 30
+  min_quality: 0.5
+  max_quality: 0.8
+  feedback_interval_s: 1.0
+
+persistence:
+  batch_size: 100
+  flush_interval_ms: 500
+  max_pending: 10000
+  max_retries: 5
+  retry_backoff_ms: 100
+
+cache:
+  backend: "memory"
+  redis_url: null
+  ttl_s: 60
+  max_entries: 10000
+
+history:
+  default_limit: 50
+  max_limit: 500
+  export_batch_size: 1000
 
 mediapipe:
   min_detection_confidence: 0.5
   min_tracking_confidence: 0.5
+  pool_size: 0
+  pool_min_size: 1
+  pool_idle_timeout_s: 300
+  pool_checkout_timeout_s: 2
 """
     
     with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False, encoding='utf-8') as f:
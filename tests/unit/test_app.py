@@ -0,0 +1,154 @@
+"""
+Tests de las rutas de web-app/backend/app.py (cliente de pruebas de Flask, SQLite temporal)
+"""
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("flask_socketio")
+mediapipe = pytest.importorskip("mediapipe")
+if not hasattr(mediapipe, 'solutions'):
+    pytest.skip("app.py requiere mediapipe.solutions", allow_module_level=True)
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'web-app' / 'backend'))
+
+
+@pytest.fixture(scope='module')
+def web(tmp_path_factory):
+    """app.py sobre una base SQLite temporal (DATABASE_URL se lee al importar)"""
+    previous = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp_path_factory.mktemp('app') / 'test.db'}"
+    try:
+        import app as web
+    finally:
+        if previous is None:
+            os.environ.pop('DATABASE_URL', None)
+        else:
+            os.environ['DATABASE_URL'] = previous
+    
+    from models import User, create_tables, db, insert_predictions
+    with web.app.app_context():
+        create_tables()
+        user = User(username='historial', email='historial@lsch.com')
+        user.set_password('test')
+        other = User(username='otro', email='otro@lsch.com')
+        other.set_password('test')
+        db.session.add_all([user, other])
+        db.session.commit()
+        # Timestamps empatados de a 4 para cortar páginas dentro de un mismo instante
+        insert_predictions([{
+            'user_id': user.id,
+            'word': ('HOLA', 'BIEN', 'MAL')[i % 3],
+            'word_id': 'test',
+            'confidence': 0.5 + (i % 50) / 100,
+            'session_id': 's1' if i < 60 else 's2',
+            'timestamp': datetime(2024, 1, 1) + timedelta(minutes=i // 4),
+        } for i in range(120)])
+        insert_predictions([{
+            'user_id': other.id, 'word': 'HOLA', 'word_id': 'test', 'confidence': 0.9,
+            'timestamp': datetime(2024, 1, 1),
+        }] * 5)
+    return web
+
+
+@pytest.fixture
+def client(web):
+    client = web.app.test_client()
+    client.post('/login', data={'username': 'historial', 'password': 'test'})
+    return client
+
+
+def get_all_pages(client, limit, **params):
+    predictions, cursor = [], None
+    while True:
+        query = dict(params, limit=limit, **({'cursor': cursor} if cursor else {}))
+        response = client.get('/api/user/predictions', query_string=query)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data['predictions']) <= limit
+        predictions += data['predictions']
+        cursor = data['next_cursor']
+        if cursor is None:
+            return predictions
+
+
+def get_ndjson(client, **params):
+    response = client.get('/api/user/predictions', query_string=dict(params, format='ndjson'))
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+class TestPredictionHistoryApi:
+    """Tests para /api/user/predictions"""
+    
+    def test_requires_login(self, web):
+        assert web.app.test_client().get('/api/user/predictions').status_code in (302, 401)
+    
+    @pytest.mark.parametrize("limit", [1, 3, 7, 50, 500])
+    def test_pages_across_tied_timestamps(self, client, limit):
+        """Recorrer todas las páginas entrega cada predicción una vez, en orden (timestamp, id) desc"""
+        predictions = get_all_pages(client, limit)
+        keys = [(p['timestamp'], p['id']) for p in predictions]
+        
+        assert len(predictions) == 120
+        assert len({p['id'] for p in predictions}) == 120
+        assert keys == sorted(keys, reverse=True)
+    
+    def test_word_and_date_filters(self, client):
+        predictions = get_all_pages(client, 4, word='BIEN', since='2024-01-01T00:05:00', until='2024-01-01T00:20:00')
+        
+        assert predictions
+        assert all(p['word'] == 'BIEN' for p in predictions)
+        assert all('2024-01-01T00:05:00' <= p['timestamp'] < '2024-01-01T00:20:00' for p in predictions)
+        # minutos 5 a 19: 60 predicciones, una de cada tres es BIEN
+        assert len(predictions) == 20
+    
+    def test_timezone_aware_dates(self, client):
+        """Fechas con zona se convierten a UTC, como se guardan los timestamps"""
+        naive = get_all_pages(client, 50, since='2024-01-01T00:10:00')
+        aware = get_all_pages(client, 50, since='2024-01-01T03:10:00+03:00')
+        assert [p['id'] for p in aware] == [p['id'] for p in naive]
+    
+    def test_confidence_and_session_filters(self, client):
+        predictions = get_all_pages(client, 10, min_confidence=0.7, max_confidence=0.8, session_id='s2')
+        
+        assert predictions
+        assert all(0.7 <= p['confidence'] <= 0.8 and p['session_id'] == 's2' for p in predictions)
+    
+    def test_ndjson_matches_pages(self, client):
+        """La exportación NDJSON coincide con el resultado paginado en JSON"""
+        assert get_ndjson(client) == get_all_pages(client, 7)
+        assert get_ndjson(client, word='MAL', since='2024-01-01T00:10:00') == \
+            get_all_pages(client, 3, word='MAL', since='2024-01-01T00:10:00')
+    
+    def test_ndjson_by_accept_header_and_from_cursor(self, client):
+        first = client.get('/api/user/predictions', query_string={'limit': 10}).get_json()
+        
+        response = client.get('/api/user/predictions', query_string={'cursor': first['next_cursor']},
+                              headers={'Accept': 'application/x-ndjson'})
+        
+        assert response.mimetype == 'application/x-ndjson'
+        rest = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert first['predictions'] + rest == get_ndjson(client)
+    
+    @pytest.mark.parametrize("params", [
+        {'cursor': 'no-es-un-cursor'},
+        {'cursor': 'WyJhIiwgMV0'},
+        {'limit': 0},
+        {'limit': 501},
+        {'limit': 'diez'},
+        {'min_confidence': 'alta'},
+        {'since': 'ayer'},
+    ])
+    def test_invalid_parameters(self, client, params):
+        """Cursor inválido, limit fuera de rango y filtros mal formados -> 400"""
+        response = client.get('/api/user/predictions', query_string=params)
+        
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
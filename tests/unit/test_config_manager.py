@@ -108,6 +108,15 @@ class TestConfigManager:
         assert "hola.h5" in str(path)
         assert "keypoints" in str(path)
     
+    def test_get_dataset_path(self, temp_config_file):
+        """Verifica el path del dataset columnar (con default si falta en el YAML)"""
+        config = ConfigManager(temp_config_file)
+        
+        path = config.get_dataset_path("hola")
+        assert isinstance(path, Path)
+        assert path.name == "hola"
+        assert path.parent == config.get_dataset_path()
+    
     def test_get_model_path(self, temp_config_file):
         """Verifica generación de path de modelo"""
         config = ConfigManager(temp_config_file)
@@ -117,6 +126,15 @@ class TestConfigManager:
         assert path.suffix == ".keras"
         assert "models" in str(path)
     
+    def test_get_inference_model_path(self, temp_config_file):
+        """Verifica el archivo de modelo de cada backend de inferencia"""
+        config = ConfigManager(temp_config_file)
+        
+        assert config.get_inference_model_path() == config.get_model_path()
+        path = config.get_inference_model_path('tflite')
+        assert path.name == "actions_15.tflite"
+        assert path.parent == config.get_model_path().parent
+    
     def test_get_word_labels_dict(self, temp_config_file):
         """Verifica obtención del diccionario completo"""
         config = ConfigManager(temp_config_file)
@@ -0,0 +1,57 @@
+"""
+Tests unitarios para frame_codec.py
+"""
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from frame_codec import decode_frame
+
+
+@pytest.fixture
+def frame():
+    y, x = np.mgrid[0:48, 0:64]
+    return np.stack([x * 4, y * 5, (x + y) * 2], axis=-1).astype(np.uint8)
+
+
+def encode(frame, ext):
+    return cv2.imencode(ext, frame)[1].tobytes()
+
+
+class TestDecodeFrame:
+    """Tests para decode_frame"""
+    
+    @pytest.mark.parametrize("ext", ['.jpg', '.png'])
+    def test_binary_roundtrip(self, frame, ext):
+        """Los bytes crudos se decodifican a BGR uint8 con el tamaño original"""
+        decoded = decode_frame(encode(frame, ext))
+        
+        assert decoded.shape == frame.shape
+        assert decoded.dtype == np.uint8
+        assert np.abs(decoded.astype(int) - frame).mean() < 3
+    
+    def test_binary_types_equivalent(self, frame):
+        """bytes, bytearray y memoryview dan el mismo frame"""
+        data = encode(frame, '.png')
+        
+        expected = decode_frame(data)
+        np.testing.assert_array_equal(decode_frame(bytearray(data)), expected)
+        np.testing.assert_array_equal(decode_frame(memoryview(data)), expected)
+    
+    def test_base64_matches_binary(self, frame):
+        """Data URL y base64 plano (legado) dan el mismo frame que el binario"""
+        data = encode(frame, '.jpg')
+        b64 = base64.b64encode(data).decode('ascii')
+        
+        expected = decode_frame(data)
+        np.testing.assert_array_equal(decode_frame('data:image/jpeg;base64,' + b64), expected)
+        np.testing.assert_array_equal(decode_frame(b64), expected)
+    
+    @pytest.mark.parametrize("payload", [b'no es una imagen', 'data:image/jpeg;base64,abc', None, 42,
+                                         b'', bytearray(), memoryview(b''), '', 'data:image/jpeg;base64,'])
+    def test_invalid_payload_raises(self, payload):
+        """Imágenes corruptas o vacías, base64 inválido o tipos no soportados -> ValueError"""
+        with pytest.raises(ValueError):
+            decode_frame(payload)
@@ -0,0 +1,175 @@
+"""
+Tests unitarios para frame_pipeline.py
+"""
+import threading
+import time
+
+import pytest
+
+from frame_pipeline import FramePipeline, PipelineStage
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise AssertionError("Condición no cumplida a tiempo")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def gate():
+    """Evento que bloquea la primera etapa hasta que el test lo libera"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def make_blocked_pipeline(gate, policy, queue_size=2, put_timeout=None, on_drop=None):
+    seen = []
+    
+    def first(key, item):
+        gate.wait()
+        return item
+    
+    pipeline = FramePipeline([
+        PipelineStage('first', first, queue_size=queue_size, policy=policy, put_timeout=put_timeout),
+        PipelineStage('collect', lambda key, item: seen.append(item)),
+    ], on_drop=on_drop)
+    pipeline.seen = seen
+    pipeline.start()
+    return pipeline
+
+
+class TestFramePipeline:
+    """Tests para FramePipeline"""
+    
+    def test_stages_run_in_order_per_key(self):
+        """Los items atraviesan las etapas y cada clave conserva su orden"""
+        results = {}
+        lock = threading.Lock()
+        
+        def collect(key, item):
+            with lock:
+                results.setdefault(key, []).append(item)
+        
+        pipeline = FramePipeline([
+            PipelineStage('double', lambda key, item: item * 2, workers=3),
+            PipelineStage('offset', lambda key, item: item + 1, workers=2),
+            PipelineStage('collect', collect, workers=2, queue_size=64),
+        ])
+        pipeline.start()
+        for i in range(50):
+            for key in ('a', 'b', 'c'):
+                assert pipeline.submit(key, i)
+        pipeline.stop(timeout=5)
+        
+        for key in ('a', 'b', 'c'):
+            assert results[key] == [2 * i + 1 for i in range(50)]
+        metrics = pipeline.metrics()
+        assert metrics['stages']['collect']['processed'] == 150
+        assert metrics['end_to_end_ms']['max'] > 0
+    
+    def test_none_stops_item(self):
+        """Si una etapa retorna None el item no sigue"""
+        seen = []
+        pipeline = FramePipeline([
+            PipelineStage('filter', lambda key, item: item if item % 2 else None),
+            PipelineStage('collect', lambda key, item: seen.append(item)),
+        ])
+        pipeline.start()
+        for i in range(10):
+            pipeline.submit('a', i)
+        pipeline.stop(timeout=5)
+        
+        assert seen == [1, 3, 5, 7, 9]
+    
+    def test_drop_oldest_keeps_latest(self, gate):
+        """drop_oldest descarta los items más viejos de la cola llena"""
+        dropped = []
+        pipeline = make_blocked_pipeline(gate, 'drop_oldest', on_drop=lambda stage, key, item: dropped.append(item))
+        pipeline.submit('a', 0)
+        wait_until(lambda: pipeline.metrics()['stages']['first']['queue_depth'] == 0)
+        for i in range(1, 6):
+            assert pipeline.submit('a', i)
+        gate.set()
+        pipeline.stop(timeout=5)
+        
+        assert pipeline.seen == [0, 4, 5]
+        assert dropped == [1, 2, 3]
+        assert pipeline.metrics()['stages']['first']['dropped'] == 3
+    
+    def test_drop_newest_rejects_submit(self, gate):
+        """drop_newest rechaza el item nuevo con la cola llena"""
+        pipeline = make_blocked_pipeline(gate, 'drop_newest')
+        pipeline.submit('a', 0)
+        wait_until(lambda: pipeline.metrics()['stages']['first']['queue_depth'] == 0)
+        accepted = [pipeline.submit('a', i) for i in range(1, 5)]
+        gate.set()
+        pipeline.stop(timeout=5)
+        
+        assert accepted == [True, True, False, False]
+        assert pipeline.seen == [0, 1, 2]
+    
+    def test_latest_keeps_one_pending_per_key(self, gate):
+        """latest reemplaza el item pendiente de la misma clave en su lugar de la fila"""
+        dropped = []
+        pipeline = make_blocked_pipeline(gate, 'latest', queue_size=4,
+                                         on_drop=lambda stage, key, item: dropped.append(item))
+        pipeline.submit('a', ('a', 0))
+        wait_until(lambda: pipeline.metrics()['stages']['first']['queue_depth'] == 0)
+        for i in range(1, 6):
+            pipeline.submit('a', ('a', i))
+            pipeline.submit('b', ('b', i))
+        assert pipeline.metrics()['stages']['first']['queue_depth'] == 2
+        gate.set()
+        pipeline.stop(timeout=5)
+        
+        assert pipeline.seen == [('a', 0), ('a', 5), ('b', 5)]
+        assert len(dropped) == 8
+    
+    def test_block_applies_backpressure(self, gate):
+        """block espera put_timeout y luego descarta"""
+        pipeline = make_blocked_pipeline(gate, 'block', queue_size=1, put_timeout=0.05)
+        pipeline.submit('a', 0)
+        wait_until(lambda: pipeline.metrics()['stages']['first']['queue_depth'] == 0)
+        assert pipeline.submit('a', 1)
+        
+        started = time.perf_counter()
+        assert not pipeline.submit('a', 2)
+        assert time.perf_counter() - started >= 0.04
+        gate.set()
+        pipeline.stop(timeout=5)
+        assert pipeline.seen == [0, 1]
+    
+    def test_stage_error_reported(self):
+        """Un error en una etapa se informa y el pipeline sigue"""
+        errors = []
+        seen = []
+        
+        def fragile(key, item):
+            if item == 1:
+                raise ValueError("frame corrupto")
+            return item
+        
+        pipeline = FramePipeline([
+            PipelineStage('fragile', fragile),
+            PipelineStage('collect', lambda key, item: seen.append(item)),
+        ], on_error=lambda stage, key, e: errors.append((stage, key, str(e))))
+        pipeline.start()
+        for i in range(3):
+            pipeline.submit('s1', i)
+        pipeline.stop(timeout=5)
+        
+        assert seen == [0, 2]
+        assert errors == [('fragile', 's1', 'frame corrupto')]
+        assert pipeline.metrics()['stages']['fragile']['errors'] == 1
+    
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            PipelineStage('x', lambda key, item: item, policy='lifo')
+    
+    def test_submit_requires_start(self):
+        pipeline = FramePipeline([PipelineStage('x', lambda key, item: item)])
+        with pytest.raises(RuntimeError):
+            pipeline.submit('a', 1)
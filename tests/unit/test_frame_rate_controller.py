@@ -0,0 +1,76 @@
+"""
+Tests unitarios para frame_rate_controller.py
+"""
+import pytest
+
+from frame_rate_controller import FrameRateController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def run_interval(rate, clock, received, processed, latency_ms, seconds=1.0):
+    """Simula un intervalo: `received` frames llegan, `processed` terminan con la latencia dada"""
+    for _ in range(received):
+        rate.received()
+    for _ in range(received - processed):
+        rate.dropped()
+    feedback = None
+    start = clock.now
+    for i in range(processed):
+        clock.now = start + seconds * (i + 1) / processed
+        feedback = rate.processed(latency_ms) or feedback
+    return feedback
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def rate(clock):
+    return FrameRateController(target_latency_ms=150, min_fps=5, max_fps=30,
+                               min_quality=0.5, max_quality=0.8, interval_s=1.0, clock=clock)
+
+
+class TestFrameRateController:
+    """Tests para FrameRateController"""
+    
+    def test_no_feedback_before_interval(self, rate, clock):
+        clock.now = 0.5
+        assert rate.processed(10) is None
+    
+    def test_overload_lowers_to_sustainable_rate(self, rate, clock):
+        """Con descartes la recomendación baja al 90% de lo procesado"""
+        feedback = run_interval(rate, clock, received=30, processed=12, latency_ms=300)
+        
+        assert feedback['fps'] == pytest.approx(0.9 * 12, abs=0.1)
+        assert feedback['jpeg_quality'] == pytest.approx(0.7)
+        assert feedback['drop_ratio'] == pytest.approx(18 / 30, abs=1e-3)
+        assert feedback['latency_ms'] == pytest.approx(300)
+    
+    def test_high_latency_without_drops_is_overload(self, rate, clock):
+        feedback = run_interval(rate, clock, received=20, processed=20, latency_ms=400)
+        assert feedback['fps'] < 20
+    
+    def test_recovers_additively_and_clamps(self, rate, clock):
+        """Sin sobrecarga sube de a fps_step hasta max_fps"""
+        run_interval(rate, clock, received=30, processed=6, latency_ms=500)
+        fps = [run_interval(rate, clock, received=10, processed=10, latency_ms=20)['fps'] for _ in range(20)]
+        
+        assert fps[1] - fps[0] == pytest.approx(2.0)
+        assert fps[-1] == 30
+        assert rate.quality == pytest.approx(0.8)
+    
+    def test_floor_limits(self, rate, clock):
+        """La recomendación no baja de min_fps ni min_quality"""
+        for _ in range(5):
+            feedback = run_interval(rate, clock, received=30, processed=1, latency_ms=2000)
+        assert feedback['fps'] == 5
+        assert feedback['jpeg_quality'] == 0.5
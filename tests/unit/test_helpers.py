@@ -8,13 +8,47 @@ from pathlib import Path
 
 from helpers import (
     extract_keypoints,
+    extract_keypoints_batch,
     create_folder,
     there_hand,
     mediapipe_detection,
-    get_keypoints
+    get_keypoints,
+    interpolate_keypoints,
+    normalize_keypoints,
+    normalize_keypoints_batch,
+    resample_plan,
+    gather_lerp,
 )
 
 
+def legacy_normalize_keypoints(keypoints, target_length=15):
+    """Implementación original de evaluate_model (bucle Python), como referencia"""
+    current_length = len(keypoints)
+    if current_length < target_length:
+        indices = np.linspace(0, current_length - 1, target_length)
+        interpolated_keypoints = []
+        for i in indices:
+            lower_idx = int(np.floor(i))
+            upper_idx = int(np.ceil(i))
+            weight = i - lower_idx
+            if lower_idx == upper_idx:
+                interpolated_keypoints.append(keypoints[lower_idx])
+            else:
+                # Pesos en float32 como en NumPy 1.x (casting por valor del escalar)
+                interpolated_point = (
+                    np.float32(1 - weight) * np.array(keypoints[lower_idx])
+                    + np.float32(weight) * np.array(keypoints[upper_idx])
+                )
+                interpolated_keypoints.append(interpolated_point.tolist())
+        return interpolated_keypoints
+    elif current_length > target_length:
+        step = current_length / target_length
+        indices = np.arange(0, current_length, step).astype(int)[:target_length]
+        return [keypoints[i] for i in indices]
+    else:
+        return keypoints
+
+
 class TestExtractKeypoints:
     """Tests para extract_keypoints()"""
     
@@ -59,6 +93,130 @@ class TestExtractKeypoints:
         assert np.all(keypoints <= 1), "All keypoints should be <= 1"
 
 
+    def test_extract_keypoints_layout(self, mock_mediapipe_results):
+        """Verifica el orden pose/face/manos y la visibilidad solo en pose"""
+        mock_mediapipe_results.pose_landmarks.landmark[0].visibility = 0.25
+        mock_mediapipe_results.right_hand_landmarks.landmark[-1].z = 0.75
+        keypoints = extract_keypoints(mock_mediapipe_results)
+        
+        assert keypoints[3] == 0.25
+        assert keypoints[-1] == 0.75
+    
+    def test_extract_keypoints_into_buffer(self, mock_mediapipe_results):
+        """Verifica que escribe en el buffer entregado sin crear otro"""
+        out = np.full(1662, -1.0, dtype=np.float32)
+        keypoints = extract_keypoints(mock_mediapipe_results, out=out)
+        
+        assert keypoints is out
+        assert np.array_equal(out, extract_keypoints(mock_mediapipe_results))
+    
+    def test_extract_keypoints_reused_buffer_clears_missing(self, mock_mediapipe_results):
+        """Verifica que un buffer reutilizado no conserva manos de un frame anterior"""
+        out = np.empty(1662, dtype=np.float32)
+        extract_keypoints(mock_mediapipe_results, out=out)
+        mock_mediapipe_results.left_hand_landmarks = None
+        extract_keypoints(mock_mediapipe_results, out=out)
+        
+        assert np.all(out[1536:1599] == 0)
+    
+    def test_extract_keypoints_invalid_buffer(self, mock_mediapipe_results):
+        """Verifica que rechaza buffers con shape o dtype incorrecto"""
+        with pytest.raises(ValueError):
+            extract_keypoints(mock_mediapipe_results, out=np.empty(1662, dtype=np.float64))
+        with pytest.raises(ValueError):
+            extract_keypoints(mock_mediapipe_results, out=np.empty(100, dtype=np.float32))
+    
+    def test_extract_keypoints_rejects_wrong_landmark_count(self, mock_mediapipe_results):
+        """Verifica que una cara refinada (478) o una mano de más no pisa otros tramos"""
+        landmarks = mock_mediapipe_results.face_landmarks.landmark
+        mock_mediapipe_results.face_landmarks.landmark = landmarks + landmarks[:10]
+        with pytest.raises(ValueError):
+            extract_keypoints(mock_mediapipe_results)
+        
+        mock_mediapipe_results.face_landmarks.landmark = landmarks
+        hand = mock_mediapipe_results.right_hand_landmarks.landmark
+        mock_mediapipe_results.right_hand_landmarks.landmark = hand + hand[:1]
+        with pytest.raises(ValueError):
+            extract_keypoints(mock_mediapipe_results)
+
+
+class TestExtractKeypointsBatch:
+    """Tests para extract_keypoints_batch()"""
+    
+    def test_batch_matches_single(self, mock_mediapipe_results):
+        """Verifica que cada fila coincide con la extracción individual"""
+        batch = extract_keypoints_batch([mock_mediapipe_results] * 4)
+        
+        assert batch.shape == (4, 1662)
+        assert batch.dtype == np.float32
+        assert np.array_equal(batch[2], extract_keypoints(mock_mediapipe_results))
+    
+    def test_batch_into_buffer(self, mock_mediapipe_results):
+        """Verifica que llena el buffer (N, 1662) entregado"""
+        out = np.zeros((3, 1662), dtype=np.float32)
+        batch = extract_keypoints_batch([mock_mediapipe_results] * 3, out=out)
+        
+        assert batch is out
+        assert np.all(out[:, 132:] == 0.5)
+    
+    def test_batch_empty(self):
+        """Verifica comportamiento con lista vacía"""
+        assert extract_keypoints_batch([]).shape == (0, 1662)
+
+
+class TestNormalizeKeypoints:
+    """Tests para normalize_keypoints() y normalize_keypoints_batch()"""
+    
+    @pytest.mark.parametrize("n_frames", [1, 2, 5, 7, 14, 15, 16, 22, 29, 31, 45, 100])
+    def test_bit_compatible_with_legacy(self, n_frames):
+        """Verifica igualdad bit a bit con la implementación original"""
+        kp_seq = list(np.random.default_rng(n_frames).random((n_frames, 1662), dtype=np.float32))
+        
+        expected = np.array(legacy_normalize_keypoints(kp_seq, 15), dtype=np.float32)
+        result = normalize_keypoints(kp_seq, 15)
+        
+        assert result.shape == (15, 1662)
+        assert result.dtype == np.float32
+        assert result.flags.c_contiguous
+        assert np.array_equal(result, expected)
+    
+    def test_does_not_alias_input(self):
+        """Verifica que la salida no comparte memoria con la entrada"""
+        kp_seq = np.random.rand(15, 1662).astype(np.float32)
+        assert not np.shares_memory(normalize_keypoints(kp_seq), kp_seq)
+    
+    def test_interpolate_downsamples_with_linspace(self):
+        """Verifica que interpolate_keypoints usa linspace también al reducir"""
+        kp_seq = np.arange(30, dtype=np.float32).reshape(30, 1)
+        result = interpolate_keypoints(kp_seq, 15)
+        assert np.allclose(result[:, 0], np.linspace(0, 29, 15))
+    
+    def test_batch_matches_single(self):
+        """Verifica que el lote coincide con normalizar cada secuencia"""
+        rng = np.random.default_rng(0)
+        sequences = [rng.random((n, 1662), dtype=np.float32) for n in (5, 15, 40, 9)]
+        
+        result = normalize_keypoints_batch(sequences, 15)
+        
+        assert result.shape == (4, 15, 1662)
+        assert result.flags.c_contiguous
+        for seq, normalized in zip(sequences, result):
+            assert np.array_equal(normalized, normalize_keypoints(seq, 15))
+    
+    def test_plan_applies_to_any_columns(self):
+        """Verifica que resample_plan + gather_lerp sobre otras columnas equivale a normalizar"""
+        kp_seq = np.random.default_rng(1).random((9, 1662), dtype=np.float32)
+        plan = resample_plan(len(kp_seq), 15)
+        
+        assert np.array_equal(gather_lerp(kp_seq, *plan), normalize_keypoints(kp_seq, 15))
+        assert np.array_equal(gather_lerp(kp_seq[:, :8], *plan), normalize_keypoints(kp_seq, 15)[:, :8])
+    
+    def test_empty_sequence(self):
+        """Verifica que una secuencia vacía se rechaza"""
+        with pytest.raises(ValueError):
+            normalize_keypoints([], 15)
+
+
 class TestCreateFolder:
     """Tests para create_folder()"""
     
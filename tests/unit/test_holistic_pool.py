@@ -0,0 +1,265 @@
+"""
+Tests unitarios para holistic_pool.py
+"""
+import threading
+import time
+
+import pytest
+
+from holistic_pool import HolisticPool
+
+
+class FakeHolistic:
+    """Instancia falsa: cuenta resets, cierres y procesos concurrentes"""
+    
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+    
+    def __init__(self):
+        self.resets = 0
+        self.closed = False
+    
+    def reset(self):
+        self.resets += 1
+    
+    def close(self):
+        self.closed = True
+    
+    def process(self, delay=0.02):
+        with FakeHolistic.lock:
+            FakeHolistic.active += 1
+            FakeHolistic.max_active = max(FakeHolistic.max_active, FakeHolistic.active)
+        time.sleep(delay)
+        with FakeHolistic.lock:
+            FakeHolistic.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    FakeHolistic.active = FakeHolistic.max_active = 0
+
+
+def make_pool(**kwargs):
+    kwargs.setdefault('max_size', 2)
+    kwargs.setdefault('min_size', 0)
+    kwargs.setdefault('idle_timeout_s', 60)
+    return HolisticPool(FakeHolistic, **kwargs)
+
+
+class TestHolisticPool:
+    """Tests para HolisticPool"""
+    
+    def test_session_affinity(self):
+        """Cada sesión recibe siempre su instancia, sin reinicios"""
+        pool = make_pool()
+        with pool.checkout('a') as first:
+            pass
+        with pool.checkout('b') as other:
+            pass
+        with pool.checkout('a') as again:
+            pass
+        
+        assert again is first
+        assert other is not first
+        assert first.resets == 0
+        assert pool.metrics()['sessions'] == 2
+    
+    def test_reassignment_resets_tracking(self):
+        """Sin cupo, la instancia de la sesión inactiva más antigua se reinicia y se reasigna"""
+        pool = make_pool(max_size=1)
+        with pool.checkout('a') as instance_a:
+            pass
+        with pool.checkout('b') as instance_b:
+            pass
+        
+        assert instance_b is instance_a
+        assert instance_a.resets == 1
+        assert pool.metrics()['reassigned'] == 1
+    
+    def test_release_session_frees_instance(self):
+        """Una sesión liberada deja su instancia reiniciada para la siguiente"""
+        pool = make_pool(max_size=2)
+        with pool.checkout('a') as instance_a:
+            pass
+        pool.release_session('a')
+        with pool.checkout('b') as instance_b:
+            pass
+        
+        assert instance_b is instance_a
+        assert len(pool) == 1
+        assert instance_a.resets == 1
+    
+    def test_release_session_while_busy_resets(self):
+        """Liberar la sesión con su frame en curso reinicia la instancia al devolverla"""
+        pool = make_pool(max_size=1)
+        with pool.checkout('a') as first:
+            pool.release_session('a')
+            assert first.resets == 0
+        with pool.checkout('a') as again:
+            pass
+        
+        assert again is first
+        assert first.resets == 1
+        assert pool.metrics()['sessions'] == 1
+    
+    def test_release_session_while_busy_reset_error_discards(self):
+        """Si ese reset falla, la instancia se cierra en vez de volver al pool"""
+        pool = make_pool(max_size=1)
+        with pool.checkout('a') as first:
+            first.reset = lambda: 1 / 0
+            pool.release_session('a')
+        
+        assert first.closed
+        assert len(pool) == 0
+        with pool.checkout('a') as again:
+            pass
+        assert again is not first
+    
+    @pytest.mark.parametrize("via", ["reassign", "release_session"])
+    def test_reset_runs_outside_lock(self, via):
+        """Un reset lento no bloquea el checkout de otras sesiones"""
+        pool = make_pool(max_size=2)
+        with pool.checkout('a') as slow:
+            pass
+        with pool.checkout('b'):
+            pass
+        resetting, other_done = threading.Event(), threading.Event()
+        
+        def slow_reset():
+            resetting.set()
+            other_done.wait(2)
+        
+        def checkout_c():
+            # Sin cupo: toma la instancia de 'a', la inactiva más antigua
+            with pool.checkout('c'):
+                pass
+        
+        slow.reset = slow_reset
+        if via == 'reassign':
+            worker = threading.Thread(target=checkout_c)
+        else:
+            worker = threading.Thread(target=pool.release_session, args=('a',))
+        worker.start()
+        assert resetting.wait(2)
+        
+        started = time.perf_counter()
+        with pool.checkout('b'):
+            pass
+        other_done.set()
+        worker.join(2)
+        
+        assert time.perf_counter() - started < 1
+    
+    def test_reset_error_frees_instance(self):
+        """Si el reset falla, el error se propaga y la instancia queda libre sin dueño"""
+        pool = make_pool(max_size=1)
+        with pool.checkout('a') as instance:
+            pass
+        instance.reset = lambda: 1 / 0
+        
+        with pytest.raises(ZeroDivisionError):
+            with pool.checkout('b'):
+                pass
+        
+        assert pool.metrics()['busy'] == 0
+        assert pool.metrics()['sessions'] == 0
+        with pool.checkout('b', timeout=1) as again:
+            assert again is instance
+    
+    def test_concurrency_bounded_by_max_size(self):
+        """Sesiones concurrentes procesan en paralelo hasta max_size instancias"""
+        pool = make_pool(max_size=3)
+        
+        def session(sid):
+            for _ in range(3):
+                with pool.checkout(sid) as holistic:
+                    holistic.process()
+        
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        metrics = pool.metrics()
+        assert FakeHolistic.max_active == 3
+        assert metrics['size'] == 3
+        assert metrics['checkouts'] == 18
+        assert metrics['busy'] == 0
+        assert 0 < metrics['utilization'] <= 1
+    
+    def test_timeout_when_exhausted(self):
+        """Sin instancias libres, checkout con timeout lanza TimeoutError"""
+        pool = make_pool(max_size=1)
+        with pool.checkout('a'):
+            with pytest.raises(TimeoutError):
+                with pool.checkout('b', timeout=0.05):
+                    pass
+        assert pool.metrics()['timeouts'] == 1
+    
+    def test_evicts_idle_instances(self):
+        """Las instancias inactivas se cierran respetando min_size"""
+        pool = make_pool(max_size=3, min_size=1, idle_timeout_s=0.1)
+        instances = []
+        for sid in 'abc':
+            with pool.checkout(sid) as instance:
+                instances.append(instance)
+        assert len(pool) == 3
+        time.sleep(0.15)
+        
+        assert pool.evict_idle() == 2
+        assert len(pool) == 1
+        assert sum(instance.closed for instance in instances) == 2
+        assert pool.metrics()['sessions'] == 1
+    
+    @pytest.mark.parametrize("via", ["evict_idle", "release"])
+    def test_close_runs_outside_lock(self, via):
+        """Cerrar una instancia vencida no bloquea el checkout de otras sesiones"""
+        pool = make_pool(max_size=2, min_size=1, idle_timeout_s=0.1)
+        with pool.checkout('a') as slow:
+            pass
+        with pool.checkout('b'):
+            pass
+        time.sleep(0.15)
+        closing, other_done = threading.Event(), threading.Event()
+        
+        def slow_close():
+            closing.set()
+            other_done.wait(2)
+        
+        def checkout_b():
+            # Al liberar 'b' se desaloja 'a', la inactiva más antigua
+            with pool.checkout('b'):
+                pass
+        
+        slow.close = slow_close
+        worker = threading.Thread(target=pool.evict_idle if via == 'evict_idle' else checkout_b)
+        worker.start()
+        assert closing.wait(2)
+        
+        started = time.perf_counter()
+        with pool.checkout('b'):
+            pass
+        other_done.set()
+        worker.join(2)
+        
+        assert time.perf_counter() - started < 1
+        assert len(pool) == 1
+    
+    def test_factory_error_releases_capacity(self):
+        """Si la creación falla, el cupo reservado se libera"""
+        calls = []
+        
+        def failing_factory():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("sin modelo")
+            return FakeHolistic()
+        
+        pool = HolisticPool(failing_factory, max_size=1, min_size=0, idle_timeout_s=60)
+        with pytest.raises(RuntimeError):
+            with pool.checkout('a'):
+                pass
+        with pool.checkout('a', timeout=1) as instance:
+            assert isinstance(instance, FakeHolistic)
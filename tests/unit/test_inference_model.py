@@ -0,0 +1,63 @@
+"""
+Tests unitarios para inference_model.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+
+from inference_model import InferenceModel
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    """LSTM pequeño con la misma interfaz que el modelo real"""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(15, 12)),
+        tf.keras.layers.LSTM(8),
+        tf.keras.layers.Dense(4, activation='softmax'),
+    ])
+    return model
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(0).random((5, 15, 12), dtype=np.float32)
+
+
+class TestInferenceModel:
+    """Tests para InferenceModel"""
+    
+    def test_matches_keras_predict(self, keras_model, batch):
+        """Verifica que coincide con model.predict"""
+        model = InferenceModel(keras_model)
+        expected = keras_model.predict(batch, verbose=0)
+        
+        assert np.allclose(model.predict_batch(batch), expected, atol=1e-6)
+        assert np.allclose(model.predict_one(batch[2]), expected[2], atol=1e-6)
+    
+    def test_single_trace_for_any_batch_size(self, keras_model, batch):
+        """Verifica que la firma fija evita retrazar por tamaño de batch"""
+        model = InferenceModel(keras_model)
+        for size in (1, 3, 5):
+            model.predict_batch(batch[:size])
+        
+        assert model._forward.experimental_get_tracing_count() == 1
+    
+    def test_rejects_wrong_shape(self, keras_model):
+        """Verifica que se rechazan entradas con otra cantidad de frames"""
+        model = InferenceModel(keras_model, warmup=False)
+        with pytest.raises(ValueError):
+            model.predict_one(np.zeros((10, 12), dtype=np.float32))
+    
+    def test_load_from_path(self, keras_model, batch, tmp_path):
+        """Verifica la carga desde un archivo .keras"""
+        path = tmp_path / "model.keras"
+        keras_model.save(path)
+        
+        model = InferenceModel(path)
+        
+        assert model.input_shape == (15, 12)
+        assert model.n_classes == 4
+        assert np.allclose(model.predict_batch(batch), keras_model.predict(batch, verbose=0), atol=1e-6)
@@ -0,0 +1,138 @@
+"""
+Tests unitarios para inference_server.py
+"""
+import threading
+import time
+
+import pytest
+import numpy as np
+
+import inference_server as server_module
+from inference_server import BatchInferenceServer
+
+
+def row_sums(batch):
+    """Modelo falso: una 'probabilidad' por secuencia igual a la suma de sus valores"""
+    return batch.sum(axis=(1, 2))[:, None]
+
+
+@pytest.fixture
+def server():
+    batch_sizes = []
+    
+    def predict_fn(batch):
+        batch_sizes.append(len(batch))
+        time.sleep(0.02)
+        return row_sums(batch)
+    
+    server = BatchInferenceServer(predict_fn, max_batch_size=8, max_wait_ms=20)
+    server.batch_sizes = batch_sizes
+    server.start()
+    yield server
+    server.stop(timeout=5)
+
+
+class TestBatchInferenceServer:
+    """Tests para BatchInferenceServer"""
+    
+    def test_predict_single(self, server):
+        """Verifica una predicción aislada"""
+        sequence = np.full((15, 4), 0.5, dtype=np.float32)
+        assert server.predict(sequence, timeout=5)[0] == pytest.approx(30.0)
+    
+    def test_coalesces_concurrent_requests(self, server):
+        """Verifica que peticiones concurrentes se agrupan y cada una recibe su fila"""
+        sequences = [np.full((15, 4), i, dtype=np.float32) for i in range(20)]
+        futures = [None] * len(sequences)
+        
+        def submit(i):
+            futures[i] = server.submit(sequences[i])
+        
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(sequences))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for i, future in enumerate(futures):
+            assert future.result(timeout=5)[0] == pytest.approx(i * 60)
+        assert max(server.batch_sizes) > 1
+        assert max(server.batch_sizes) <= 8
+        assert sum(server.batch_sizes) == 20
+    
+    def test_metrics(self, server):
+        """Verifica histograma de batches y latencias"""
+        for _ in range(3):
+            server.predict(np.zeros((15, 4), dtype=np.float32), timeout=5)
+        
+        metrics = server.metrics()
+        assert metrics['requests'] == 3
+        assert metrics['queue_depth'] == 0
+        assert sum(size * count for size, count in metrics['batch_size_histogram'].items()) == 3
+        assert metrics['latency_ms']['p50'] >= 20
+        assert metrics['latency_ms']['p99'] >= metrics['latency_ms']['p50']
+    
+    def test_error_propagates_to_futures(self):
+        """Verifica que un error del modelo llega a cada petición del batch"""
+        def failing(batch):
+            raise RuntimeError("fallo del modelo")
+        
+        server = BatchInferenceServer(failing)
+        server.start()
+        try:
+            with pytest.raises(RuntimeError, match="fallo del modelo"):
+                server.predict(np.zeros((15, 4), dtype=np.float32), timeout=5)
+            assert server.metrics()['errors'] == 1
+        finally:
+            server.stop(timeout=5)
+    
+    def test_submit_requires_start(self):
+        """Verifica que no se aceptan peticiones sin iniciar el servidor"""
+        server = BatchInferenceServer(row_sums)
+        with pytest.raises(RuntimeError):
+            server.submit(np.zeros((15, 4), dtype=np.float32))
+    
+    def test_submit_during_stop(self):
+        """Durante stop() no se aceptan peticiones y las ya aceptadas se resuelven"""
+        release = threading.Event()
+        
+        def blocked(batch):
+            release.wait(5)
+            return row_sums(batch)
+        
+        server = BatchInferenceServer(blocked, max_batch_size=1)
+        server.start()
+        accepted = [server.submit(np.ones((15, 4), dtype=np.float32))]
+        stopper = threading.Thread(target=server.stop, args=(5,))
+        stopper.start()
+        
+        deadline = time.perf_counter() + 2
+        with pytest.raises(RuntimeError):
+            while time.perf_counter() < deadline:
+                accepted.append(server.submit(np.ones((15, 4), dtype=np.float32)))
+        release.set()
+        stopper.join(5)
+        
+        assert not stopper.is_alive()
+        assert all(future.result(timeout=1)[0] == pytest.approx(60.0) for future in accepted)
+    
+    def test_stop_fails_requests_left_in_queue(self):
+        """Las peticiones que el hilo no llegó a tomar se resuelven con error"""
+        release = threading.Event()
+        
+        def blocked(batch):
+            release.wait(5)
+            return row_sums(batch)
+        
+        server = BatchInferenceServer(blocked, max_batch_size=1)
+        server.start()
+        first = server.submit(np.ones((15, 4), dtype=np.float32))
+        # Un _STOP previo deja la siguiente petición detrás del fin del hilo
+        server._queue.put(server_module._STOP)
+        leftover = server.submit(np.ones((15, 4), dtype=np.float32))
+        release.set()
+        server.stop(timeout=5)
+        
+        assert first.result(timeout=1)[0] == pytest.approx(60.0)
+        with pytest.raises(RuntimeError, match="se detuvo"):
+            leftover.result(timeout=1)
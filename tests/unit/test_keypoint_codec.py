@@ -0,0 +1,86 @@
+"""
+Tests unitarios para keypoint_codec.py
+"""
+import numpy as np
+import pytest
+
+from helpers import FACE_SLICE, KEYPOINTS_LENGTH, LEFT_HAND_SLICE, POSE_SLICE, RIGHT_HAND_SLICE
+from keypoint_codec import HEADER, decode_keypoints, encode_keypoints
+
+
+@pytest.fixture
+def keypoints():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-0.5, 1.5, KEYPOINTS_LENGTH).astype(np.float32)
+
+
+class TestKeypointCodec:
+    """Tests para encode_keypoints / decode_keypoints"""
+    
+    def test_float32_roundtrip_exact(self, keypoints):
+        """float32 completo reproduce exactamente el vector de extract_keypoints"""
+        message = encode_keypoints(keypoints, dtype='float32')
+        
+        assert len(message) == HEADER.size + KEYPOINTS_LENGTH * 4
+        np.testing.assert_array_equal(decode_keypoints(message), keypoints)
+    
+    def test_float16_roundtrip_precision(self, keypoints):
+        """float16 pierde menos de 1e-3 en coordenadas normalizadas"""
+        message = encode_keypoints(keypoints, dtype='float16')
+        decoded = decode_keypoints(message)
+        
+        assert len(message) == HEADER.size + KEYPOINTS_LENGTH * 2
+        assert decoded.dtype == np.float32
+        assert np.abs(decoded - keypoints).max() < 1e-3
+    
+    def test_pose_hands_layout_zeroes_face(self, keypoints):
+        """El layout pose + manos conserva pose y manos y deja el rostro en ceros"""
+        decoded = decode_keypoints(encode_keypoints(keypoints, dtype='float32', layout='pose_hands'))
+        
+        for part in (POSE_SLICE, LEFT_HAND_SLICE, RIGHT_HAND_SLICE):
+            np.testing.assert_array_equal(decoded[part], keypoints[part])
+        assert not decoded[FACE_SLICE].any()
+    
+    def test_decode_into_buffer(self, keypoints):
+        """`out` se sobrescribe por completo, incluido el rostro omitido"""
+        out = np.full(KEYPOINTS_LENGTH, 7.0, dtype=np.float32)
+        result = decode_keypoints(encode_keypoints(keypoints, layout='pose_hands'), out=out)
+        
+        assert result is out
+        assert not out[FACE_SLICE].any()
+    
+    def test_wrong_shape_rejected_on_encode(self):
+        with pytest.raises(ValueError):
+            encode_keypoints(np.zeros(258, dtype=np.float32))
+
+
+class TestKeypointValidation:
+    """Mensajes inválidos -> ValueError"""
+    
+    @staticmethod
+    def tamper(message, offset, value):
+        data = bytearray(message)
+        data[offset] = value
+        return bytes(data)
+    
+    def test_rejects_bad_header_fields(self, keypoints):
+        message = encode_keypoints(keypoints)
+        for offset, value in [(0, ord('X')), (2, 2), (3, 9), (4, 9), (6, 0)]:
+            with pytest.raises(ValueError):
+                decode_keypoints(self.tamper(message, offset, value))
+    
+    def test_rejects_wrong_length(self, keypoints):
+        message = encode_keypoints(keypoints)
+        for bad in (message[:HEADER.size - 1], message[:-2], message + b'\0\0'):
+            with pytest.raises(ValueError):
+                decode_keypoints(bad)
+    
+    def test_rejects_non_finite(self, keypoints):
+        keypoints[10] = np.nan
+        with pytest.raises(ValueError, match="NaN"):
+            decode_keypoints(encode_keypoints(keypoints, dtype='float32'))
+    
+    @pytest.mark.parametrize("payload", [None, "KP", [1, 2, 3]])
+    def test_rejects_non_binary(self, payload):
+        with pytest.raises(ValueError):
+            decode_keypoints(payload)
@@ -0,0 +1,169 @@
+"""
+Tests unitarios para keypoints_augmentation.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+
+from helpers import POSE_SLICE, FACE_SLICE, LEFT_HAND_SLICE, RIGHT_HAND_SLICE
+from config_manager import config
+from keypoints_augmentation import (
+    mirror,
+    mirror_class_map,
+    affine,
+    time_warp,
+    frame_dropout,
+    jitter,
+    augment_keypoints,
+    augment_batch,
+)
+
+
+@pytest.fixture
+def batch():
+    """Batch (2, 15, 1662) con padding inicial y mano derecha no detectada"""
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0.1, 0.9, (2, 15, 1662)).astype(np.float32)
+    data[:, :3] = 0
+    data[:, :, RIGHT_HAND_SLICE] = 0
+    return data
+
+
+class TestMirror:
+    """Tests para mirror()"""
+    
+    def test_swaps_hands_and_flips_x(self, batch):
+        """Verifica el intercambio de manos y x -> 1 - x"""
+        result = mirror(batch).numpy()
+        
+        assert np.all(result[:, :, LEFT_HAND_SLICE] == 0)
+        assert np.allclose(result[:, 3:, RIGHT_HAND_SLICE][..., 0::3], 1 - batch[:, 3:, LEFT_HAND_SLICE][..., 0::3])
+        assert np.array_equal(result[:, 3:, RIGHT_HAND_SLICE][..., 1::3], batch[:, 3:, LEFT_HAND_SLICE][..., 1::3])
+        # Hombros 11 <-> 12, visibility intacta
+        assert np.allclose(result[:, 3:, 11 * 4], 1 - batch[:, 3:, 12 * 4])
+        assert np.array_equal(result[:, 3:, 11 * 4 + 3], batch[:, 3:, 12 * 4 + 3])
+    
+    def test_twice_is_identity(self, batch):
+        """Verifica que espejar dos veces recupera la muestra"""
+        assert np.allclose(mirror(mirror(batch)).numpy(), batch, atol=1e-6)
+    
+    def test_prob_zero(self, batch):
+        """Verifica que prob=0 no modifica la muestra"""
+        assert np.array_equal(mirror(batch, prob=0.0).numpy(), batch)
+    
+    def test_class_map(self):
+        """Verifica que solo los pares de clases ligadas a una mano se intercambian"""
+        class_map = mirror_class_map(['a', 'b-der', 'b-izq', 'c'], [['b-izq', 'b-der']])
+        assert list(class_map) == [0, 2, 1, 3]
+        with pytest.raises(ValueError):
+            mirror_class_map(['a', 'b'], [['a', 'x']])
+    
+    def test_default_class_map_swaps_hola(self):
+        """Verifica que el vocabulario configurado intercambia hola-der/hola-izq"""
+        word_ids = config.get_word_ids()
+        der, izq = word_ids.index('hola-der'), word_ids.index('hola-izq')
+        class_map = mirror_class_map()
+        
+        assert (class_map[der], class_map[izq]) == (izq, der)
+        assert np.sum(class_map != np.arange(len(word_ids))) == 2
+    
+    def test_swaps_labels_of_mirrored_samples(self, batch):
+        """Verifica que las muestras espejadas toman la clase espejada y las demás no cambian"""
+        class_map = np.array([0, 2, 1], dtype=np.int32)
+        labels = tf.constant([1, 0], dtype=tf.int32)
+        
+        _, mirrored = mirror(batch, 1.0, labels, class_map)
+        _, kept = mirror(batch, 0.0, labels, class_map)
+        _, single = mirror(batch[0], 1.0, 2, class_map)
+        
+        assert list(mirrored.numpy()) == [2, 0]
+        assert list(kept.numpy()) == [1, 0]
+        assert single.numpy() == 1
+    
+    def test_labels_follow_mirroring(self, batch):
+        """Verifica que la etiqueta cambia exactamente en las muestras espejadas"""
+        tf.random.set_seed(3)
+        data = np.repeat(batch[:1], 64, axis=0)
+        labels = tf.ones(64, dtype=tf.int32)
+        
+        result, result_labels = mirror(data, 0.5, labels, np.array([0, 2, 1], dtype=np.int32))
+        was_mirrored = ~np.all(result.numpy() == data, axis=(1, 2))
+        
+        assert 0 < was_mirrored.sum() < 64
+        assert np.array_equal(result_labels.numpy(), np.where(was_mirrored, 2, 1))
+
+
+class TestAffine:
+    """Tests para affine()"""
+    
+    def test_identity_without_ranges(self, batch):
+        """Verifica que sin rotación/escala/traslación no hay cambios"""
+        result = affine(batch, 0.0, 0.0, 0.0).numpy()
+        assert np.allclose(result, batch, atol=1e-6)
+    
+    def test_keeps_missing_and_z(self, batch):
+        """Verifica que los ausentes siguen en cero y z/visibility no cambian"""
+        result = affine(batch, 30.0, 0.3, 0.1).numpy()
+        
+        assert np.all(result[:, :3] == 0)
+        assert np.all(result[:, :, RIGHT_HAND_SLICE] == 0)
+        assert np.array_equal(result[..., FACE_SLICE][..., 2::3], batch[..., FACE_SLICE][..., 2::3])
+        assert np.array_equal(result[..., POSE_SLICE][..., 3::4], batch[..., POSE_SLICE][..., 3::4])
+        assert not np.allclose(result, batch)
+
+
+class TestTemporal:
+    """Tests para time_warp() y frame_dropout()"""
+    
+    def test_time_warp_identity(self, batch):
+        """Verifica que velocidad 1 no modifica la muestra"""
+        assert np.allclose(time_warp(batch, 0.0).numpy(), batch)
+    
+    def test_time_warp_does_not_blend_padding(self, batch):
+        """Verifica que no interpola entre padding y frames reales"""
+        result = time_warp(batch, 0.5).numpy()
+        frames = result.reshape(-1, 1662)
+        padding = np.all(frames == 0, axis=1)
+        assert np.all(frames[~padding][:, LEFT_HAND_SLICE] > 0.09)
+    
+    def test_frame_dropout(self, batch):
+        """Verifica rate=0 (sin cambios) y rate=1 (todo repite el primer frame)"""
+        assert np.array_equal(frame_dropout(batch, 0.0).numpy(), batch)
+        result = frame_dropout(batch, 1.0).numpy()
+        assert np.array_equal(result, np.repeat(batch[:, :1], 15, axis=1))
+
+
+class TestAugmentKeypoints:
+    """Tests para jitter() y la cadena completa"""
+    
+    def test_jitter_keeps_zeros_and_visibility(self, batch):
+        """Verifica que el ruido solo afecta coordenadas detectadas"""
+        result = jitter(batch, 0.01).numpy()
+        
+        assert np.all(result[batch == 0] == 0)
+        assert np.array_equal(result[..., POSE_SLICE][..., 3::4], batch[..., POSE_SLICE][..., 3::4])
+    
+    def test_single_sample(self, batch):
+        """Verifica que acepta una muestra (frames, 1662)"""
+        assert augment_keypoints(batch[0]).shape == (15, 1662)
+    
+    def test_in_tf_data(self, batch):
+        """Verifica su uso dentro de tf.data sobre batches"""
+        dataset = tf.data.Dataset.from_tensor_slices((batch, [0, 1])).batch(2).map(augment_batch)
+        x, y = next(iter(dataset))
+        
+        assert x.shape == (2, 15, 1662)
+        assert list(y.numpy()) == [0, 1]
+    
+    def test_augment_batch_swaps_handed_labels(self, batch):
+        """Verifica que augment_batch intercambia hola-der/hola-izq al espejar"""
+        word_ids = config.get_word_ids()
+        der, izq = word_ids.index('hola-der'), word_ids.index('hola-izq')
+        params = {'mirror_prob': 1.0, 'max_rotation': 0.0, 'max_scale': 0.0, 'max_shift': 0.0,
+                  'max_speed': 0.0, 'frame_dropout': 0.0, 'jitter_std': 0.0}
+        
+        x, y = augment_keypoints(batch, params, labels=tf.constant([der, 0]))
+        
+        assert np.allclose(x.numpy(), mirror(batch).numpy(), atol=1e-6)
+        assert list(y.numpy()) == [izq, 0]
@@ -0,0 +1,145 @@
+"""
+Tests unitarios para keypoints_dataset.py
+"""
+import json
+import pytest
+import numpy as np
+import pandas as pd
+
+from helpers import insert_keypoints_sequence
+from keypoints_dataset import (
+    KeypointsDataset,
+    KeypointsDatasetWriter,
+    save_word_dataset,
+    convert_hdf_to_dataset,
+    dataset_exists,
+    MANIFEST_FILE,
+)
+
+
+@pytest.fixture
+def sequences():
+    """Tres muestras de distinta longitud"""
+    rng = np.random.default_rng(0)
+    return [rng.random((n, 1662)).astype(np.float32) for n in (7, 15, 10)]
+
+
+class TestSaveAndOpen:
+    """Tests para save_word_dataset() y KeypointsDataset"""
+    
+    def test_roundtrip(self, tmp_path, sequences):
+        """Verifica que las muestras se recuperan intactas y en orden"""
+        save_word_dataset(tmp_path / "hola", "hola", sequences)
+        dataset = KeypointsDataset(tmp_path / "hola")
+        
+        assert len(dataset) == 3
+        assert dataset.word_id == "hola"
+        assert dataset.n_frames == 32
+        for original, loaded in zip(sequences, dataset):
+            assert np.array_equal(original, loaded)
+    
+    def test_samples_are_memmap_views(self, tmp_path, sequences):
+        """Verifica que cada muestra es una vista sin copia del memmap"""
+        save_word_dataset(tmp_path / "hola", "hola", sequences)
+        dataset = KeypointsDataset(tmp_path / "hola")
+        
+        sample = dataset[1]
+        assert isinstance(dataset.frames, np.memmap)
+        assert np.shares_memory(sample, dataset.frames)
+        assert sample.dtype == np.float32
+    
+    def test_manifest(self, tmp_path, sequences):
+        """Verifica el contenido del manifest"""
+        save_word_dataset(tmp_path / "hola", "hola", sequences, sample_names=["a", "b", "c"])
+        
+        with open(tmp_path / "hola" / MANIFEST_FILE, encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        assert manifest['n_samples'] == 3
+        assert manifest['n_frames'] == 32
+        assert manifest['keypoints_length'] == 1662
+        assert manifest['sample_names'] == ["a", "b", "c"]
+    
+    def test_empty_dataset(self, tmp_path):
+        """Verifica que una palabra sin muestras genera un dataset vacío válido"""
+        save_word_dataset(tmp_path / "vacio", "vacio", [])
+        dataset = KeypointsDataset(tmp_path / "vacio")
+        
+        assert len(dataset) == 0
+        assert dataset.frames.shape == (0, 1662)
+    
+    def test_dataset_exists(self, tmp_path, sequences):
+        """Verifica que solo un dataset con manifest se considera completo"""
+        assert not dataset_exists(tmp_path / "hola")
+        save_word_dataset(tmp_path / "hola", "hola", sequences)
+        assert dataset_exists(tmp_path / "hola")
+
+
+class TestKeypointsDatasetWriter:
+    """Tests para KeypointsDatasetWriter"""
+    
+    def test_writer_across_chunks(self, tmp_path, sequences):
+        """Verifica muestras que cruzan el límite entre bloques"""
+        with KeypointsDatasetWriter(tmp_path / "hola", "hola", chunk_frames=4) as writer:
+            for n_sample, seq in enumerate(sequences):
+                writer.append(seq, f"sample_{n_sample}")
+        
+        dataset = KeypointsDataset(tmp_path / "hola")
+        assert dataset.sample_names == ["sample_0", "sample_1", "sample_2"]
+        assert list(dataset.lengths) == [7, 15, 10]
+        for original, loaded in zip(sequences, dataset):
+            assert np.array_equal(original, loaded)
+    
+    def test_writer_error_leaves_no_dataset(self, tmp_path, sequences):
+        """Verifica que un error durante la escritura no deja un dataset parcial"""
+        with pytest.raises(RuntimeError):
+            with KeypointsDatasetWriter(tmp_path / "hola", "hola") as writer:
+                writer.append(sequences[0])
+                raise RuntimeError("fallo de extracción")
+        
+        assert not dataset_exists(tmp_path / "hola")
+    
+    def test_writer_rejects_append_after_close(self, tmp_path, sequences):
+        """Verifica que no se puede agregar tras cerrar"""
+        writer = KeypointsDatasetWriter(tmp_path / "hola", "hola")
+        writer.append(sequences[0])
+        writer.close()
+        
+        with pytest.raises(RuntimeError):
+            writer.append(sequences[1])
+    
+    def test_writer_fingerprints(self, tmp_path, sequences):
+        """Verifica que las huellas por muestra se guardan en el manifest"""
+        fingerprint = {'signature': 'abc', 'sha1': 'def'}
+        with KeypointsDatasetWriter(tmp_path / "hola", "hola") as writer:
+            writer.append(sequences[0], "sample_0", fingerprint)
+            writer.append(sequences[1], "sample_1")
+        
+        dataset = KeypointsDataset(tmp_path / "hola")
+        assert dataset.sample_fingerprints == {"sample_0": fingerprint}
+        
+        dataset.release()
+        assert dataset.frames.size == 0
+
+
+class TestConvertHdf:
+    """Tests para convert_hdf_to_dataset()"""
+    
+    def test_convert_matches_groupby(self, tmp_path, sequences):
+        """Verifica que la conversión coincide con la lectura groupby('sample') legada"""
+        data = pd.DataFrame([])
+        for n_sample, seq in enumerate(sequences, start=1):
+            data = insert_keypoints_sequence(data, n_sample, seq)
+        hdf_path = tmp_path / "hola.h5"
+        data.to_hdf(hdf_path, key="data", mode="w")
+        
+        manifest = convert_hdf_to_dataset(hdf_path, tmp_path / "hola", "hola")
+        dataset = KeypointsDataset(tmp_path / "hola")
+        
+        assert manifest['sample_names'] == ["1", "2", "3"]
+        legacy = [
+            np.array([row['keypoints'] for _, row in df_sample.iterrows()])
+            for _, df_sample in pd.read_hdf(hdf_path, key='data').groupby('sample')
+        ]
+        for expected, loaded in zip(legacy, dataset):
+            assert np.array_equal(expected, loaded)
@@ -0,0 +1,101 @@
+"""
+Tests unitarios para keypoints_pipeline.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+
+from config_manager import config
+from keypoints_pipeline import make_dataset, normalize_length, resolve_cache_mode
+
+
+def reference_pad(sequence, frames):
+    """pad_sequences(padding='pre', truncating='post') de Keras"""
+    out = np.zeros((frames, sequence.shape[1]), dtype=np.float32)
+    kept = sequence[:frames]
+    out[frames - len(kept):] = kept
+    return out
+
+
+@pytest.fixture
+def sequences():
+    """Muestras más cortas, iguales y más largas que 15 frames"""
+    rng = np.random.default_rng(0)
+    return [rng.random((n, 1662)).astype(np.float32) for n in (5, 15, 22, 9)]
+
+
+class TestNormalizeLength:
+    """Tests para normalize_length()"""
+    
+    @pytest.mark.parametrize("n_frames", [1, 5, 15, 22])
+    def test_matches_pad_sequences(self, n_frames):
+        """Verifica pre-padding con ceros y truncado al final"""
+        sequence = np.random.rand(n_frames, 1662).astype(np.float32)
+        result = normalize_length(tf.constant(sequence), 15).numpy()
+        
+        assert result.shape == (15, 1662)
+        assert np.array_equal(result, reference_pad(sequence, 15))
+
+
+class TestMakeDataset:
+    """Tests para make_dataset()"""
+    
+    def test_batches_and_sparse_labels(self, sequences):
+        """Verifica shapes, dtype y etiquetas enteras"""
+        dataset = make_dataset(sequences, [0, 1, 2, 1], frames=15, batch_size=3, cache='none')
+        batches = list(dataset)
+        
+        assert [x.shape for x, _ in batches] == [(3, 15, 1662), (1, 15, 1662)]
+        labels = np.concatenate([y.numpy() for _, y in batches])
+        assert labels.dtype == np.int32
+        assert list(labels) == [0, 1, 2, 1]
+        for expected, x in zip(sequences, np.concatenate([x.numpy() for x, _ in batches])):
+            assert np.array_equal(x, reference_pad(expected, 15))
+    
+    def test_training_shuffles_every_sample(self, sequences):
+        """Verifica que el shuffle no pierde ni duplica muestras"""
+        dataset = make_dataset(sequences, [0, 1, 2, 3], training=True, frames=15, batch_size=2, cache='memory')
+        
+        for _ in range(2):
+            labels = sorted(np.concatenate([y.numpy() for _, y in dataset]))
+            assert labels == [0, 1, 2, 3]
+    
+    def test_disk_cache(self, sequences, tmp_path, monkeypatch):
+        """Verifica la cache en disco y que se descarta la de una ejecución anterior"""
+        monkeypatch.setattr(config, 'DATA_PATH', tmp_path)
+        stale = tmp_path / 'cache' / 'train.index'
+        stale.parent.mkdir()
+        stale.write_bytes(b'stale')
+        
+        dataset = make_dataset(sequences, [0, 1, 2, 3], frames=15, batch_size=4, cache='disk', name='train')
+        first = np.concatenate([x.numpy() for x, _ in dataset])
+        second = np.concatenate([x.numpy() for x, _ in dataset])
+        
+        assert np.array_equal(first, second)
+        assert stale.read_bytes() != b'stale'
+    
+    def test_mismatched_labels(self, sequences):
+        """Verifica que se rechazan etiquetas de distinta longitud"""
+        with pytest.raises(ValueError):
+            make_dataset(sequences, [0, 1])
+
+
+class TestResolveCacheMode:
+    """Tests para resolve_cache_mode()"""
+    
+    def test_explicit_modes(self):
+        """Verifica que los modos explícitos se respetan"""
+        assert resolve_cache_mode('disk', 0) == 'disk'
+        assert resolve_cache_mode('none', 0) == 'none'
+    
+    def test_auto_falls_back_to_disk(self, monkeypatch):
+        """Verifica que un dataset mayor que la RAM se cachea en disco"""
+        monkeypatch.setattr('keypoints_pipeline.available_memory', lambda: 1000)
+        assert resolve_cache_mode('auto', 100) == 'memory'
+        assert resolve_cache_mode('auto', 10_000) == 'disk'
+    
+    def test_invalid_mode(self):
+        """Verifica que se rechaza un modo desconocido"""
+        with pytest.raises(ValueError):
+            resolve_cache_mode('ram', 0)
@@ -0,0 +1,26 @@
+"""
+Tests unitarios para latency_metrics.py
+"""
+import numpy as np
+import pytest
+
+from latency_metrics import percentiles
+
+
+class TestPercentiles:
+    """Tests para percentiles()"""
+    
+    def test_empty_window(self):
+        assert percentiles([]) == {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    
+    def test_known_values(self):
+        result = percentiles(list(range(1, 101)))
+        
+        assert result['p50'] == pytest.approx(50.5)
+        assert result['p95'] == pytest.approx(95.05)
+        assert result['p99'] == pytest.approx(99.01)
+        assert result['max'] == 100.0
+        assert all(type(value) is float for value in result.values())
+    
+    def test_accepts_arrays(self):
+        assert percentiles(np.array([2.0, 4.0]))['max'] == 4.0
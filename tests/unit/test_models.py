@@ -0,0 +1,352 @@
+"""
+Tests unitarios para web-app/backend/models.py (sobre SQLite temporal)
+"""
+import random
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'web-app' / 'backend'))
+
+from flask import Flask
+
+from models import (
+    DailyWordStats, Prediction, User, UserWordStats, check_stats, create_tables, db, decode_prediction_cursor,
+    encode_prediction_cursor, get_system_stats, get_user_stats, insert_predictions, iter_user_predictions,
+    query_user_predictions, rebuild_stats
+)
+
+WORDS = ['HOLA', 'ADIÓS', 'BIEN', 'GRACIAS', 'MAL']
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App Flask mínima con la base en un archivo SQLite temporal"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+    with app.app_context():
+        create_tables()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def add_user(username):
+    user = User(username=username, email=f'{username}@lsch.com')
+    user.set_password('test')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def make_rows(user_id, count, start=datetime(2024, 1, 1), seed=0, **fields):
+    rng = random.Random(seed)
+    return [dict({
+        'public_id': f'{user_id}-{seed}-{i}',
+        'user_id': user_id,
+        'word': rng.choice(WORDS),
+        'word_id': 'test',
+        'confidence': rng.uniform(0.5, 1.0),
+        'timestamp': start + timedelta(minutes=i),
+    }, **fields) for i in range(count)]
+
+
+def python_user_stats(user_id):
+    """Cálculo original de User.get_stats: todas las filas del usuario en Python"""
+    predictions = Prediction.query.filter_by(user_id=user_id).all()
+    word_counts = Counter(p.word for p in predictions)
+    recent = sorted(predictions, key=lambda p: p.timestamp, reverse=True)[:10]
+    return {
+        'total_predictions': len(predictions),
+        'avg_confidence': sum(p.confidence for p in predictions) / len(predictions),
+        'unique_words': len(word_counts),
+        'top_words': sorted(word_counts.items(), key=lambda item: (-item[1], item[0]))[:10],
+        'recent_predictions': [(p.word, p.word_id, p.confidence, p.timestamp) for p in recent],
+    }
+
+
+class TestStats:
+    """Tests para get_user_stats() y get_system_stats()"""
+    
+    def test_user_stats_match_python(self, app):
+        """Las agregaciones en SQL coinciden con el cálculo original en Python"""
+        user_id, other_id = add_user('ana'), add_user('beto')
+        insert_predictions(make_rows(user_id, 300, seed=1))
+        insert_predictions(make_rows(other_id, 200, seed=2))
+        
+        stats, expected = get_user_stats(user_id), python_user_stats(user_id)
+        
+        assert stats['total_predictions'] == expected['total_predictions'] == 300
+        assert stats['avg_confidence'] == pytest.approx(expected['avg_confidence'])
+        assert stats['unique_words'] == expected['unique_words']
+        assert stats['top_words'] == expected['top_words']
+        assert [(p['word'], p['word_id'], p['confidence'], p['timestamp'])
+                for p in stats['recent_predictions']] == expected['recent_predictions']
+    
+    def test_top_words_limit(self, app):
+        user_id = add_user('ana')
+        insert_predictions(make_rows(user_id, 100))
+        
+        assert get_user_stats(user_id, top_words=2)['top_words'] == python_user_stats(user_id)['top_words'][:2]
+    
+    def test_user_without_predictions(self, app):
+        user_id = add_user('ana')
+        
+        stats = get_user_stats(user_id)
+        
+        assert stats['total_predictions'] == 0
+        assert stats['top_words'] == [] and stats['recent_predictions'] == []
+    
+    def test_system_stats_match_python(self, app):
+        """Totales del sistema iguales a los calculados sobre toda la tabla predictions"""
+        user_id, other_id = add_user('ana'), add_user('beto')
+        insert_predictions(make_rows(user_id, 150, seed=1))
+        insert_predictions(make_rows(other_id, 150, seed=2, start=datetime(2024, 1, 2)))
+        
+        predictions = Prediction.query.all()
+        top_word, top_count = min(Counter(p.word for p in predictions).items(), key=lambda item: (-item[1], item[0]))
+        stats = get_system_stats()
+        
+        assert stats['total_users'] == 2
+        assert stats['total_predictions'] == 300
+        assert stats['avg_confidence'] == pytest.approx(sum(p.confidence for p in predictions) / 300)
+        assert (stats['top_word'], stats['top_word_count']) == (top_word, top_count)
+    
+    def test_recent_predictions_use_composite_index(self, app):
+        """Las recientes se leen en orden del índice (user_id, timestamp), sin ordenar en memoria"""
+        query = db.session.query(Prediction.word).filter(Prediction.user_id == 1)\
+            .order_by(Prediction.timestamp.desc()).limit(10)
+        sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        
+        plan = ' '.join(row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')))
+        
+        assert 'ix_predictions_user_timestamp' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+def rollups():
+    """Contenido de las tablas de resumen como dicts {clave: (predicciones, suma de confianza)}"""
+    return (
+        {(row.user_id, row.word): (row.prediction_count, pytest.approx(row.confidence_sum))
+         for row in UserWordStats.query},
+        {(row.day, row.word): (row.prediction_count, pytest.approx(row.confidence_sum))
+         for row in DailyWordStats.query},
+    )
+
+
+def assert_consistent():
+    assert check_stats() == {'user_word_stats': [], 'daily_word_stats': []}
+
+
+class TestStatsRollups:
+    """Tests para las tablas de resumen user_word_stats y daily_word_stats"""
+    
+    def test_insert_creates_and_increments(self, app):
+        """El primer lote crea las filas y los siguientes suman sobre ellas (upsert)"""
+        user_id = add_user('ana')
+        day = datetime(2024, 1, 1, 10)
+        insert_predictions([
+            {'user_id': user_id, 'word': 'HOLA', 'word_id': 'hola', 'confidence': 0.5, 'timestamp': day},
+            {'user_id': user_id, 'word': 'HOLA', 'word_id': 'hola', 'confidence': 0.7, 'timestamp': day},
+        ])
+        assert rollups() == ({(user_id, 'HOLA'): (2, 1.2)}, {(date(2024, 1, 1), 'HOLA'): (2, 1.2)})
+        
+        insert_predictions([
+            {'user_id': user_id, 'word': 'HOLA', 'word_id': 'hola', 'confidence': 0.9, 'timestamp': day},
+            {'user_id': user_id, 'word': 'BIEN', 'word_id': 'bien', 'confidence': 0.8,
+             'timestamp': day + timedelta(days=1)},
+        ])
+        
+        user_word, daily = rollups()
+        assert user_word == {(user_id, 'HOLA'): (3, 2.1), (user_id, 'BIEN'): (1, 0.8)}
+        assert daily == {(date(2024, 1, 1), 'HOLA'): (3, 2.1), (date(2024, 1, 2), 'BIEN'): (1, 0.8)}
+        assert_consistent()
+    
+    def test_failed_insert_leaves_rollups_untouched(self, app):
+        """Predicciones y resúmenes se confirman o descartan juntos"""
+        user_id = add_user('ana')
+        rows = make_rows(user_id, 5)
+        insert_predictions(rows)
+        before = rollups()
+        
+        with pytest.raises(Exception):
+            insert_predictions(make_rows(user_id, 3, seed=9) + rows[:1])  # public_id repetido
+        
+        assert rollups() == before
+        assert_consistent()
+    
+    def test_rebuild_matches_history(self, app):
+        """rebuild_stats recalcula desde predictions filas insertadas por fuera de insert_predictions"""
+        user_id, other_id = add_user('ana'), add_user('beto')
+        insert_predictions(make_rows(user_id, 50, seed=1))
+        db.session.execute(db.insert(Prediction), make_rows(other_id, 80, seed=2))
+        db.session.commit()
+        assert check_stats()['user_word_stats']
+        
+        counts = rebuild_stats()
+        
+        assert_consistent()
+        user_word, daily = rollups()
+        assert counts == {'user_word_stats': len(user_word), 'daily_word_stats': len(daily)}
+        assert sum(count for count, _ in user_word.values()) == 130
+        for (uid, word), (count, _) in user_word.items():
+            assert count == Prediction.query.filter_by(user_id=uid, word=word).count()
+    
+    def test_create_tables_backfills_rollups(self, app):
+        """Sobre un historial existente sin resúmenes, create_tables los calcula"""
+        user_id = add_user('ana')
+        db.session.execute(db.insert(Prediction), make_rows(user_id, 40))
+        db.session.commit()
+        
+        create_tables()
+        
+        assert_consistent()
+        assert get_user_stats(user_id)['total_predictions'] == 40
+    
+    def test_check_detects_drift(self, app):
+        """check_stats reporta filas con conteos distintos y filas faltantes"""
+        user_id = add_user('ana')
+        insert_predictions([
+            {'user_id': user_id, 'word': 'HOLA', 'word_id': 'hola', 'confidence': 0.5,
+             'timestamp': datetime(2024, 1, 1)},
+            {'user_id': user_id, 'word': 'BIEN', 'word_id': 'bien', 'confidence': 0.6,
+             'timestamp': datetime(2024, 1, 1)},
+        ])
+        db.session.get(UserWordStats, (user_id, 'HOLA')).prediction_count = 5
+        db.session.delete(db.session.get(DailyWordStats, (date(2024, 1, 1), 'BIEN')))
+        db.session.commit()
+        
+        mismatches = check_stats()
+        
+        assert mismatches['user_word_stats'] == [((user_id, 'HOLA'), (1, 0.5), (5, 0.5))]
+        assert mismatches['daily_word_stats'] == [((date(2024, 1, 1), 'BIEN'), (1, 0.6), None)]
+        rebuild_stats()
+        assert_consistent()
+    
+    def test_deleting_user_discounts_daily_rollup(self, app):
+        """Borrar un usuario resta sus predicciones de daily_word_stats"""
+        user_id, other_id = add_user('ana'), add_user('beto')
+        insert_predictions(make_rows(user_id, 60, seed=1))
+        insert_predictions(make_rows(other_id, 60, seed=2))
+        insert_predictions(make_rows(user_id, 10, seed=3, start=datetime(2024, 2, 1)))
+        
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        
+        assert_consistent()
+        assert Prediction.query.filter_by(user_id=user_id).count() == 0
+        assert get_system_stats()['total_predictions'] == 60
+        # Días solo con predicciones del usuario borrado no quedan en cero
+        assert not DailyWordStats.query.filter(DailyWordStats.day >= date(2024, 2, 1)).count()
+
+
+class TestManageStats:
+    """Tests para manage_stats.py (rebuild / check)"""
+    
+    def test_check_and_rebuild(self, app, tmp_path, monkeypatch, capsys):
+        import manage_stats
+        
+        user_id = add_user('ana')
+        insert_predictions(make_rows(user_id, 20))
+        db.session.get(UserWordStats, (user_id, make_rows(user_id, 1)[0]['word'])).prediction_count += 1
+        db.session.commit()
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+        
+        def run(command):
+            monkeypatch.setattr(sys, 'argv', ['manage_stats.py', command, '--database-url', url])
+            manage_stats.main()
+        
+        with pytest.raises(SystemExit) as exit_info:
+            run('check')
+        assert exit_info.value.code == 1
+        run('rebuild')
+        run('check')
+        assert 'consistentes' in capsys.readouterr().out
+
+
+@pytest.fixture
+def history(app):
+    """Dos usuarios; el primero con 3 predicciones por segundo (timestamps empatados) en 2 sesiones"""
+    user_id, other_id = add_user('ana'), add_user('beto')
+    rows = make_rows(user_id, 90, seed=1)
+    for i, row in enumerate(rows):
+        row['timestamp'] = datetime(2024, 1, 1) + timedelta(hours=i // 3)
+        row['session_id'] = 's1' if i < 45 else 's2'
+    insert_predictions(rows)
+    insert_predictions(make_rows(other_id, 30, seed=2))
+    return user_id
+
+
+def expected_ids(user_id, keep=lambda p: True):
+    """Orden esperado calculado en Python: timestamp desc, id desc"""
+    predictions = [p for p in Prediction.query.filter_by(user_id=user_id) if keep(p)]
+    return [p.id for p in sorted(predictions, key=lambda p: (p.timestamp, p.id), reverse=True)]
+
+
+def page_through(user_id, limit, **filters):
+    ids, after = [], None
+    while True:
+        page = query_user_predictions(user_id, after=after, **filters).limit(limit).all()
+        ids += [p.id for p in page]
+        if len(page) < limit:
+            return ids
+        after = decode_prediction_cursor(encode_prediction_cursor(page[-1]))
+
+
+class TestPredictionHistory:
+    """Tests para query_user_predictions(), iter_user_predictions() y los cursores"""
+    
+    @pytest.mark.parametrize("limit", [1, 2, 4, 7, 90, 200])
+    def test_pages_across_tied_timestamps(self, history, limit):
+        """Las páginas cortan dentro de grupos con el mismo timestamp sin saltar ni repetir filas"""
+        ids = page_through(history, limit)
+        
+        assert ids == expected_ids(history)
+        assert len(set(ids)) == 90
+    
+    def test_word_and_confidence_filters(self, history):
+        ids = page_through(history, 4, word='HOLA', min_confidence=0.6, max_confidence=0.9)
+        
+        assert ids == expected_ids(history, lambda p: p.word == 'HOLA' and 0.6 <= p.confidence <= 0.9)
+        assert ids
+    
+    def test_date_and_session_filters(self, history):
+        since, until = datetime(2024, 1, 1, 5), datetime(2024, 1, 1, 20)
+        ids = page_through(history, 5, since=since, until=until, session_id='s2')
+        
+        assert ids == expected_ids(history, lambda p: since <= p.timestamp < until and p.session_id == 's2')
+        assert len(ids) == 15  # horas 15 a 19, 3 por hora
+    
+    @pytest.mark.parametrize("batch_size", [1, 7, 1000])
+    def test_iter_matches_pages(self, history, batch_size):
+        """El recorrido por lotes (exportación) entrega todo el historial filtrado en orden"""
+        ids = [p.id for p in iter_user_predictions(history, batch_size=batch_size, word='BIEN')]
+        assert ids == expected_ids(history, lambda p: p.word == 'BIEN')
+    
+    def test_iter_resumes_after_cursor(self, history):
+        first_page = query_user_predictions(history).limit(10).all()
+        after = decode_prediction_cursor(encode_prediction_cursor(first_page[-1]))
+        
+        ids = [p.id for p in iter_user_predictions(history, after=after, batch_size=8)]
+        
+        assert ids == expected_ids(history)[10:]
+    
+    def test_cursor_roundtrip(self, history):
+        prediction = query_user_predictions(history).first()
+        cursor = encode_prediction_cursor(prediction)
+        
+        assert '=' not in cursor
+        assert decode_prediction_cursor(cursor) == (prediction.timestamp, prediction.id)
+    
+    @pytest.mark.parametrize("cursor", ['zzz', '', 'bm8gZXMganNvbg', 'WzEsIDJd', 'WyJhIiwgMV0'])
+    def test_invalid_cursor(self, cursor):
+        """Base64 inválido, JSON inválido, forma o timestamp incorrectos -> ValueError"""
+        with pytest.raises(ValueError):
+            decode_prediction_cursor(cursor)
+
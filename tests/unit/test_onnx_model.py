@@ -0,0 +1,67 @@
+"""
+Tests unitarios para onnx_model.py y la exportación ONNX de model_export.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+pytest.importorskip("tf2onnx")
+pytest.importorskip("onnxruntime")
+
+from inference_backend import load_inference_model
+from model_export import export_onnx
+from onnx_model import OnnxModel
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    """LSTM pequeño con la misma interfaz que el modelo real"""
+    tf.keras.utils.set_random_seed(0)
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(15, 12)),
+        tf.keras.layers.LSTM(8),
+        tf.keras.layers.Dense(4, activation='softmax'),
+    ])
+
+
+@pytest.fixture(scope="module")
+def onnx_path(keras_model, tmp_path_factory):
+    path = tmp_path_factory.mktemp("models") / "model.keras"
+    keras_model.save(path)
+    return export_onnx(path)
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(0).random((5, 15, 12), dtype=np.float32)
+
+
+class TestOnnxModel:
+    """Tests para la exportación y el backend ONNX Runtime"""
+    
+    def test_export_matches_keras(self, onnx_path, keras_model, batch):
+        """Verifica que ONNX Runtime reproduce las probabilidades de Keras"""
+        model = OnnxModel(onnx_path)
+        
+        assert onnx_path.name == "model.onnx"
+        assert model.input_shape == (15, 12)
+        assert model.n_classes == 4
+        assert np.allclose(model.predict_batch(batch), keras_model.predict(batch, verbose=0), atol=1e-5)
+    
+    def test_dynamic_batch(self, onnx_path, batch):
+        """Verifica que el grafo acepta cualquier tamaño de batch"""
+        model = OnnxModel(onnx_path, intra_op_threads=1, inter_op_threads=1)
+        expected = model.predict_batch(batch)
+        
+        assert np.allclose(model.predict_batch(batch[:2]), expected[:2], atol=1e-6)
+        assert np.allclose(model.predict_one(batch[3]), expected[3], atol=1e-6)
+    
+    def test_rejects_wrong_shape(self, onnx_path):
+        """Verifica que se rechazan entradas con otra cantidad de frames"""
+        model = OnnxModel(onnx_path, warmup=False)
+        with pytest.raises(ValueError):
+            model.predict_one(np.zeros((10, 12), dtype=np.float32))
+    
+    def test_load_inference_model(self, onnx_path):
+        """Verifica la selección del backend onnx"""
+        assert isinstance(load_inference_model('onnx', onnx_path), OnnxModel)
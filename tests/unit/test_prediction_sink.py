@@ -0,0 +1,134 @@
+"""
+Tests unitarios para prediction_sink.py
+"""
+import threading
+import time
+
+import pytest
+
+from prediction_sink import PredictionSink
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise AssertionError("Condición no cumplida a tiempo")
+        time.sleep(0.005)
+
+
+class Recorder:
+    """write_fn que guarda los lotes y puede fallar las primeras veces"""
+    
+    def __init__(self, failures=0, gate=None):
+        self.batches = []
+        self.calls = 0
+        self.failures = failures
+        self.gate = gate
+    
+    def __call__(self, rows):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait()
+        if self.calls <= self.failures:
+            raise RuntimeError("base de datos no disponible")
+        self.batches.append(list(rows))
+
+
+@pytest.fixture
+def make_sink():
+    sinks = []
+    
+    def factory(write_fn, **kwargs):
+        params = dict(batch_size=10, flush_interval_ms=50, max_pending=100, max_retries=3, retry_backoff_ms=1)
+        params.update(kwargs)
+        sink = PredictionSink(write_fn, **params)
+        sink.start()
+        sinks.append(sink)
+        return sink
+    
+    yield factory
+    for sink in sinks:
+        sink.close(timeout=5)
+
+
+class TestPredictionSink:
+    """Tests para la escritura diferida por lotes"""
+    
+    def test_flushes_full_batches(self, make_sink):
+        """Con batch_size filas en cola se escribe un lote sin esperar el intervalo"""
+        recorder = Recorder()
+        sink = make_sink(recorder, batch_size=5, flush_interval_ms=10000)
+        for i in range(10):
+            assert sink.submit({'i': i})
+        
+        wait_until(lambda: len(recorder.batches) == 2)
+        assert [[row['i'] for row in batch] for batch in recorder.batches] == [list(range(5)), list(range(5, 10))]
+    
+    def test_flushes_partial_batch_after_interval(self, make_sink):
+        """Un lote incompleto se escribe al cumplirse flush_interval_ms"""
+        recorder = Recorder()
+        sink = make_sink(recorder, batch_size=100, flush_interval_ms=30)
+        sink.submit({'i': 0})
+        sink.submit({'i': 1})
+        
+        wait_until(lambda: recorder.batches)
+        assert recorder.batches == [[{'i': 0}, {'i': 1}]]
+        assert sink.metrics()['written'] == 2
+    
+    def test_retries_failed_batch(self, make_sink):
+        """Un lote fallido se reintenta con espera hasta escribirse"""
+        recorder = Recorder(failures=2)
+        sink = make_sink(recorder, batch_size=1)
+        sink.submit({'i': 0})
+        
+        wait_until(lambda: recorder.batches)
+        metrics = sink.metrics()
+        assert recorder.calls == 3
+        assert metrics['retries'] == 2
+        assert metrics['written'] == 1
+        assert metrics['failed'] == 0
+    
+    def test_drops_batch_after_max_retries(self, make_sink):
+        """Agotados los reintentos el lote se descarta y se cuenta en failed"""
+        recorder = Recorder(failures=100)
+        sink = make_sink(recorder, batch_size=2, max_retries=2)
+        sink.submit({'i': 0})
+        sink.submit({'i': 1})
+        
+        wait_until(lambda: sink.metrics()['failed'] == 2)
+        assert recorder.calls == 3
+        assert sink.metrics()['written'] == 0
+    
+    def test_submit_never_blocks_when_full(self, make_sink):
+        """Con la cola llena submit descarta en vez de esperar a la base de datos"""
+        gate = threading.Event()
+        recorder = Recorder(gate=gate)
+        sink = make_sink(recorder, batch_size=1, max_pending=2)
+        sink.submit({'i': 0})
+        wait_until(lambda: recorder.calls == 1)          # escritor bloqueado en el primer lote
+        
+        started = time.perf_counter()
+        accepted = [sink.submit({'i': i}) for i in range(1, 6)]
+        assert time.perf_counter() - started < 0.5
+        assert accepted == [True, True, False, False, False]
+        assert sink.metrics()['dropped'] == 3
+        
+        gate.set()
+        wait_until(lambda: sink.metrics()['written'] == 3)
+    
+    def test_close_flushes_pending_rows(self, make_sink):
+        """close escribe lo pendiente antes de detener el hilo"""
+        recorder = Recorder()
+        sink = make_sink(recorder, batch_size=100, flush_interval_ms=10000)
+        for i in range(3):
+            sink.submit({'i': i})
+        
+        sink.close(timeout=5)
+        assert not sink.running
+        assert recorder.batches == [[{'i': 0}, {'i': 1}, {'i': 2}]]
+        assert not sink.submit({'i': 3})
+    
+    def test_rejects_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            PredictionSink(lambda rows: None, batch_size=-1)
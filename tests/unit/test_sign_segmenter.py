@@ -0,0 +1,102 @@
+"""
+Tests unitarios para sign_segmenter.py
+"""
+import pytest
+import numpy as np
+
+from helpers import KEYPOINTS_LENGTH, LEFT_HAND_SLICE
+from sign_segmenter import SignSegmenter
+
+
+def make_frames(hands):
+    """Un frame por valor: índice del frame en la pose y mano izquierda si hands[i]"""
+    frames = np.zeros((len(hands), KEYPOINTS_LENGTH), dtype=np.float32)
+    frames[:, 0] = np.arange(len(hands))
+    frames[:, LEFT_HAND_SLICE.start] = hands
+    return frames
+
+
+def legacy_segments(frames, margin_frame=1, delay_frames=3, min_length_frames=5):
+    """Máquina de estados copiada en main.py / app.py antes de SignSegmenter"""
+    kp_seq, segments = [], []
+    count_frame, fix_frames, recording = 0, 0, False
+    for keypoints in frames:
+        if keypoints[LEFT_HAND_SLICE.start] or recording:
+            recording = False
+            count_frame += 1
+            if count_frame > margin_frame:
+                kp_seq.append(keypoints)
+        else:
+            if count_frame >= min_length_frames + margin_frame:
+                fix_frames += 1
+                if fix_frames < delay_frames:
+                    recording = True
+                    continue
+                segment = kp_seq[: - (margin_frame + delay_frames)]
+                if len(segment) >= min_length_frames:
+                    segments.append(np.array(segment))
+            recording, fix_frames, count_frame, kp_seq = False, 0, 0, []
+    return segments
+
+
+def run(segmenter, frames):
+    segments = [segmenter.push_keypoints(keypoints) for keypoints in frames]
+    return [segment for segment in segments if segment is not None]
+
+
+class TestSignSegmenter:
+    """Tests para SignSegmenter"""
+    
+    def test_single_sign(self):
+        """Verifica el recorte de margin_frame al inicio y margin + delay al final"""
+        frames = make_frames([0] * 3 + [1] * 12 + [0] * 6)
+        segments = run(SignSegmenter(1, 3, 5, 60), frames)
+        
+        assert len(segments) == 1
+        assert segments[0].dtype == np.float32
+        assert segments[0][0, 0] == 4
+        assert np.array_equal(segments[0], legacy_segments(frames)[0])
+    
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_legacy_state_machine(self, seed):
+        """Verifica que coincide con la lógica duplicada que reemplaza"""
+        rng = np.random.default_rng(seed)
+        hands = np.repeat(rng.random(40) < 0.6, rng.integers(1, 12, 40))
+        frames = make_frames(hands)
+        
+        segments = run(SignSegmenter(1, 3, 5, 10_000), frames)
+        expected = legacy_segments(frames)
+        
+        assert len(segments) == len(expected)
+        for segment, reference in zip(segments, expected):
+            assert np.array_equal(segment, reference)
+    
+    def test_short_sign_is_discarded(self):
+        """Verifica que no se emiten señas más cortas que min_length_frames"""
+        assert run(SignSegmenter(1, 3, 5, 60), make_frames([1] * 4 + [0] * 6)) == []
+    
+    def test_max_length_closes_sign(self):
+        """Verifica que se cierra la seña al llegar al máximo aunque sigan las manos"""
+        segmenter = SignSegmenter(1, 3, 5, 10)
+        segments = run(segmenter, make_frames([1] * 25))
+        
+        assert [len(segment) for segment in segments] == [10, 10]
+        assert segments[1][0, 0] == 11
+        assert len(segmenter) == 4
+    
+    def test_on_frame_callback(self):
+        """Verifica que on_frame recibe cada frame guardado con el largo del segmento"""
+        lengths = []
+        segmenter = SignSegmenter(1, 3, 5, 60, on_frame=lambda kp, length: lengths.append((kp[0], length)))
+        run(segmenter, make_frames([1] * 4))
+        
+        assert lengths == [(1, 1), (2, 2), (3, 3)]
+    
+    def test_push_mediapipe_results(self, mock_mediapipe_results):
+        """Verifica push con resultados de MediaPipe"""
+        segmenter = SignSegmenter(1, 3, 5, 60)
+        for _ in range(3):
+            assert segmenter.push(mock_mediapipe_results) is None
+        
+        assert len(segmenter) == 2
+        assert segmenter.count_frame == 3
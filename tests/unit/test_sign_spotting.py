@@ -0,0 +1,107 @@
+"""
+Tests unitarios para sign_spotting.py
+"""
+import pytest
+import numpy as np
+
+from helpers import KEYPOINTS_LENGTH, LEFT_HAND_SLICE, has_hands
+from sign_spotting import SignSpotter, SpottedSign
+
+N_CLASSES = 3
+
+
+def make_stream(labels):
+    """
+    Frames sintéticos: la clase va codificada en el primer valor de la mano
+    izquierda (0 = sin manos)
+    """
+    frames = np.zeros((len(labels), KEYPOINTS_LENGTH), dtype=np.float32)
+    frames[:, LEFT_HAND_SLICE.start] = labels
+    return frames
+
+
+def vote_model(batch):
+    """Modelo falso: probabilidad de cada clase = fracción de frames con esa etiqueta"""
+    labels = batch[:, :, LEFT_HAND_SLICE.start].round().astype(int)
+    return np.stack([(labels == c + 1).mean(axis=1) for c in range(N_CLASSES)], axis=1)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def spotter(calls):
+    def predict(batch):
+        calls.append(len(batch))
+        return vote_model(batch)
+    return SignSpotter(predict, window=10, stride=2, threshold=0.8, nms_frames=10,
+                       min_hand_ratio=0.5, batch_windows=1, frames=10)
+
+
+# Dos señas seguidas sin bajar las manos entre ellas
+LABELS = [0] * 5 + [1] * 20 + [3] * 20 + [0] * 15
+
+
+class TestSignSpotter:
+    """Tests para SignSpotter"""
+    
+    def test_has_hands(self):
+        """Verifica la detección de manos por frame"""
+        assert has_hands(make_stream([0, 2, 0])).tolist() == [False, True, False]
+    
+    def test_streaming_emits_one_event_per_sign(self, spotter):
+        """Verifica que la NMS deja una seña por tramo y respeta el orden"""
+        events = []
+        for frame in make_stream(LABELS):
+            events.extend(spotter.push(frame))
+        events.extend(spotter.flush())
+        
+        assert [event.word_index for event in events] == [0, 2]
+        assert all(event.confidence == pytest.approx(1.0) for event in events)
+        assert events[0].end_frame <= 25 and events[1].start_frame >= 25
+    
+    def test_events_before_hands_drop(self, spotter):
+        """Verifica que la primera seña se emite mientras la segunda sigue en curso"""
+        for n, frame in enumerate(make_stream(LABELS), start=1):
+            if spotter.push(frame):
+                break
+        
+        assert n < 45
+    
+    def test_spot_matches_streaming(self, spotter, calls):
+        """Verifica que la versión offline agrupa las ventanas y coincide con el flujo"""
+        frames = make_stream(LABELS)
+        streamed = [event for frame in frames for event in spotter.push(frame)] + spotter.flush()
+        calls.clear()
+        
+        assert spotter.spot(frames) == streamed
+        assert len(calls) == 1 and calls[0] > 1
+    
+    def test_skips_windows_without_hands(self, spotter, calls):
+        """Verifica que no se evalúan ventanas sin manos"""
+        for frame in make_stream([0] * 30):
+            spotter.push(frame)
+        
+        assert calls == []
+    
+    def test_batch_windows(self, calls):
+        """Verifica que en vivo se acumulan ventanas hasta batch_windows"""
+        spotter = SignSpotter(lambda batch: calls.append(len(batch)) or vote_model(batch),
+                              window=10, stride=2, threshold=0.8, nms_frames=10,
+                              min_hand_ratio=0.5, batch_windows=4, frames=10)
+        events = [event for frame in make_stream([1] * 30) for event in spotter.push(frame)]
+        
+        assert calls and set(calls) == {4}
+        assert [event.word_index for event in events + spotter.flush()] == [0]
+    
+    def test_resamples_windows(self):
+        """Verifica que ventanas más largas que el modelo se normalizan a sus frames"""
+        shapes = []
+        spotter = SignSpotter(lambda batch: shapes.append(batch.shape) or vote_model(batch),
+                              window=20, stride=5, threshold=0.8, nms_frames=10,
+                              min_hand_ratio=0.5, batch_windows=1, frames=15)
+        
+        assert spotter.spot(make_stream([2] * 30)) == [SpottedSign(1, 1.0, 0, 20)]
+        assert shapes == [(3, 15, KEYPOINTS_LENGTH)]
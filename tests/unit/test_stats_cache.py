@@ -0,0 +1,167 @@
+"""
+Tests unitarios para stats_cache.py
+"""
+import pytest
+
+from stats_cache import MemoryCache, StatsCache, create_cache_backend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class DictRedis:
+    """Reemplazo local de redis.Redis: solo get/set(ex)/delete sobre bytes"""
+    
+    def __init__(self):
+        self.data = {}
+        self.set_calls = []
+    
+    def get(self, name):
+        return self.data.get(name)
+    
+    def set(self, name, value, ex=None):
+        assert isinstance(value, bytes)
+        assert ex is None or isinstance(ex, int)
+        self.set_calls.append((name, ex))
+        self.data[name] = value
+        return True
+    
+    def delete(self, *names):
+        return sum(self.data.pop(name, None) is not None for name in names)
+
+
+class BrokenBackend:
+    def get(self, name):
+        raise ConnectionError("redis caído")
+    
+    def set(self, name, value, ex=None):
+        raise ConnectionError("redis caído")
+    
+    def delete(self, *names):
+        raise ConnectionError("redis caído")
+
+
+class Counter:
+    """Función de cálculo que cuenta sus llamadas"""
+    
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def cache():
+    return StatsCache(MemoryCache(100), user_keys=('dashboard', 'stats'), global_keys=('system',), ttl_s=60)
+
+
+class TestMemoryCache:
+    """Tests para el almacenamiento en memoria"""
+    
+    def test_expires_after_ttl(self):
+        clock = FakeClock()
+        backend = MemoryCache(clock=clock)
+        backend.set('a', b'1', ex=10)
+        backend.set('b', b'2')
+        
+        clock.now = 9.9
+        assert backend.get('a') == b'1'
+        clock.now = 10.0
+        assert backend.get('a') is None
+        assert backend.get('b') == b'2'
+    
+    def test_evicts_least_recently_used(self):
+        backend = MemoryCache(max_entries=2)
+        backend.set('a', b'1')
+        backend.set('b', b'2')
+        backend.get('a')
+        backend.set('c', b'3')
+        
+        assert backend.get('b') is None
+        assert backend.get('a') == b'1'
+        assert len(backend) == 2
+    
+    def test_delete_counts_existing_keys(self):
+        backend = MemoryCache()
+        backend.set('a', b'1')
+        assert backend.delete('a', 'missing') == 1
+
+
+class TestStatsCache:
+    """Tests para el caché de lectura"""
+    
+    def test_read_through(self, cache):
+        """El primer acceso calcula, los siguientes leen del caché"""
+        compute = Counter({'total_predictions': 3, 'top_words': [('HOLA', 2)]})
+        
+        first = cache.get_user(1, 'dashboard', compute)
+        second = cache.get_user(1, 'dashboard', compute)
+        
+        assert first == second == compute.value
+        assert compute.calls == 1
+        metrics = cache.metrics()
+        assert (metrics['hits'], metrics['misses']) == (1, 1)
+        assert metrics['hit_ratio'] == 0.5
+    
+    def test_cached_values_are_copies(self, cache):
+        """Modificar un valor retornado no altera el caché"""
+        cache.get_user(1, 'stats', lambda: {'top_words': []})['top_words'].append('x')
+        assert cache.get_user(1, 'stats', lambda: None) == {'top_words': []}
+    
+    def test_invalidate_user_and_global_keys(self, cache):
+        """Invalidar un usuario borra sus claves y las globales, no las de otros"""
+        user1, user2, system = Counter(1), Counter(2), Counter(3)
+        for _ in range(2):
+            cache.get_user(1, 'dashboard', user1)
+            cache.get_user(2, 'dashboard', user2)
+            cache.get_global('system', system)
+        
+        cache.invalidate([1])
+        cache.get_user(1, 'dashboard', user1)
+        cache.get_user(2, 'dashboard', user2)
+        cache.get_global('system', system)
+        
+        assert (user1.calls, user2.calls, system.calls) == (2, 1, 2)
+        assert cache.metrics()['invalidations'] == 1
+    
+    def test_rejects_undeclared_keys(self, cache):
+        with pytest.raises(ValueError):
+            cache.get_user(1, 'history', lambda: None)
+        with pytest.raises(ValueError):
+            cache.get_global('dashboard', lambda: None)
+    
+    def test_redis_compatible_backend(self):
+        """Funciona con cualquier almacenamiento con la interfaz de Redis"""
+        backend = DictRedis()
+        cache = StatsCache(backend, user_keys=('stats',), global_keys=('system',), ttl_s=0.5)
+        compute = Counter({'avg_confidence': 0.9})
+        
+        assert cache.get_user(7, 'stats', compute) == compute.value
+        assert cache.get_user(7, 'stats', compute) == compute.value
+        assert compute.calls == 1
+        assert backend.set_calls == [('lsch:stats:user:7:stats', 1)]
+        
+        cache.invalidate([7])
+        assert backend.data == {}
+    
+    def test_backend_errors_fall_back_to_compute(self):
+        """Si el almacenamiento falla se calcula igual"""
+        cache = StatsCache(BrokenBackend(), user_keys=('stats',), ttl_s=60)
+        compute = Counter(42)
+        
+        assert cache.get_user(1, 'stats', compute) == 42
+        cache.invalidate([1])
+        assert compute.calls == 1
+        assert cache.metrics()['errors'] == 3
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_cache_backend('memcached')
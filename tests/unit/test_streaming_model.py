@@ -0,0 +1,81 @@
+"""
+Tests unitarios para streaming_model.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+
+from helpers import normalize_keypoints
+from streaming_model import StreamingModel
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    """Misma estructura que model.get_model, en pequeño"""
+    tf.keras.utils.set_random_seed(0)
+    return tf.keras.Sequential([
+        tf.keras.Input(shape=(15, 12)),
+        tf.keras.layers.LSTM(8, return_sequences=True),
+        tf.keras.layers.Dropout(0.5),
+        tf.keras.layers.LSTM(6),
+        tf.keras.layers.Dropout(0.5),
+        tf.keras.layers.Dense(5, activation='relu'),
+        tf.keras.layers.Dense(4, activation='softmax'),
+    ])
+
+
+@pytest.fixture(scope="module")
+def streaming(keras_model):
+    return StreamingModel(keras_model, frames=15)
+
+
+def reference(keras_model, sequence):
+    """Modelo batch sobre la secuencia normalizada, como en app.py"""
+    return keras_model.predict(normalize_keypoints(sequence, 15)[None], verbose=0)[0]
+
+
+class TestStreamingModel:
+    """Tests para StreamingModel y KeypointStream"""
+    
+    @pytest.mark.parametrize("length", [5, 15, 23, 40])
+    def test_matches_batch_model(self, keras_model, streaming, length):
+        """Verifica que interpolar y submuestrear las proyecciones equivale al modelo batch"""
+        sequence = np.random.default_rng(length).random((length, 12), dtype=np.float32)
+        stream = streaming.new_stream(capacity=4)
+        for keypoints in sequence:
+            stream.push(keypoints)
+        
+        assert len(stream) == length
+        assert np.allclose(stream.probabilities(), reference(keras_model, sequence), atol=1e-5)
+    
+    def test_running_probabilities(self, keras_model, streaming):
+        """Verifica las probabilidades en curso y el recorte del final del segmento"""
+        sequence = np.random.default_rng(1).random((20, 12), dtype=np.float32)
+        stream = streaming.new_stream()
+        for n, keypoints in enumerate(sequence, start=1):
+            stream.push(keypoints)
+            if n in (6, 13):
+                assert np.allclose(stream.probabilities(), reference(keras_model, sequence[:n]), atol=1e-5)
+        
+        assert np.allclose(stream.probabilities(16), reference(keras_model, sequence[:16]), atol=1e-5)
+    
+    def test_reset(self, streaming):
+        """Verifica que reset descarta el segmento"""
+        stream = streaming.new_stream()
+        stream.push(np.ones(12, dtype=np.float32))
+        stream.reset()
+        
+        assert len(stream) == 0
+        with pytest.raises(ValueError):
+            stream.probabilities()
+    
+    def test_rejects_unsupported_layers(self):
+        """Verifica que solo se aceptan modelos LSTM/Dropout/Dense"""
+        model = tf.keras.Sequential([
+            tf.keras.Input(shape=(15, 12)),
+            tf.keras.layers.GRU(8),
+            tf.keras.layers.Dense(4, activation='softmax'),
+        ])
+        with pytest.raises(ValueError):
+            StreamingModel(model)
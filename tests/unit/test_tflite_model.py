@@ -0,0 +1,74 @@
+"""
+Tests unitarios para tflite_model.py y la exportación de model_export.py
+"""
+import pytest
+import numpy as np
+
+tf = pytest.importorskip("tensorflow")
+
+from inference_backend import load_inference_model
+from model_export import export_tflite
+from tflite_model import TFLiteModel
+
+
+@pytest.fixture(scope="module")
+def keras_path(tmp_path_factory):
+    """LSTM pequeño guardado como .keras"""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(15, 12)),
+        tf.keras.layers.LSTM(8),
+        tf.keras.layers.Dense(4, activation='softmax'),
+    ])
+    path = tmp_path_factory.mktemp("models") / "model.keras"
+    model.save(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def keras_model(keras_path):
+    return tf.keras.models.load_model(keras_path, compile=False)
+
+
+@pytest.fixture
+def batch():
+    return np.random.default_rng(0).random((5, 15, 12), dtype=np.float32)
+
+
+class TestTFLiteModel:
+    """Tests para la exportación y el backend TFLite"""
+    
+    @pytest.mark.parametrize("quantization, atol", [('none', 1e-5), ('float16', 1e-3), ('dynamic', 1e-2)])
+    def test_export_matches_keras(self, keras_path, keras_model, batch, quantization, atol):
+        """Verifica que cada cuantización reproduce las probabilidades de Keras"""
+        path = export_tflite(keras_path, quantization=quantization)
+        model = TFLiteModel(path)
+        
+        assert model.input_shape == (15, 12)
+        assert model.n_classes == 4
+        assert np.allclose(model.predict_batch(batch), keras_model.predict(batch, verbose=0), atol=atol)
+    
+    def test_default_paths(self, keras_path):
+        """Verifica los nombres de archivo por cuantización"""
+        assert export_tflite(keras_path).name == "model.tflite"
+        assert export_tflite(keras_path, quantization='dynamic').name == "model.int8.tflite"
+    
+    def test_predict_one_reuses_buffers(self, keras_path, batch):
+        """Verifica que llamadas sucesivas no se contaminan al reutilizar los tensores"""
+        model = TFLiteModel(export_tflite(keras_path))
+        expected = model.predict_batch(batch)
+        
+        for i in (4, 0, 2):
+            assert np.array_equal(model.predict_one(batch[i]), expected[i])
+    
+    def test_rejects_wrong_shape(self, keras_path):
+        """Verifica que se rechazan entradas con otra cantidad de frames"""
+        model = TFLiteModel(export_tflite(keras_path), warmup=False)
+        with pytest.raises(ValueError):
+            model.predict_one(np.zeros((10, 12), dtype=np.float32))
+    
+    def test_load_inference_model(self, keras_path):
+        """Verifica la selección de backend"""
+        assert isinstance(load_inference_model('tflite', export_tflite(keras_path)), TFLiteModel)
+        with pytest.raises(ValueError):
+            load_inference_model('pytorch', keras_path)
@@ -0,0 +1,113 @@
+"""
+tflite_model.py - Backend de inferencia TFLite
+==============================================
+
+Ejecuta el modelo exportado con `model_export.py tflite` usando el intérprete
+liviano de TFLite, sin importar TensorFlow completo cuando está disponible
+`ai_edge_litert` o `tflite_runtime`.
+
+El modelo se exporta con batch fijo 1 (el LSTM de TFLite fusionado no admite
+redimensionar el batch): los tensores de entrada/salida se reservan una vez y
+`predict_batch` recorre las secuencias reutilizándolos.
+
+Uso:
+    from tflite_model import TFLiteModel
+    
+    model = TFLiteModel("models/actions_15.tflite")
+    probabilities = model.predict_one(kp_seq)    # (n_clases,)
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+
+
+class TFLiteModel:
+    """
+    Modelo TFLite con la misma interfaz que `InferenceModel`
+    """
+    
+    def __init__(self, path: Union[str, Path], num_threads: int = None, warmup: bool = True):
+        """
+        Args:
+            path: Archivo `.tflite`
+            num_threads: Hilos del intérprete (None = default de TFLite)
+            warmup: Ejecuta una predicción inicial al cargar
+        """
+        self.path = Path(path)
+        self.interpreter = Interpreter(model_path=str(self.path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        if input_details['shape'][0] != 1:
+            raise ValueError(f"Se esperaba un modelo con batch 1, input {input_details['shape']}")
+        
+        self.input_shape = tuple(int(dim) for dim in input_details['shape'][1:])
+        self.n_classes = int(output_details['shape'][-1])
+        # Vistas sobre los buffers del intérprete: se piden en cada uso (no pueden vivir durante invoke)
+        self._input = self.interpreter.tensor(input_details['index'])
+        self._output = self.interpreter.tensor(output_details['index'])
+        self._lock = threading.Lock()
+        
+        if warmup:
+            self.warmup()
+    
+    def warmup(self) -> float:
+        """Ejecuta una predicción con ceros y retorna los segundos que tomó"""
+        start = time.perf_counter()
+        self.predict_one(np.zeros(self.input_shape, dtype=np.float32))
+        elapsed = time.perf_counter() - start
+        logger.info(f"Modelo TFLite listo: {self.path.name}, input {self.input_shape}, warmup {elapsed * 1000:.0f}ms")
+        return elapsed
+    
+    def _invoke(self, sequence: np.ndarray, out: np.ndarray):
+        self._input()[0] = sequence
+        self.interpreter.invoke()
+        out[:] = self._output()[0]
+    
+    def predict_batch(self, batch) -> np.ndarray:
+        """
+        Predice un batch de secuencias normalizadas
+        
+        Args:
+            batch: (batch, frames, 1662)
+        
+        Returns:
+            np.ndarray: Probabilidades (batch, n_clases) float32
+        """
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.ndim != 3 or batch.shape[1:] != self.input_shape:
+            raise ValueError(f"Se esperaba un batch (n, {self.input_shape[0]}, {self.input_shape[1]}), recibido {batch.shape}")
+        
+        out = np.empty((len(batch), self.n_classes), dtype=np.float32)
+        with self._lock:
+            for sequence, row in zip(batch, out):
+                self._invoke(sequence, row)
+        return out
+    
+    def predict_one(self, sequence) -> np.ndarray:
+        """
+        Predice una secuencia normalizada (frames, 1662)
+        
+        Returns:
+            np.ndarray: Probabilidades (n_clases,) float32
+        """
+        return self.predict_batch(np.expand_dims(sequence, axis=0))[0]
+    
+    __call__ = predict_batch
@@ -12,14 +12,13 @@ from pathlib import Path
 
 # TensorFlow 2.15+ imports
 import tensorflow as tf
-from keras.preprocessing.sequence import pad_sequences
 from keras.callbacks import EarlyStopping, ModelCheckpoint, ReduceLROnPlateau
-from keras.utils import to_categorical
 from sklearn.model_selection import train_test_split
 
 # Imports del proyecto
 from model import get_model
 from helpers import get_word_ids, get_sequences_and_labels
+from keypoints_pipeline import make_dataset
 from config_manager import config
 
 # Configurar logging
@@ -30,6 +29,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def split_train_validation(labels):
+    """
+    Divide las muestras en entrenamiento y validación
+    
+    Usa validation_split y random_seed de config, de modo que
+    `model_export.py parity` evalúa exactamente la validación del entrenamiento.
+    
+    Args:
+        labels: Etiqueta de cada muestra
+    
+    Returns:
+        tuple: (train_idx, val_idx) índices en el orden de labels
+    """
+    return train_test_split(
+        np.arange(len(labels)),
+        test_size=config.training.validation_split,
+        random_state=config.training.random_seed,
+        stratify=labels  # Mantiene proporción de clases
+    )
+
+
 def training_model(model_path: str = None, epochs: int = None, verbose: int = 1):
     """
     Entrena el modelo LSTM para clasificación de señas
@@ -68,36 +88,26 @@ def training_model(model_path: str = None, epochs: int = None, verbose: int = 1)
     if len(sequences) == 0:
         raise ValueError("No se encontraron datos de entrenamiento. Ejecute create_keypoints.py primero.")
     
-    # 3. Padding/truncating de secuencias a tamaño fijo
-    logger.info(f"\n⚙️  Normalizando secuencias a {config.model.frames} frames...")
-    sequences = pad_sequences(
-        sequences,
-        maxlen=config.model.frames,
-        padding='pre',
-        truncating='post',
-        dtype='float32'  # Cambiado de float16 a float32 para mejor precisión
-    )
+    # 3. Split train/validation (sobre índices: las secuencias siguen en el memmap)
+    labels = np.asarray(labels, dtype=np.int32)
+    train_idx, val_idx = split_train_validation(labels)
     
-    # 4. Preparar datos
-    X = np.array(sequences)
-    y = to_categorical(labels, num_classes=len(word_ids)).astype(int)
-    
-    logger.info(f"Shape de X: {X.shape}")
-    logger.info(f"Shape de y: {y.shape}")
+    logger.info(f"\n📈 División de datos:")
+    logger.info(f"  Entrenamiento: {len(train_idx)} muestras ({(1-config.training.validation_split)*100:.0f}%)")
+    logger.info(f"  Validación: {len(val_idx)} muestras ({config.training.validation_split*100:.0f}%)")
     
-    # 5. Split train/validation
-    X_train, X_val, y_train, y_val = train_test_split(
-        X, y,
-        test_size=config.training.validation_split,
-        random_state=config.training.random_seed,
-        stratify=labels  # Mantiene proporción de clases
+    # 4. Pipelines tf.data: normalización a tamaño fijo, cache, shuffle y prefetch
+    logger.info(f"\n⚙️  Normalizando secuencias a {config.model.frames} frames...")
+    train_ds = make_dataset(
+        [sequences[i] for i in train_idx], labels[train_idx],
+        training=True, name='train'
+    )
+    val_ds = make_dataset(
+        [sequences[i] for i in val_idx], labels[val_idx],
+        name='validation'
     )
     
-    logger.info(f"\n📈 División de datos:")
-    logger.info(f"  Entrenamiento: {len(X_train)} muestras ({(1-config.training.validation_split)*100:.0f}%)")
-    logger.info(f"  Validación: {len(X_val)} muestras ({config.training.validation_split*100:.0f}%)")
-    
-    # 6. Callbacks
+    # 5. Callbacks
     logger.info("\n🔧 Configurando callbacks...")
     
     callbacks = [
@@ -127,28 +137,27 @@ def training_model(model_path: str = None, epochs: int = None, verbose: int = 1)
         )
     ]
     
-    # 7. Construir modelo
+    # 6. Construir modelo
     logger.info("\n🧠 Construyendo modelo...")
     model = get_model(config.model.frames, len(word_ids))
     
     if verbose >= 1:
         model.summary()
     
-    # 8. Entrenar
+    # 7. Entrenar
     logger.info("\n🚀 Iniciando entrenamiento...")
     logger.info(f"Epochs máximos: {epochs}")
     logger.info(f"Batch size: {config.training.batch_size}")
     
     history = model.fit(
-        X_train, y_train,
-        validation_data=(X_val, y_val),
+        train_ds,
+        validation_data=val_ds,
         epochs=epochs,
-        batch_size=config.training.batch_size,
         callbacks=callbacks,
         verbose=verbose
     )
     
-    # 9. Resultados finales
+    # 8. Resultados finales
     logger.info("\n" + "=" * 70)
     logger.info("✓ ENTRENAMIENTO COMPLETADO")
     logger.info("=" * 70)
@@ -176,7 +185,7 @@ if __name__ == "__main__":
         
         logger.info("\n✅ Proceso completado exitosamente")
         logger.info("Siguiente paso: ejecute evaluate_model.py para probar el modelo")
-        
+    
     except Exception as e:
         logger.error(f"\n❌ Error durante el entrenamiento: {e}", exc_info=True)
         raise
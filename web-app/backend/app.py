@@ -4,17 +4,17 @@ Reconocimiento de Lengua de Señas Chilenas en tiempo real
 Con autenticación de usuarios - Production Ready for Railway
 """
 
+import atexit
+import json
 import os
 import sys
-import cv2
-import base64
+import time
 import numpy as np
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory, redirect, url_for, flash
+from datetime import datetime, timezone
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, redirect, url_for, flash, stream_with_context
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-import mediapipe as mp
 
 # Cargar variables de entorno para producción
 from dotenv import load_dotenv
@@ -23,28 +23,27 @@ load_dotenv()
 # Añadir directorio raíz al path para imports
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-# Try dynamic imports to avoid static analysis issues (e.g. linters unable to resolve tensorflow.keras)
-try:
-    import importlib
-    tf_keras = importlib.import_module('tensorflow.keras')
-    load_model = tf_keras.models.load_model
-except Exception:
-    try:
-        import importlib
-        keras_mod = importlib.import_module('keras')
-        load_model = keras_mod.models.load_model
-    except Exception:
-        load_model = None
-        import sys as _sys
-        _sys.stderr.write("Warning: could not import load_model from tensorflow.keras or keras. Model loading will be disabled.\n")
-
-from helpers import mediapipe_detection, extract_keypoints, there_hand
-from evaluate_model import normalize_keypoints
+from helpers import mediapipe_detection, extract_keypoints, has_hands, there_hand, normalize_keypoints
 from config_manager import ConfigManager
+from frame_codec import decode_frame
+from frame_pipeline import FramePipeline, PipelineStage
+from frame_rate_controller import FrameRateController
+from holistic_pool import HolisticPool
+from keypoint_codec import VERSION as KEYPOINTS_VERSION, LAYOUT_NAMES, decode_keypoints
+from prediction_sink import PredictionSink
+from stats_cache import MemoryCache, StatsCache, create_cache_backend
+from inference_backend import load_inference_model
+from inference_server import BatchInferenceServer
+from streaming_model import StreamingModel
+from sign_segmenter import SignSegmenter
+from sign_spotting import SignSpotter
 from logger_config import get_logger
 
 # Importar modelos de base de datos
-from models import db, User, Prediction
+from models import (
+    db, User, create_tables, decode_prediction_cursor, encode_prediction_cursor, get_system_stats,
+    get_user_stats, insert_predictions, iter_user_predictions, query_user_predictions
+)
 
 # Configuración
 logger = get_logger(__name__)
@@ -91,23 +90,94 @@ login_manager.login_message_category = 'error'
 def load_user(user_id):
     return User.query.get(int(user_id))
 
-# Inicializar MediaPipe y Modelo
-holistic_model = mp.solutions.holistic.Holistic(
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+# Inicializar MediaPipe y Modelo: una instancia Holistic por sesión activa (tracking propio)
+holistic_pool = HolisticPool()
 
+# Backend keras o tflite según config.inference.backend; sin modelo la inferencia queda deshabilitada
 try:
-    model = load_model(config.get_model_path())
-    logger.info(f"Modelo cargado: {config.get_model_path()}")
+    model = load_inference_model(config.inference.backend, config.get_inference_model_path())
+    logger.info(f"Modelo cargado ({config.inference.backend}): {config.get_inference_model_path()}")
 except Exception as e:
     logger.error(f"Error cargando modelo: {e}")
     model = None
 
+# Inferencia compartida entre sesiones: agrupa las secuencias en micro-batches
+inference_server = None
+if model is not None:
+    inference_server = BatchInferenceServer(
+        model.predict_batch,
+        max_batch_size=config.inference.max_batch_size,
+        max_wait_ms=config.inference.max_wait_ms
+    )
+    inference_server.start()
+
+# Inferencia incremental: cada sesión proyecta sus frames a medida que llegan
+streaming_model = None
+if config.inference.get('streaming', False):
+    try:
+        streaming_model = StreamingModel(config.get_model_path())
+        logger.info("Inferencia incremental por sesión habilitada")
+    except Exception as e:
+        logger.error(f"Error cargando modelo incremental: {e}")
+
+# Caché de estadísticas (dashboard y /api/*/stats), invalidado al guardar predicciones
+try:
+    cache_backend = create_cache_backend()
+except Exception as e:
+    logger.error(f"Error creando caché {config.cache.backend}, se usa memoria: {e}")
+    cache_backend = MemoryCache(config.cache.max_entries)
+stats_cache = StatsCache(cache_backend, user_keys=('dashboard', 'stats'), global_keys=('system',))
+
+# Escritura diferida: las predicciones se insertan por lotes en un hilo aparte,
+# el pipeline nunca espera a la base de datos
+def write_predictions(rows):
+    with app.app_context():
+        insert_predictions(rows)
+    stats_cache.invalidate(row['user_id'] for row in rows)
+
+
+prediction_sink = PredictionSink(write_predictions)
+prediction_sink.start()
+atexit.register(prediction_sink.close)
+
 # Variables globales para sesión
 sessions = {}
 
 
+def predict_windows(batch):
+    """Ventanas del detector continuo vía el servidor de inferencia compartido"""
+    futures = [inference_server.submit(window) for window in batch]
+    return np.stack([future.result() for future in futures])
+
+
+def stream_frames(stream, sid):
+    """on_frame del segmentador: proyecta cada frame y envía la predicción en curso"""
+    partial_every = config.inference.get('streaming_partial_every', 0)
+    
+    def on_frame(keypoints, length):
+        if length == 1:
+            stream.reset()
+        stream.push(keypoints)
+        if partial_every and length % partial_every == 0:
+            emit_partial_prediction(sid, stream.probabilities())
+    
+    return on_frame
+
+
+def new_session_state(sid, user_id=None) -> dict:
+    """Estado inicial de reconocimiento de una sesión WebSocket"""
+    use_spotting = config.spotting.enabled and inference_server is not None
+    stream = streaming_model.new_stream() if streaming_model else None
+    return {
+        'segmenter': SignSegmenter(on_frame=stream_frames(stream, sid) if stream is not None else None),
+        'stream': stream,
+        'spotter': SignSpotter(predict_windows) if use_spotting else None,
+        'rate': FrameRateController(),
+        'sentence': [],
+        'user_id': user_id
+    }
+
+
 @app.route('/')
 def index():
     """Página principal"""
@@ -239,32 +309,16 @@ def logout():
 @login_required
 def dashboard():
     """Dashboard del usuario"""
-    # Obtener estadísticas del usuario
-    total_predictions = Prediction.query.filter_by(user_id=current_user.id).count()
-    
-    # Últimas predicciones
-    recent_predictions = Prediction.query.filter_by(user_id=current_user.id)\
-        .order_by(Prediction.timestamp.desc())\
-        .limit(10)\
-        .all()
-    
-    # Calcular promedio de confianza
-    all_predictions = Prediction.query.filter_by(user_id=current_user.id).all()
-    avg_confidence = sum(p.confidence for p in all_predictions) / len(all_predictions) if all_predictions else 0
-    
-    # Palabras más usadas
-    word_counts = {}
-    for pred in all_predictions:
-        word_counts[pred.word] = word_counts.get(pred.word, 0) + 1
-    
-    top_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Estadísticas desde las tablas de resumen, en caché hasta la próxima predicción
+    user_id = current_user.id
+    stats = stats_cache.get_user(user_id, 'dashboard', lambda: get_user_stats(user_id, top_words=5))
     
     return render_template('dashboard.html',
                          user=current_user,
-                         total_predictions=total_predictions,
-                         recent_predictions=recent_predictions,
-                         avg_confidence=avg_confidence,
-                         top_words=top_words)
+                         total_predictions=stats['total_predictions'],
+                         recent_predictions=stats['recent_predictions'],
+                         avg_confidence=stats['avg_confidence'],
+                         top_words=stats['top_words'])
 
 
 @app.route('/css/<path:filename>')
@@ -312,7 +366,7 @@ def health_check():
             response['vocabulary_size'] = 0
         
         return jsonify(response), 200
-        
+    
     except Exception as e:
         # Fallback - siempre responde 200 para Railway
         return jsonify({
@@ -322,6 +376,137 @@ def health_check():
         }), 200
 
 
+@app.route('/api/inference/metrics', methods=['GET'])
+def inference_metrics():
+    """Métricas del servidor de inferencia (cola, tamaños de batch, latencias)"""
+    if inference_server is None:
+        return jsonify({'error': 'Modelo no cargado'}), 503
+    return jsonify(inference_server.metrics())
+
+
+@app.route('/api/holistic/metrics', methods=['GET'])
+def holistic_metrics():
+    """Métricas del pool de MediaPipe Holistic (tamaño, utilización, esperas)"""
+    return jsonify(holistic_pool.metrics())
+
+
+@app.route('/api/pipeline/metrics', methods=['GET'])
+def pipeline_metrics():
+    """Métricas del pipeline de frames (colas, descartes y latencia por etapa)"""
+    return jsonify(frame_pipeline.metrics())
+
+
+@app.route('/api/persistence/metrics', methods=['GET'])
+def persistence_metrics():
+    """Métricas de la escritura diferida de predicciones (cola, lotes, descartes y reintentos)"""
+    return jsonify(prediction_sink.metrics())
+
+
+@app.route('/api/cache/metrics', methods=['GET'])
+def cache_metrics():
+    """Métricas del caché de estadísticas (aciertos, fallos, invalidaciones)"""
+    return jsonify(stats_cache.metrics())
+
+
+@app.route('/api/user/stats', methods=['GET'])
+@login_required
+def user_stats():
+    """Estadísticas del usuario actual"""
+    user_id = current_user.id
+    return jsonify({
+        'user_id': user_id,
+        'username': current_user.username,
+        'stats': stats_cache.get_user(user_id, 'stats', lambda: get_user_stats(user_id))
+    })
+
+
+def _utc_datetime(value):
+    """ISO 8601 a datetime UTC sin zona, como se guardan los timestamps"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _typed_arg(args, name, type_, default=None):
+    """
+    Parámetro de la petición convertido con `type_`
+    
+    Raises:
+        ValueError: Si el valor no se puede convertir
+    """
+    value = args.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return type_(value)
+    except ValueError:
+        raise ValueError(f"{name} inválido: {value}") from None
+
+
+def _prediction_filters(args):
+    """Filtros del historial desde los parámetros de la petición"""
+    return {
+        'word': args.get('word') or None,
+        'session_id': args.get('session_id') or None,
+        'min_confidence': _typed_arg(args, 'min_confidence', float),
+        'max_confidence': _typed_arg(args, 'max_confidence', float),
+        'since': _typed_arg(args, 'since', _utc_datetime),
+        'until': _typed_arg(args, 'until', _utc_datetime),
+    }
+
+
+@app.route('/api/user/predictions', methods=['GET'])
+@login_required
+def user_predictions():
+    """
+    Historial de predicciones del usuario actual, de la más reciente a la más antigua
+    
+    Parámetros: limit (máx. config.history.max_limit), cursor (next_cursor de
+    la página anterior), word, min_confidence, max_confidence, session_id,
+    since y until (ISO 8601, UTC; rango [since, until)).
+    Con format=ndjson (o Accept: application/x-ndjson) transmite todo el
+    historial filtrado desde el cursor, una predicción JSON por línea.
+    """
+    history = config.history
+    try:
+        filters = _prediction_filters(request.args)
+        after = decode_prediction_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        limit = _typed_arg(request.args, 'limit', int, history.default_limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not 1 <= limit <= history.max_limit:
+        return jsonify({'error': f'limit debe estar entre 1 y {history.max_limit}'}), 400
+    user_id = current_user.id
+    
+    if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+        def generate():
+            predictions = iter_user_predictions(user_id, after=after, batch_size=history.export_batch_size, **filters)
+            for prediction in predictions:
+                yield json.dumps(prediction.to_dict(), ensure_ascii=False) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+            'Content-Disposition': 'attachment; filename=predicciones.ndjson'
+        })
+    
+    # Una fila extra indica si hay página siguiente
+    rows = query_user_predictions(user_id, after=after, **filters).limit(limit + 1).all()
+    page = rows[:limit]
+    return jsonify({
+        'predictions': [prediction.to_dict() for prediction in page],
+        'next_cursor': encode_prediction_cursor(page[-1]) if len(rows) > limit else None
+    })
+
+
+@app.route('/api/system/stats', methods=['GET'])
+def system_stats():
+    """Estadísticas generales del sistema"""
+    return jsonify({
+        'system_stats': stats_cache.get_global('system', get_system_stats),
+        'timestamp': datetime.now().isoformat()
+    })
+
+
 @app.route('/api/vocabulary', methods=['GET'])
 def get_vocabulary():
     """Obtener vocabulario disponible"""
@@ -339,21 +524,31 @@ def get_vocabulary():
 @app.route('/api/predict-frame', methods=['POST'])
 def predict_frame():
     """
-    Predecir seña desde un frame individual (base64)
+    Predecir seña desde un frame individual
+    
+    Acepta la imagen como cuerpo binario (image/jpeg, image/webp,
+    application/octet-stream) o como JSON {"frame": data URL base64}.
     """
     try:
-        data = request.get_json()
-        
-        if 'frame' not in data:
-            return jsonify({'error': 'No frame provided'}), 400
+        if request.mimetype.startswith('image/') or request.mimetype == 'application/octet-stream':
+            payload = request.get_data()
+        else:
+            data = request.get_json(silent=True) or {}
+            if 'frame' not in data:
+                return jsonify({'error': 'No frame provided'}), 400
+            payload = data['frame']
         
-        # Decodificar imagen base64
-        img_data = base64.b64decode(data['frame'].split(',')[1])
-        nparr = np.frombuffer(img_data, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        try:
+            frame = decode_frame(payload)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Procesar con MediaPipe
-        results = mediapipe_detection(frame, holistic_model)
+        # Procesar con MediaPipe (imagen suelta: instancia sin afinidad)
+        try:
+            with holistic_pool.checkout(timeout=config.mediapipe.pool_checkout_timeout_s) as holistic:
+                results = mediapipe_detection(frame, holistic)
+        except TimeoutError as e:
+            return jsonify({'error': str(e)}), 503
         
         # Verificar si hay manos
         has_hands = there_hand(results)
@@ -369,7 +564,7 @@ def predict_frame():
         }
         
         return jsonify(response)
-        
+    
     except Exception as e:
         logger.error(f"Error en predict_frame: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -381,133 +576,235 @@ def handle_connect():
     logger.info(f"Cliente conectado: {request.sid}")
     
     # Inicializar sesión
-    sessions[request.sid] = {
-        'kp_seq': [],
-        'count_frame': 0,
-        'fix_frames': 0,
-        'recording': False,
-        'sentence': [],
-        'user_id': current_user.id if current_user.is_authenticated else None
-    }
+    sessions[request.sid] = new_session_state(request.sid, current_user.id if current_user.is_authenticated else None)
     
-    emit('connected', {'message': 'Conectado al servidor LSP'})
+    emit('connected', {
+        'message': 'Conectado al servidor LSP',
+        # Modo de landmarks en el cliente (evento process_keypoints, ver keypoint_codec.py)
+        'keypoints_protocol': {
+            'version': KEYPOINTS_VERSION,
+            'layouts': list(LAYOUT_NAMES),
+            'min_detection_confidence': config.mediapipe.min_detection_confidence,
+            'min_tracking_confidence': config.mediapipe.min_tracking_confidence,
+        } if config.server.client_keypoints else None
+    })
 
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Cliente desconectado"""
     logger.info(f"Cliente desconectado: {request.sid}")
+    holistic_pool.release_session(request.sid)
     if request.sid in sessions:
         del sessions[request.sid]
 
 
+def emit_partial_prediction(sid, probabilities):
+    """Envía la predicción en curso del segmento (no se guarda ni se agrega a la frase)"""
+    word_idx = int(np.argmax(probabilities))
+    word_id = config.get_word_ids()[word_idx].split('-')[0]
+    socketio.emit('partial_prediction', {
+        'word': config.get_word_label(word_id),
+        'word_id': word_id,
+        'confidence': float(probabilities[word_idx])
+    }, to=sid)
+
+
+def emit_word(sid, session, word_idx: int, confidence: float):
+    """
+    Agrega la palabra reconocida a la frase y la envía al cliente
+    
+    Returns:
+        dict: Campos de la Prediction a guardar, o None si el usuario no está autenticado
+    """
+    word_ids = config.get_word_ids()
+    word_id = word_ids[word_idx].split('-')[0]
+    word_label = config.get_word_label(word_id)
+    
+    session['sentence'].insert(0, word_label)
+    
+    # Enviar predicción
+    socketio.emit('prediction', {
+        'word': word_label,
+        'word_id': word_id,
+        'confidence': confidence,
+        'sentence': session['sentence'][:5]  # Últimas 5 palabras
+    }, to=sid)
+    
+    logger.info(f"Predicción: {word_label} ({confidence:.2%})")
+    
+    if not session.get('user_id'):
+        return None
+    return {
+        'user_id': session['user_id'],
+        'word': word_label,
+        'word_id': word_id,
+        'confidence': confidence,
+        'session_id': sid,
+        'timestamp': datetime.utcnow()
+    }
+
+
+# ==================== PIPELINE DE FRAMES ====================
+# receive (handler) -> decode -> landmarks -> segmentation -> inference (-> prediction_sink)
+# Cada etapa corre en sus hilos; los frames de una sesión van siempre al mismo hilo.
+# Hasta landmarks el último frame de cada sesión gana: los pendientes se descartan.
+# Los mensajes llevan el instante de recepción para medir la latencia por sesión.
+
+def decode_stage(sid, message):
+    """Imagen (binaria o base64) o mensaje de keypoints del cliente"""
+    kind, payload, received_at = message
+    if kind == 'keypoints':
+        return 'keypoints', decode_keypoints(payload), received_at
+    return 'frame', decode_frame(payload), received_at
+
+
+def landmark_stage(sid, message):
+    """MediaPipe Holistic con la instancia de la sesión (conserva su tracking)"""
+    kind, data, received_at = message
+    if kind == 'keypoints':
+        return data, received_at
+    if sid not in sessions:
+        return None
+    try:
+        with holistic_pool.checkout(sid, timeout=config.mediapipe.pool_checkout_timeout_s) as holistic:
+            results = mediapipe_detection(data, holistic)
+    except TimeoutError:
+        logger.warning(f"Frame descartado, pool Holistic saturado: {sid}")
+        return None
+    return extract_keypoints(results), received_at
+
+
+def segmentation_stage(sid, message):
+    """
+    Segmenta la seña y envía el estado
+    
+    Returns:
+        ('segment', secuencia normalizada), ('probabilities', p) si hay modelo
+        incremental, ('words', [(índice, confianza)]) del detector continuo, o None
+    """
+    keypoints, received_at = message
+    session = sessions.get(sid)
+    if session is None:
+        return None
+    
+    # Recomendación de fps y calidad JPEG para el cliente (una vez por intervalo)
+    feedback = session['rate'].processed((time.perf_counter() - received_at) * 1000)
+    if feedback is not None:
+        socketio.emit('stream_feedback', feedback, to=sid)
+    
+    # Reconocimiento continuo: ventana deslizante, sin esperar a que bajen las manos
+    spotter = session['spotter']
+    if spotter is not None:
+        signs = spotter.push(keypoints)
+        hands = bool(has_hands(keypoints))
+        socketio.emit('status', {
+            'recording': hands,
+            'frame_count': spotter.frame_count,
+            'has_hands': hands
+        }, to=sid)
+        return ('words', [(sign.word_index, sign.confidence) for sign in signs]) if signs else None
+    
+    # Segmentación por ausencia de manos (sign_segmenter, igual que main.py)
+    segmenter = session['segmenter']
+    kp_seq = segmenter.push_keypoints(keypoints)
+    if segmenter.recording:
+        return None  # Esperando delay_frames antes de cerrar la seña
+    
+    socketio.emit('status', {
+        'recording': segmenter.count_frame > 0,
+        'frame_count': segmenter.count_frame,
+        'has_hands': segmenter.count_frame > 0
+    }, to=sid)
+    
+    if kp_seq is None:
+        return None
+    if session['stream'] is not None:
+        # El stream se reinicia con la próxima seña: se evalúa aquí, en el hilo de la sesión
+        return 'probabilities', session['stream'].probabilities(len(kp_seq))
+    return 'segment', normalize_keypoints(kp_seq, config.model.frames)
+
+
+def inference_stage(sid, message):
+    """Clasifica el segmento, agrega las palabras a la frase, las envía y las encola para guardarlas"""
+    kind, data = message
+    if kind == 'segment':
+        kind, data = 'probabilities', inference_server.predict(data)
+    if kind == 'probabilities':
+        confidence = float(np.max(data))
+        if confidence <= config.evaluation.confidence_threshold:
+            return None
+        data = [(int(np.argmax(data)), confidence)]
+    
+    session = sessions.get(sid)
+    if session is None:
+        return None
+    for word_idx, confidence in data:
+        record = emit_word(sid, session, word_idx, confidence)
+        if record is not None:
+            prediction_sink.submit(record)
+    return None
+
+
+def report_pipeline_error(stage, sid, error):
+    socketio.emit('error', {'message': f'{stage}: {error}'}, to=sid)
+
+
+def count_dropped_frame(stage, sid, message):
+    session = sessions.get(sid)
+    if session is not None:
+        session['rate'].dropped()
+
+
+pipeline_settings = config.pipeline
+frame_pipeline = FramePipeline([
+    PipelineStage('decode', decode_stage, workers=pipeline_settings.decode_workers,
+                  queue_size=pipeline_settings.queue_size, policy=pipeline_settings.intake_policy,
+                  put_timeout=pipeline_settings.put_timeout_s),
+    PipelineStage('landmarks', landmark_stage, workers=pipeline_settings.landmark_workers or holistic_pool.max_size,
+                  queue_size=pipeline_settings.queue_size, policy=pipeline_settings.landmark_policy,
+                  put_timeout=pipeline_settings.put_timeout_s),
+    PipelineStage('segmentation', segmentation_stage, workers=pipeline_settings.segmentation_workers,
+                  queue_size=pipeline_settings.queue_size, put_timeout=pipeline_settings.put_timeout_s),
+    PipelineStage('inference', inference_stage, workers=pipeline_settings.inference_workers,
+                  queue_size=pipeline_settings.queue_size, put_timeout=pipeline_settings.put_timeout_s),
+], on_error=report_pipeline_error, on_drop=count_dropped_frame)
+frame_pipeline.start()
+
+
 @socketio.on('process_frame')
 def handle_frame(data):
     """
-    Procesar frame en tiempo real via WebSocket
+    Recibir frame via WebSocket: se encola en el pipeline y el handler retorna
+    
+    Binario (JPEG/WebP) o data URL base64 (clientes antiguos).
     """
-    try:
-        session = sessions.get(request.sid)
-        if not session:
-            emit('error', {'message': 'Sesión no encontrada'})
-            return
-        
-        # Decodificar frame
-        img_data = base64.b64decode(data['frame'].split(',')[1])
-        nparr = np.frombuffer(img_data, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        # Procesar con MediaPipe
-        results = mediapipe_detection(frame, holistic_model)
-        
-        # Parámetros de configuración
-        margin_frame = config.capture.margin_frame
-        delay_frames = config.capture.delay_frames
-        min_length_frames = config.model.min_length_frames
-        
-        # Lógica de reconocimiento (igual que main.py)
-        if there_hand(results) or session['recording']:
-            session['recording'] = False
-            session['count_frame'] += 1
-            
-            if session['count_frame'] > margin_frame:
-                keypoints = extract_keypoints(results)
-                session['kp_seq'].append(keypoints)
-            
-            # Enviar estado
-            emit('status', {
-                'recording': True,
-                'frame_count': session['count_frame'],
-                'has_hands': True
-            })
-            
-        else:
-            # No hay manos detectadas
-            if session['count_frame'] >= min_length_frames + margin_frame:
-                session['fix_frames'] += 1
-                
-                if session['fix_frames'] < delay_frames:
-                    session['recording'] = True
-                    return
-                
-                # Procesar secuencia
-                kp_seq = session['kp_seq'][: - (margin_frame + delay_frames)]
-                
-                if len(kp_seq) >= min_length_frames:
-                    kp_normalized = normalize_keypoints(kp_seq, config.model.frames)
-                    prediction = model.predict(np.expand_dims(kp_normalized, axis=0))[0]
-                    
-                    confidence = float(np.max(prediction))
-                    
-                    if confidence > config.evaluation.confidence_threshold:
-                        word_idx = int(np.argmax(prediction))
-                        word_ids = config.get_word_ids()
-                        word_id = word_ids[word_idx].split('-')[0]
-                        word_label = config.get_word_label(word_id)
-                        
-                        session['sentence'].insert(0, word_label)
-                        
-                        # Guardar predicción en base de datos si el usuario está autenticado
-                        if session.get('user_id'):
-                            try:
-                                new_prediction = Prediction(
-                                    user_id=session['user_id'],
-                                    word=word_label,
-                                    word_id=word_id,
-                                    confidence=confidence,
-                                    session_id=request.sid
-                                )
-                                db.session.add(new_prediction)
-                                db.session.commit()
-                            except Exception as e:
-                                logger.error(f"Error guardando predicción: {e}")
-                                db.session.rollback()
-                        
-                        # Enviar predicción
-                        emit('prediction', {
-                            'word': word_label,
-                            'word_id': word_id,
-                            'confidence': confidence,
-                            'sentence': session['sentence'][:5]  # Últimas 5 palabras
-                        })
-                        
-                        logger.info(f"Predicción: {word_label} ({confidence:.2%})")
-            
-            # Resetear estado
-            session['recording'] = False
-            session['fix_frames'] = 0
-            session['count_frame'] = 0
-            session['kp_seq'] = []
-            
-            emit('status', {
-                'recording': False,
-                'frame_count': 0,
-                'has_hands': False
-            })
-            
-    except Exception as e:
-        logger.error(f"Error procesando frame: {e}", exc_info=True)
-        emit('error', {'message': str(e)})
+    session = sessions.get(request.sid)
+    if not session:
+        emit('error', {'message': 'Sesión no encontrada'})
+        return
+    session['rate'].received()
+    frame_pipeline.submit(request.sid, ('frame', data['frame'] if isinstance(data, dict) else data, time.perf_counter()))
+
+
+@socketio.on('process_keypoints')
+def handle_keypoints(data):
+    """
+    Recibir keypoints extraídos en el navegador (MediaPipe JS)
+    
+    Recibe el mensaje binario de keypoint_codec: el servidor no decodifica
+    imagen ni corre MediaPipe, solo segmenta y clasifica.
+    """
+    if not config.server.client_keypoints:
+        emit('error', {'message': 'Modo de keypoints en el cliente deshabilitado'})
+        return
+    session = sessions.get(request.sid)
+    if not session:
+        emit('error', {'message': 'Sesión no encontrada'})
+        return
+    session['rate'].received()
+    frame_pipeline.submit(request.sid, ('keypoints', data['keypoints'] if isinstance(data, dict) else data,
+                                        time.perf_counter()))
 
 
 @socketio.on('clear_sentence')
@@ -523,13 +820,8 @@ def handle_clear():
 def handle_reset():
     """Resetear sesión completa"""
     if request.sid in sessions:
-        sessions[request.sid] = {
-            'kp_seq': [],
-            'count_frame': 0,
-            'fix_frames': 0,
-            'recording': False,
-            'sentence': []
-        }
+        holistic_pool.release_session(request.sid)
+        sessions[request.sid] = new_session_state(request.sid, sessions[request.sid].get('user_id'))
         emit('session_reset', {'message': 'Sesión reiniciada'})
 
 
@@ -549,7 +841,7 @@ if __name__ == '__main__':
     # Crear tablas de base de datos
     try:
         with app.app_context():
-            db.create_all()
+            create_tables()
             logger.info("Base de datos inicializada")
     except Exception as e:
         logger.error(f"Error inicializando base de datos: {e}")
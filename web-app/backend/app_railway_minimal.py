@@ -4,6 +4,7 @@ Version simplificada sin TensorFlow pesado para despliegue rápido
 Compatible con Python 3.12 y Railway
 """
 
+import atexit
 import os
 import sys
 import json
@@ -20,7 +21,7 @@ load_dotenv()
 
 # Import models and database
 try:
-    from models import db, User, Prediction, init_db, get_system_stats
+    from models import db, User, Prediction, init_db, get_system_stats, insert_predictions
     DB_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Database models not available: {e}")
@@ -167,31 +168,47 @@ def get_word_label(word_id):
     """Get word label for display"""
     return word_id.replace('_', ' ').replace('-', ' ').title()
 
+def write_predictions(rows):
+    with app.app_context():
+        insert_predictions(rows)
+    logger.info(f"Predictions saved: {len(rows)}")
+
+# Escritura diferida (requiere numpy y PyYAML del proyecto raíz; sin ellos se guarda en línea)
+prediction_sink = None
+if DB_AVAILABLE:
+    try:
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+        from prediction_sink import PredictionSink
+        prediction_sink = PredictionSink(write_predictions)
+        prediction_sink.start()
+        atexit.register(prediction_sink.close)
+    except ImportError as e:
+        print(f"Warning: Prediction sink not available, saving inline: {e}")
+
 def save_prediction(user_id, word, word_id, confidence, session_id=None, frame_count=None):
-    """Guardar predicción en base de datos si está disponible"""
+    """Encolar predicción para guardarla en base de datos si está disponible (retorna False si no se guardará)"""
     if not DB_AVAILABLE:
         logger.info(f"Mock prediction: {word} ({confidence:.2f}) for user {user_id}")
-        return None
-        
+        return False
+    
+    row = {
+        'user_id': user_id,
+        'word': word,
+        'word_id': word_id,
+        'confidence': confidence,
+        'session_id': session_id,
+        'frame_count': frame_count,
+        'model_version': 'minimal_v1.0',
+        'timestamp': datetime.utcnow()
+    }
+    if prediction_sink is not None:
+        return prediction_sink.submit(row)
     try:
-        prediction = Prediction(
-            user_id=user_id,
-            word=word,
-            word_id=word_id,
-            confidence=confidence,
-            session_id=session_id,
-            frame_count=frame_count,
-            model_version='minimal_v1.0'
-        )
-        db.session.add(prediction)
-        db.session.commit()
-        logger.info(f"Prediction saved: {word} ({confidence:.2f}) for user {user_id}")
-        return prediction
+        write_predictions([row])
+        return True
     except Exception as e:
         logger.error(f"Error saving prediction: {e}")
-        if DB_AVAILABLE:
-            db.session.rollback()
-        return None
+        return False
 
 # ============= WEB PAGES ROUTES =============
 
@@ -328,7 +345,7 @@ def register():
                 
                 flash('Registro exitoso. Ya puedes iniciar sesión.', 'success')
                 return redirect(url_for('login'))
-                
+            
             except Exception as e:
                 db.session.rollback()
                 logger.error(f"Error creating user: {e}")
@@ -390,7 +407,7 @@ def health_check():
         }
         
         return jsonify(response), 200
-        
+    
     except Exception as e:
         return jsonify({
             'status': 'healthy',
@@ -534,7 +551,7 @@ def handle_frame(data):
         # Guardar predicción en base de datos si está disponible y el usuario logueado
         saved_to_db = False
         if session_data['user_id'] and current_user.is_authenticated:
-            prediction = save_prediction(
+            saved_to_db = save_prediction(
                 user_id=session_data['user_id'],
                 word=word,
                 word_id=word_id,
@@ -542,7 +559,6 @@ def handle_frame(data):
                 session_id=session_data['session_id'],
                 frame_count=session_data['count_frame']
             )
-            saved_to_db = prediction is not None
         
         # Enviar predicción
         emit('prediction', {
@@ -560,7 +576,7 @@ def handle_frame(data):
             'has_hands': True,  # Mock
             'system': 'railway_minimal_threading'
         })
-        
+    
     except Exception as e:
         logger.error(f"Error procesando frame: {e}")
         emit('error', {
@@ -4,6 +4,7 @@ COMPLETAMENTE HEADLESS + BASE DE DATOS POSTGRESQL REAL
 Compatible con Python 3.12 y Railway
 """
 
+import atexit
 import os
 import sys
 import base64
@@ -22,7 +23,9 @@ load_dotenv()
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 # Import models and database
-from models import db, User, Prediction, init_db, get_system_stats
+from models import db, User, Prediction, init_db, get_system_stats, insert_predictions
+from prediction_sink import PredictionSink
+from stats_cache import MemoryCache, StatsCache, create_cache_backend
 
 # Dynamic TensorFlow imports
 try:
@@ -156,33 +159,44 @@ def get_word_label(word_id):
     """Get word label for display"""
     return word_id.replace('_', ' ').replace('-', ' ').title()
 
+# Caché de estadísticas, invalidado al guardar predicciones
+try:
+    cache_backend = create_cache_backend()
+except Exception as e:
+    logger.error(f"Error creating stats cache, using memory: {e}")
+    cache_backend = MemoryCache()
+stats_cache = StatsCache(cache_backend, user_keys=('stats',), global_keys=('system',))
+
+def write_predictions(rows):
+    with app.app_context():
+        insert_predictions(rows)
+    stats_cache.invalidate(row['user_id'] for row in rows)
+    logger.info(f"Predictions saved: {len(rows)}")
+
+# Escritura diferida: el handler del socket solo encola, un hilo inserta por lotes
+prediction_sink = PredictionSink(write_predictions)
+prediction_sink.start()
+atexit.register(prediction_sink.close)
+
 def save_prediction(user_id, word, word_id, confidence, session_id=None, frame_count=None):
-    """Guardar predicción en base de datos"""
-    try:
-        prediction = Prediction(
-            user_id=user_id,
-            word=word,
-            word_id=word_id,
-            confidence=confidence,
-            session_id=session_id,
-            frame_count=frame_count,
-            model_version='lstm_railway_v1.0'
-        )
-        db.session.add(prediction)
-        db.session.commit()
-        logger.info(f"Prediction saved: {word} ({confidence:.2f}) for user {user_id}")
-        return prediction
-    except Exception as e:
-        logger.error(f"Error saving prediction: {e}")
-        db.session.rollback()
-        return None
+    """Encolar predicción para guardarla en base de datos (retorna False si se descartó)"""
+    return prediction_sink.submit({
+        'user_id': user_id,
+        'word': word,
+        'word_id': word_id,
+        'confidence': confidence,
+        'session_id': session_id,
+        'frame_count': frame_count,
+        'model_version': 'lstm_railway_v1.0',
+        'timestamp': datetime.utcnow()
+    })
 
 # ============= WEB PAGES ROUTES =============
 
 @app.route('/')
 def index():
     """Página principal del sitio web"""
-    system_stats = get_system_stats()
+    system_stats = stats_cache.get_global('system', get_system_stats)
     return render_template('index.html', 
                          vocabulary=get_word_ids(),
                          system_status={
@@ -204,7 +218,7 @@ def demo():
 @login_required
 def dashboard():
     """Dashboard del usuario"""
-    user_stats = current_user.get_stats()
+    user_stats = stats_cache.get_user(current_user.id, 'stats', current_user.get_stats)
     return render_template('dashboard.html',
                          user=current_user,
                          total_predictions=user_stats['total_predictions'],
@@ -287,7 +301,7 @@ def register():
             
             flash('Registro exitoso. Ya puedes iniciar sesión.', 'success')
             return redirect(url_for('login'))
-            
+        
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error creating user: {e}")
@@ -346,7 +360,7 @@ def health_check():
             response['model_type'] = 'mock'
         
         return jsonify(response), 200
-        
+    
     except Exception as e:
         return jsonify({
             'status': 'healthy',
@@ -374,7 +388,7 @@ def get_vocabulary():
 @login_required
 def user_stats():
     """Obtener estadísticas del usuario actual"""
-    stats = current_user.get_stats()
+    stats = stats_cache.get_user(current_user.id, 'stats', current_user.get_stats)
     return jsonify({
         'user_id': current_user.id,
         'username': current_user.username,
@@ -385,13 +399,18 @@ def user_stats():
 @app.route('/api/system/stats')
 def system_stats():
     """Obtener estadísticas del sistema"""
-    stats = get_system_stats()
+    stats = stats_cache.get_global('system', get_system_stats)
     return jsonify({
         'system_stats': stats,
         'database': 'postgresql' if database_url else 'sqlite',
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/api/cache/metrics')
+def cache_metrics():
+    """Métricas del caché de estadísticas"""
+    return jsonify(stats_cache.metrics())
+
 # ============= STATIC FILES =============
 
 @app.route('/css/<path:filename>')
@@ -489,7 +508,7 @@ def handle_frame(data):
         
         # Guardar predicción en base de datos si el usuario está logueado
         if session_data['user_id'] and current_user.is_authenticated:
-            prediction = save_prediction(
+            save_prediction(
                 user_id=session_data['user_id'],
                 word=word,
                 word_id=word_id,
@@ -514,7 +533,7 @@ def handle_frame(data):
             'has_hands': True,  # Mock
             'system': 'railway_postgres_threading'
         })
-        
+    
     except Exception as e:
         logger.error(f"Error procesando frame: {e}")
         emit('error', {
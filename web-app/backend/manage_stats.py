@@ -0,0 +1,68 @@
+"""
+manage_stats.py - Mantenimiento de las tablas de resumen de predicciones
+========================================================================
+
+user_word_stats y daily_word_stats se actualizan con cada lote insertado
+(models.insert_predictions) y al borrar usuarios por el ORM. Este script las
+recalcula desde el historial (después de borrar predicciones sueltas o de
+borrar o insertar filas por fuera del ORM / insert_predictions) y verifica
+que coincidan con los agregados de la tabla predictions.
+
+Uso:
+    python manage_stats.py rebuild [--database-url URL]
+    python manage_stats.py check [--database-url URL]     # código de salida 1 si difieren
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from flask import Flask
+
+from models import check_stats, db, rebuild_stats
+
+load_dotenv()
+
+
+def create_app(database_url: str) -> Flask:
+    # Fix para Railway PostgreSQL URL format
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://')
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('rebuild', 'check'))
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///../../../lsp_users.db'),
+                        help='default: $DATABASE_URL o la base local de app.py')
+    args = parser.parse_args()
+    
+    app = create_app(args.database_url)
+    with app.app_context():
+        db.create_all()
+        if args.command == 'rebuild':
+            counts = rebuild_stats()
+            print(f"✅ Resúmenes recalculados: {counts['user_word_stats']} filas en user_word_stats, "
+                  f"{counts['daily_word_stats']} en daily_word_stats")
+            return
+        
+        mismatches = check_stats()
+        for table, rows in mismatches.items():
+            for key, expected, actual in rows[:20]:
+                print(f"{table} {key}: historial {expected}, resumen {actual}")
+            if len(rows) > 20:
+                print(f"{table}: ... {len(rows) - 20} diferencias más")
+        if any(mismatches.values()):
+            print("❌ Los resúmenes no coinciden con el historial (ejecutar: python manage_stats.py rebuild)")
+            sys.exit(1)
+        print("✅ Resúmenes consistentes con el historial")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ PostgreSQL + SQLAlchemy + Flask-Login
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import date, datetime
+import base64
+import json
 import uuid
 
 db = SQLAlchemy()
@@ -37,6 +40,7 @@ class User(UserMixin, db.Model):
     
     # Relaciones
     predictions = db.relationship('Prediction', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    word_stats = db.relationship('UserWordStats', lazy='dynamic', cascade='all, delete-orphan')
     
     def set_password(self, password):
         """Establecer contraseña hasheada"""
@@ -53,37 +57,7 @@ class User(UserMixin, db.Model):
     
     def get_stats(self):
         """Obtener estadísticas del usuario"""
-        total_predictions = self.predictions.count()
-        if total_predictions == 0:
-            return {
-                'total_predictions': 0,
-                'avg_confidence': 0.0,
-                'unique_words': 0,
-                'top_words': [],
-                'recent_predictions': []
-            }
-        
-        # Confianza promedio
-        predictions = self.predictions.all()
-        avg_confidence = sum(p.confidence for p in predictions) / len(predictions)
-        
-        # Palabras únicas y más usadas
-        word_counts = {}
-        for pred in predictions:
-            word_counts[pred.word] = word_counts.get(pred.word, 0) + 1
-        
-        top_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        # Predicciones recientes
-        recent_predictions = self.predictions.order_by(Prediction.timestamp.desc()).limit(10).all()
-        
-        return {
-            'total_predictions': total_predictions,
-            'avg_confidence': avg_confidence,
-            'unique_words': len(word_counts),
-            'top_words': top_words,
-            'recent_predictions': recent_predictions
-        }
+        return get_user_stats(self.id)
     
     def to_dict(self):
         """Convertir a diccionario para JSON"""
@@ -129,6 +103,14 @@ class Prediction(db.Model):
     # Timestamps
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     
+    # Índices compuestos para las estadísticas por usuario (ver get_user_stats):
+    # - historial reciente: WHERE user_id ORDER BY timestamp DESC LIMIT n
+    # - conteos y promedio por palabra: incluye confidence para no leer la tabla
+    __table_args__ = (
+        db.Index('ix_predictions_user_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_predictions_user_word', 'user_id', 'word', 'confidence'),
+    )
+    
     def to_dict(self):
         """Convertir a diccionario para JSON"""
         return {
@@ -148,10 +130,44 @@ class Prediction(db.Model):
         return f'<Prediction {self.word} ({self.confidence:.2f})>'
 
 
+# Tablas de resumen: se actualizan en la misma transacción que inserta las
+# predicciones (insert_predictions), así las estadísticas no recorren el historial
+class UserWordStats(db.Model):
+    """Predicciones acumuladas por usuario y palabra"""
+    __tablename__ = 'user_word_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    word = db.Column(db.String(100), primary_key=True)
+    prediction_count = db.Column(db.Integer, nullable=False, default=0)
+    confidence_sum = db.Column(db.Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f'<UserWordStats {self.user_id} {self.word} ({self.prediction_count})>'
+
+
+class DailyWordStats(db.Model):
+    """Predicciones acumuladas por día (UTC) y palabra, de todos los usuarios"""
+    __tablename__ = 'daily_word_stats'
+    
+    day = db.Column(db.Date, primary_key=True)
+    word = db.Column(db.String(100), primary_key=True)
+    prediction_count = db.Column(db.Integer, nullable=False, default=0)
+    confidence_sum = db.Column(db.Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f'<DailyWordStats {self.day} {self.word} ({self.prediction_count})>'
+
+
 # Funciones de utilidad para inicialización
 def create_tables():
     """Crear todas las tablas en la base de datos"""
     db.create_all()
+    # create_all no agrega índices nuevos a tablas que ya existían
+    for index in Prediction.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    # Tablas de resumen nuevas sobre un historial existente
+    if db.session.query(Prediction.id).first() and not db.session.query(UserWordStats.user_id).first():
+        rebuild_stats()
     print("✅ Tablas de base de datos creadas")
 
 def init_db(app):
@@ -175,24 +191,296 @@ def init_db(app):
             db.session.commit()
             print("✅ Usuario demo creado: demo / demo123")
 
+def insert_predictions(rows):
+    """
+    Insertar predicciones en una sola sentencia (executemany), sumarlas a las
+    tablas de resumen y confirmar todo en una transacción
+    
+    Cada fila es un dict con las columnas de Prediction; `timestamp` debe venir
+    con la hora de reconocimiento, no la de escritura del lote.
+    """
+    now = datetime.utcnow()
+    rows = [dict(row, timestamp=row.get('timestamp') or now) for row in rows]
+    
+    by_user_word, by_day_word = {}, {}
+    for row in rows:
+        for totals, key in ((by_user_word, (row['user_id'], row['word'])),
+                            (by_day_word, (row['timestamp'].date(), row['word']))):
+            count, confidence_sum = totals.get(key, (0, 0.0))
+            totals[key] = (count + 1, confidence_sum + row['confidence'])
+    
+    try:
+        db.session.execute(db.insert(Prediction), rows)
+        _increment_stats(UserWordStats, ('user_id', 'word'), by_user_word)
+        _increment_stats(DailyWordStats, ('day', 'word'), by_day_word)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def _increment_stats(model, keys, totals):
+    """Sumar {clave: (predicciones, suma de confianza)} a una tabla de resumen"""
+    values = [dict(zip(keys, key), prediction_count=count, confidence_sum=confidence_sum)
+              for key, (count, confidence_sum) in totals.items()]
+    dialect = db.session.get_bind().dialect.name
+    
+    if dialect in ('postgresql', 'sqlite'):
+        # Upsert atómico: varios procesos pueden escribir a la vez
+        table = model.__table__
+        insert = (postgresql.insert if dialect == 'postgresql' else sqlite.insert)(table)
+        db.session.execute(insert.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                'prediction_count': table.c.prediction_count + insert.excluded['prediction_count'],
+                'confidence_sum': table.c.confidence_sum + insert.excluded['confidence_sum'],
+            }
+        ), values)
+        return
+    
+    for value in values:
+        stats = db.session.get(model, tuple(value[key] for key in keys), with_for_update=True)
+        if stats is None:
+            db.session.add(model(**value))
+        else:
+            stats.prediction_count += value['prediction_count']
+            stats.confidence_sum += value['confidence_sum']
+
+def _daily_totals(session, user_ids=None):
+    """{(día, palabra): (predicciones, suma de confianza)} desde el historial (de `user_ids` si se indican)"""
+    day = db.func.date(Prediction.timestamp)
+    query = session.query(day, Prediction.word, db.func.count(), db.func.sum(Prediction.confidence))
+    if user_ids is not None:
+        query = query.filter(Prediction.user_id.in_(user_ids))
+    return {
+        # SQLite retorna date() como texto
+        (date.fromisoformat(value) if isinstance(value, str) else value, word): (count, confidence_sum or 0.0)
+        for value, word, count, confidence_sum in query.group_by(day, Prediction.word)
+    }
+
+def _raw_stats():
+    """Agregados de las tablas de resumen calculados desde el historial completo"""
+    by_user_word = {
+        (user_id, word): (count, confidence_sum or 0.0)
+        for user_id, word, count, confidence_sum in db.session.query(
+            Prediction.user_id, Prediction.word, db.func.count(), db.func.sum(Prediction.confidence)
+        ).group_by(Prediction.user_id, Prediction.word)
+    }
+    return by_user_word, _daily_totals(db.session)
+
+@db.event.listens_for(db.session, 'before_flush')
+def _discount_deleted_users(session, flush_context, instances):
+    """
+    Restar de daily_word_stats las predicciones de los usuarios que se borran
+    
+    El borrado en cascada del usuario elimina sus predicciones y sus filas de
+    user_word_stats, pero daily_word_stats suma a todos los usuarios. Corre
+    antes del flush (las predicciones aún existen) y en la misma transacción.
+    Los borrados por fuera del ORM (SQL directo, o de predicciones sueltas)
+    requieren `python manage_stats.py rebuild`.
+    """
+    user_ids = [obj.id for obj in session.deleted if isinstance(obj, User) and obj.id is not None]
+    if not user_ids:
+        return
+    
+    for (day, word), (count, confidence_sum) in _daily_totals(session, user_ids).items():
+        session.execute(db.update(DailyWordStats).where(
+            DailyWordStats.day == day, DailyWordStats.word == word
+        ).values(
+            prediction_count=DailyWordStats.prediction_count - count,
+            confidence_sum=DailyWordStats.confidence_sum - confidence_sum
+        ))
+    session.execute(db.delete(DailyWordStats).where(DailyWordStats.prediction_count <= 0))
+
+def rebuild_stats():
+    """Recalcular las tablas de resumen desde el historial de predicciones"""
+    by_user_word, by_day_word = _raw_stats()
+    try:
+        db.session.query(UserWordStats).delete()
+        db.session.query(DailyWordStats).delete()
+        if by_user_word:
+            db.session.execute(db.insert(UserWordStats), [
+                {'user_id': user_id, 'word': word, 'prediction_count': count, 'confidence_sum': confidence_sum}
+                for (user_id, word), (count, confidence_sum) in by_user_word.items()
+            ])
+        if by_day_word:
+            db.session.execute(db.insert(DailyWordStats), [
+                {'day': day, 'word': word, 'prediction_count': count, 'confidence_sum': confidence_sum}
+                for (day, word), (count, confidence_sum) in by_day_word.items()
+            ])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return {'user_word_stats': len(by_user_word), 'daily_word_stats': len(by_day_word)}
+
+def check_stats(tolerance=1e-6):
+    """
+    Comparar las tablas de resumen con los agregados del historial
+    
+    Returns:
+        dict: Por tabla, lista de (clave, esperado, actual) que no coinciden;
+              esperado o actual es None si la fila falta de un lado
+    """
+    expected_tables = _raw_stats()
+    actual_tables = (
+        {(row.user_id, row.word): (row.prediction_count, row.confidence_sum) for row in UserWordStats.query},
+        {(row.day, row.word): (row.prediction_count, row.confidence_sum) for row in DailyWordStats.query},
+    )
+    
+    mismatches = {}
+    for name, expected, actual in zip(('user_word_stats', 'daily_word_stats'), expected_tables, actual_tables):
+        mismatches[name] = []
+        for key in sorted(expected.keys() | actual.keys(), key=str):
+            want, got = expected.get(key), actual.get(key)
+            if want is None or got is None or want[0] != got[0] or abs(want[1] - got[1]) > tolerance * max(1.0, abs(want[1])):
+                mismatches[name].append((key, want, got))
+    return mismatches
+
+def get_user_stats(user_id, top_words=10, recent=10):
+    """
+    Estadísticas de un usuario
+    
+    Totales y palabras más usadas desde user_word_stats (una fila por palabra
+    del usuario) y las últimas predicciones por el índice (user_id, timestamp);
+    no se recorre el historial. Retorna solo datos simples (cacheables y
+    serializables a JSON): las predicciones recientes son dicts con word,
+    word_id, confidence y timestamp.
+    
+    Args:
+        user_id: ID del usuario
+        top_words: Cantidad de palabras más usadas a retornar
+        recent: Cantidad de predicciones recientes a retornar
+    """
+    total_predictions, confidence_sum, unique_words = db.session.query(
+        db.func.coalesce(db.func.sum(UserWordStats.prediction_count), 0),
+        db.func.sum(UserWordStats.confidence_sum),
+        db.func.count()
+    ).filter(UserWordStats.user_id == user_id).one()
+    
+    if total_predictions == 0:
+        return {
+            'total_predictions': 0,
+            'avg_confidence': 0.0,
+            'unique_words': 0,
+            'top_words': [],
+            'recent_predictions': []
+        }
+    
+    # Palabras más usadas
+    top = db.session.query(UserWordStats.word, UserWordStats.prediction_count)\
+        .filter(UserWordStats.user_id == user_id)\
+        .order_by(UserWordStats.prediction_count.desc(), UserWordStats.word)\
+        .limit(top_words)\
+        .all()
+    
+    # Predicciones recientes
+    recent_predictions = db.session.query(
+        Prediction.word, Prediction.word_id, Prediction.confidence, Prediction.timestamp
+    ).filter(Prediction.user_id == user_id)\
+        .order_by(Prediction.timestamp.desc())\
+        .limit(recent)\
+        .all()
+    
+    return {
+        'total_predictions': total_predictions,
+        'avg_confidence': confidence_sum / total_predictions,
+        'unique_words': unique_words,
+        'top_words': [(word, count) for word, count in top],
+        'recent_predictions': [row._asdict() for row in recent_predictions]
+    }
+
 def get_system_stats():
-    """Obtener estadísticas generales del sistema"""
+    """Obtener estadísticas generales del sistema (desde daily_word_stats)"""
     total_users = User.query.count()
-    total_predictions = Prediction.query.count()
     
-    # Promedio de confianza general
-    avg_confidence = db.session.query(db.func.avg(Prediction.confidence)).scalar() or 0.0
+    # Total y promedio de confianza general
+    total_predictions, confidence_sum = db.session.query(
+        db.func.coalesce(db.func.sum(DailyWordStats.prediction_count), 0),
+        db.func.coalesce(db.func.sum(DailyWordStats.confidence_sum), 0.0)
+    ).one()
     
     # Palabra más popular
-    top_word = db.session.query(
-        Prediction.word, 
-        db.func.count(Prediction.word)
-    ).group_by(Prediction.word).order_by(db.func.count(Prediction.word).desc()).first()
+    word_count = db.func.sum(DailyWordStats.prediction_count)
+    top_word = db.session.query(DailyWordStats.word, word_count)\
+        .group_by(DailyWordStats.word)\
+        .order_by(word_count.desc(), DailyWordStats.word)\
+        .first()
     
     return {
         'total_users': total_users,
         'total_predictions': total_predictions,
-        'avg_confidence': float(avg_confidence),
+        'avg_confidence': confidence_sum / total_predictions if total_predictions else 0.0,
         'top_word': top_word[0] if top_word else None,
         'top_word_count': top_word[1] if top_word else 0
     }
+
+# Historial paginado por keyset: (timestamp, id) descendente, sin OFFSET
+def query_user_predictions(user_id, after=None, word=None, min_confidence=None, max_confidence=None,
+                           session_id=None, since=None, until=None):
+    """
+    Predicciones de un usuario de la más reciente a la más antigua
+    
+    Usa el índice (user_id, timestamp); el rango de fechas acota el recorrido
+    del índice y los demás filtros se aplican sobre las filas recorridas en
+    ese orden.
+    
+    Args:
+        user_id: ID del usuario
+        after: (timestamp, id) de la última fila de la página anterior
+        word: Palabra exacta
+        min_confidence, max_confidence: Rango de confianza (inclusivo)
+        session_id: Sesión de Socket.IO
+        since, until: Rango de timestamp [since, until)
+    """
+    query = Prediction.query.filter(Prediction.user_id == user_id)
+    if since is not None:
+        query = query.filter(Prediction.timestamp >= since)
+    if until is not None:
+        query = query.filter(Prediction.timestamp < until)
+    if word is not None:
+        query = query.filter(Prediction.word == word)
+    if min_confidence is not None:
+        query = query.filter(Prediction.confidence >= min_confidence)
+    if max_confidence is not None:
+        query = query.filter(Prediction.confidence <= max_confidence)
+    if session_id is not None:
+        query = query.filter(Prediction.session_id == session_id)
+    if after is not None:
+        timestamp, prediction_id = after
+        # `timestamp <= t` redundante: da el rango de búsqueda en el índice, el OR solo desempata
+        query = query.filter(Prediction.timestamp <= timestamp, db.or_(
+            Prediction.timestamp < timestamp, Prediction.id < prediction_id
+        ))
+    return query.order_by(Prediction.timestamp.desc(), Prediction.id.desc())
+
+def iter_user_predictions(user_id, after=None, batch_size=1000, **filters):
+    """
+    Recorrer el historial filtrado desde `after` por lotes de `batch_size`
+    (memoria acotada: cada lote es una consulta keyset, no se mantiene un
+    cursor abierto y las filas ya entregadas se liberan del identity map, que es débil)
+    """
+    while True:
+        batch = query_user_predictions(user_id, after=after, **filters).limit(batch_size).all()
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        after = (batch[-1].timestamp, batch[-1].id)
+
+def encode_prediction_cursor(prediction):
+    """Cursor opaco con el (timestamp, id) de una predicción"""
+    raw = json.dumps([prediction.timestamp.isoformat(), prediction.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_prediction_cursor(cursor):
+    """
+    (timestamp, id) de un cursor de encode_prediction_cursor
+    
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, prediction_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(prediction_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
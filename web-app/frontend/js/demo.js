@@ -2,6 +2,39 @@
 // LSP Recognition - Demo Page JavaScript
 // ================================================
 
+// Layout de keypoints de helpers.extract_keypoints y formato de keypoint_codec.py
+const KEYPOINTS_LAYOUT = {
+    pose: 33,       // x, y, z, visibility
+    face: 468,      // x, y, z
+    hand: 21,       // x, y, z
+    length: 1662
+};
+const KEYPOINTS_HEADER_BYTES = 8;
+const KEYPOINTS_DTYPES = { float16: { code: 1, bytes: 2 }, float32: { code: 2, bytes: 4 } };
+
+const float16Scratch = new Float32Array(1);
+const float16ScratchBits = new Int32Array(float16Scratch.buffer);
+
+// float32 -> bits de float16 (IEEE 754, redondeo al más cercano)
+function toFloat16Bits(value) {
+    float16Scratch[0] = value;
+    const x = float16ScratchBits[0];
+    let bits = (x >> 16) & 0x8000;
+    let mantissa = (x >> 12) & 0x07ff;
+    const exponent = (x >> 23) & 0xff;
+    
+    if (exponent < 103) return bits;
+    if (exponent > 142) {
+        return bits | 0x7c00 | ((exponent === 255 && (x & 0x007fffff)) ? 0x0200 : 0);
+    }
+    if (exponent < 113) {
+        mantissa |= 0x0800;
+        return bits | ((mantissa >> (114 - exponent)) + ((mantissa >> (113 - exponent)) & 1));
+    }
+    bits |= ((exponent - 112) << 10) | (mantissa >> 1);
+    return bits + (mantissa & 1);
+}
+
 class LSPDemo {
     constructor() {
         this.socket = null;
@@ -14,6 +47,20 @@ class LSPDemo {
         this.sessionStartTime = null;
         this.predictions = [];
         this.frameCount = 0;
+        this.useBinaryFrames = true;
+        // 'image/webp' reduce ~30% los bytes pero duplica la CPU de decodificación del servidor
+        this.frameMimeType = 'image/jpeg';
+        // 'frames' (default): el servidor corre MediaPipe. 'keypoints' (opcional,
+        // demo.html?transport=keypoints): MediaPipe corre en el navegador y solo
+        // viajan los landmarks (~3 KB por frame en float16)
+        this.transport = new URLSearchParams(window.location.search).get('transport') === 'keypoints'
+            ? 'keypoints' : 'frames';
+        this.keypointsDtype = 'float16';
+        this.keypointsProtocol = null;
+        this.holistic = null;
+        // Ajustados por el servidor (stream_feedback) según lo que puede procesar
+        this.targetFps = 30;
+        this.jpegQuality = 0.8;
         
         this.init();
     }
@@ -21,6 +68,7 @@ class LSPDemo {
     init() {
         this.setupElements();
         this.setupEventListeners();
+        if (this.transport === 'keypoints') this.loadHolistic();
         this.connectWebSocket();
         this.showInstructionsModal();
     }
@@ -88,6 +136,7 @@ class LSPDemo {
         
         this.socket.on('connected', (data) => {
             console.log('Server message:', data.message);
+            this.keypointsProtocol = data.keypoints_protocol || null;
         });
         
         this.socket.on('status', (data) => {
@@ -98,6 +147,14 @@ class LSPDemo {
             this.handlePrediction(data);
         });
         
+        this.socket.on('partial_prediction', (data) => {
+            this.handlePartialPrediction(data);
+        });
+        
+        this.socket.on('stream_feedback', (data) => {
+            this.handleStreamFeedback(data);
+        });
+        
         this.socket.on('error', (data) => {
             console.error('Server error:', data.message);
             this.showNotification('Error: ' + data.message, 'error');
@@ -172,10 +229,126 @@ class LSPDemo {
         }
     }
     
+    async encodeFrame() {
+        // Binario: Socket.IO lo envía como adjunto, sin el ~33% extra de base64
+        if (this.useBinaryFrames && this.canvasElement.toBlob) {
+            const blob = await new Promise((resolve) => {
+                this.canvasElement.toBlob(resolve, this.frameMimeType, this.jpegQuality);
+            });
+            if (blob) {
+                return blob.arrayBuffer();
+            }
+        }
+        
+        // Legado: data URL base64
+        return this.canvasElement.toDataURL('image/jpeg', this.jpegQuality);
+    }
+    
+    loadHolistic() {
+        // Solo en modo keypoints; mientras carga (o si el CDN falla) se envían frames
+        const script = document.createElement('script');
+        script.src = 'https://cdn.jsdelivr.net/npm/@mediapipe/holistic/holistic.js';
+        script.crossOrigin = 'anonymous';
+        script.onerror = () => {
+            console.error('No se pudo cargar MediaPipe Holistic, se envían frames');
+            this.transport = 'frames';
+        };
+        document.head.appendChild(script);
+    }
+    
+    useClientKeypoints() {
+        return this.transport === 'keypoints' &&
+            this.keypointsProtocol !== null &&
+            this.keypointsProtocol.version === 1 &&
+            typeof Holistic !== 'undefined';
+    }
+    
+    setupHolistic() {
+        if (this.holistic) return this.holistic;
+        
+        this.holistic = new Holistic({
+            locateFile: (file) => `https://cdn.jsdelivr.net/npm/@mediapipe/holistic/${file}`
+        });
+        // Mismas opciones que el servidor: imagen sin espejar y rostro de 468 puntos
+        this.holistic.setOptions({
+            modelComplexity: 1,
+            smoothLandmarks: true,
+            refineFaceLandmarks: false,
+            selfieMode: false,
+            minDetectionConfidence: this.keypointsProtocol.min_detection_confidence,
+            minTrackingConfidence: this.keypointsProtocol.min_tracking_confidence
+        });
+        this.holistic.onResults((results) => this.sendKeypoints(results));
+        return this.holistic;
+    }
+    
+    extractKeypoints(results) {
+        // Mismo orden que helpers.extract_keypoints, ceros si el grupo no se detectó
+        const keypoints = new Float32Array(KEYPOINTS_LAYOUT.length);
+        let offset = 0;
+        const write = (landmarks, count, withVisibility) => {
+            if (landmarks) {
+                for (let i = 0; i < count; i++) {
+                    const lm = landmarks[i];
+                    keypoints[offset++] = lm.x;
+                    keypoints[offset++] = lm.y;
+                    keypoints[offset++] = lm.z;
+                    if (withVisibility) keypoints[offset++] = lm.visibility || 0;
+                }
+            } else {
+                offset += count * (withVisibility ? 4 : 3);
+            }
+        };
+        write(results.poseLandmarks, KEYPOINTS_LAYOUT.pose, true);
+        write(results.faceLandmarks, KEYPOINTS_LAYOUT.face, false);
+        write(results.leftHandLandmarks, KEYPOINTS_LAYOUT.hand, false);
+        write(results.rightHandLandmarks, KEYPOINTS_LAYOUT.hand, false);
+        return keypoints;
+    }
+    
+    encodeKeypoints(keypoints) {
+        // Cabecera: 'KP', versión 1, dtype, layout 0 (completo), reservado, cantidad (u16)
+        const dtype = KEYPOINTS_DTYPES[this.keypointsDtype];
+        const buffer = new ArrayBuffer(KEYPOINTS_HEADER_BYTES + keypoints.length * dtype.bytes);
+        const view = new DataView(buffer);
+        view.setUint8(0, 0x4b);
+        view.setUint8(1, 0x50);
+        view.setUint8(2, 1);
+        view.setUint8(3, dtype.code);
+        view.setUint8(4, 0);
+        view.setUint8(5, 0);
+        view.setUint16(6, keypoints.length, true);
+        
+        let offset = KEYPOINTS_HEADER_BYTES;
+        for (let i = 0; i < keypoints.length; i++, offset += dtype.bytes) {
+            if (dtype.bytes === 2) {
+                view.setUint16(offset, toFloat16Bits(keypoints[i]), true);
+            } else {
+                view.setFloat32(offset, keypoints[i], true);
+            }
+        }
+        return buffer;
+    }
+    
+    sendKeypoints(results) {
+        if (this.socket && this.socket.connected) {
+            this.socket.emit('process_keypoints', this.encodeKeypoints(this.extractKeypoints(results)));
+        }
+    }
+    
     async processFrames() {
         if (!this.isProcessing) return;
-        
-        if (!this.isPaused && this.videoElement.readyState === 4) {
+        const startedAt = performance.now();
+        
+        if (!this.isPaused && this.videoElement.readyState === 4 && this.useClientKeypoints()) {
+            // MediaPipe en el navegador: onResults envía los keypoints
+            try {
+                await this.setupHolistic().send({ image: this.videoElement });
+            } catch (error) {
+                console.error('MediaPipe no disponible, se envían frames:', error);
+                this.transport = 'frames';
+            }
+        } else if (!this.isPaused && this.videoElement.readyState === 4) {
             // Capturar frame
             this.ctx.drawImage(
                 this.videoElement, 
@@ -184,17 +357,15 @@ class LSPDemo {
                 this.canvasElement.height
             );
             
-            // Convertir a base64
-            const frameData = this.canvasElement.toDataURL('image/jpeg', 0.8);
-            
             // Enviar al servidor
             if (this.socket && this.socket.connected) {
-                this.socket.emit('process_frame', { frame: frameData });
+                this.socket.emit('process_frame', { frame: await this.encodeFrame() });
             }
         }
         
-        // Continuar procesando (30 FPS)
-        setTimeout(() => this.processFrames(), 33);
+        // Continuar a la tasa que el servidor puede sostener
+        const interval = 1000 / this.targetFps;
+        setTimeout(() => this.processFrames(), Math.max(0, interval - (performance.now() - startedAt)));
     }
     
     handleStatusUpdate(data) {
@@ -223,6 +394,25 @@ class LSPDemo {
         }
     }
     
+    handleStreamFeedback(data) {
+        // El servidor descarta los frames que no alcanza a procesar: enviar solo los que sostiene
+        this.targetFps = data.fps;
+        this.jpegQuality = data.jpeg_quality;
+        if (data.drop_ratio > 0) {
+            console.debug(`Servidor: ${data.processed_fps} fps procesados, ` +
+                `${Math.round(data.drop_ratio * 100)}% descartados, p90 ${data.latency_ms} ms -> ${data.fps} fps`);
+        }
+    }
+    
+    handlePartialPrediction(data) {
+        // Predicción en curso mientras se realiza la seña: no entra al historial
+        this.currentPredictionEl.textContent = `${data.word}…`;
+        
+        const confidence = Math.round(data.confidence * 100);
+        this.confidenceFillEl.style.width = `${confidence}%`;
+        this.confidenceValueEl.textContent = `${confidence}%`;
+    }
+    
     handlePrediction(data) {
         console.log('Prediction received:', data);
         